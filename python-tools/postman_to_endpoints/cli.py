@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+CLI interface for Postman to TypeScript EndPoints Converter
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from openapi_parser import YAML_SUFFIXES, load_endpoints
+from collection_diff import CHANGE_KINDS, diff_endpoints, format_change, summarize
+from code_generator import collision_report, group_endpoints
+from interface_generator import generate_ts_interfaces, group_schemas, interface_file
+from output_writer import (combined_output, code_output, folder_file, folder_outputs, manifest_path,
+                           unique_paths, write_changed)
+from utils import camel_case, collection_name
+
+
+def find_collections(inputs) -> list:
+    """
+    Collection and spec files from file and directory arguments
+    (directories: their *.json, *.yaml and *.yml files, except hidden ones
+    such as the .<name>.endpoints-manifest.json files this tool writes)
+    """
+    files = []
+    for name in inputs:
+        path = Path(name)
+        if path.is_dir():
+            files.extend(sorted(file_path for file_path in path.iterdir()
+                                if file_path.suffix.lower() in (".json",) + YAML_SUFFIXES
+                                and not file_path.name.startswith(".") and file_path.is_file()))
+        else:
+            files.append(path)
+    return files
+
+
+def convert_collection(file_path: Path, out_dir: Path, split: str = "collection",
+                       folders: list = None, force: bool = False, interfaces: bool = False) -> dict:
+    """
+    Convert one collection (or OpenAPI spec) and write its .ts file(s); runs in a worker process.
+    split: 'collection' writes <out_dir>/<name>EndPoints.ts, 'folder' writes
+    <out_dir>/<name>/<folder>EndPoints.ts for each folder.
+    interfaces: also write request/response interfaces inferred from examples
+    to types/interfaces/<name or folder>Interface.ts next to the classes.
+    Files whose endpoints did not change since the last run (per the
+    collection's manifest in out_dir) are not rewritten unless forced.
+    Returns a report dict; errors are reported instead of raised.
+    """
+    name = collection_name(file_path)
+    report = {"collection": str(file_path), "name": name, "endpoints": 0,
+              "folders": [], "files": [], "unchanged": [], "stale": [], "missing_folders": [],
+              "renamed": []}
+    try:
+        schemas = [] if interfaces else None
+        endpoints = load_endpoints(file_path, schemas)
+    except Exception as e:
+        report["error"] = f"Failed to read collection: {e}"
+        return report
+
+    available = group_endpoints(endpoints)
+    if folders:
+        selected = set(available) & set(folders)
+        report["missing_folders"] = sorted(set(folders) - set(available))
+    else:
+        selected = set(available)
+    grouped = {folder: available[folder] for folder in selected}
+    report["folders"] = sorted(selected)
+    report["endpoints"] = sum(len(rows) for rows in grouped.values())
+    report["renamed"] = collision_report(grouped)
+
+    if split == "folder":
+        # Paths are numbered over all folders, so a selection does not change them
+        paths = unique_paths(available, lambda folder: folder_file(folder, name))
+        outputs = folder_outputs(grouped, paths)
+        # Folders left out of --folders keep their files and manifest entries
+        kept = set(paths.values())
+    else:
+        relative_path = f"{camel_case(name)}EndPoints.ts"
+        outputs = [combined_output(grouped, relative_path)] if grouped else []
+        kept = {relative_path}
+
+    if interfaces:
+        grouped_schemas = group_schemas(endpoints, schemas, selected)
+        interface_code = {folder: generate_ts_interfaces(folder, grouped[folder], grouped_schemas[folder])
+                          for folder in sorted(grouped)}
+        if split == "folder":
+            interface_paths = unique_paths(available, lambda folder: interface_file(folder, name))
+            outputs.extend(code_output(interface_paths[folder], code)
+                           for folder, code in interface_code.items() if code)
+            kept |= set(interface_paths.values())
+        else:
+            code = "\n\n".join(code for code in interface_code.values() if code)
+            if code:
+                outputs.append(code_output(interface_file(name), code))
+            kept.add(interface_file(name))
+
+    try:
+        result = write_changed(out_dir, outputs, manifest_path(out_dir, name), force, kept)
+    except OSError as e:
+        report["error"] = f"Failed to write output: {e}"
+        return report
+    report["files"] = [str(path) for path in result["written"]]
+    report["unchanged"] = [str(path) for path in result["unchanged"]]
+    report["stale"] = [str(path) for path in result["stale"]]
+    return report
+
+
+def _convert_task(task: tuple) -> dict:
+    return convert_collection(*task)
+
+
+def diff_main(old_path: Path, new_path: Path, format: str = "text") -> int:
+    """
+    Print what changed between two versions of a collection (or spec).
+    Returns 0 if nothing changed, 1 if endpoints changed and 2 on errors, like diff.
+    """
+    try:
+        old_endpoints = load_endpoints(old_path)
+        new_endpoints = load_endpoints(new_path)
+    except Exception as e:
+        print(f"Error: Failed to read collection: {e}", file=sys.stderr)
+        return 2
+
+    summary = dict.fromkeys(CHANGE_KINDS, 0)
+    if format == "json":
+        changes = list(diff_endpoints(old_endpoints, new_endpoints))
+        summary = summarize(changes)
+        print(json.dumps({"old": str(old_path), "new": str(new_path), "summary": summary,
+                          "changes": changes}, ensure_ascii=False, indent=2))
+    else:
+        # Changes are printed as the merge finds them
+        for change in diff_endpoints(old_endpoints, new_endpoints):
+            summary[change["change"]] += 1
+            if format == "ndjson":
+                print(json.dumps(change, ensure_ascii=False), flush=True)
+            else:
+                print(format_change(change), flush=True)
+        if format == "text":
+            print(f"{summary['added']} added, {summary['removed']} removed, "
+                  f"{summary['changed']} changed", flush=True)
+    return 1 if any(summary.values()) else 0
+
+
+def print_report(report: dict, format: str = "text"):
+    """Print one collection's report as a line of text or NDJSON"""
+    if format == "ndjson":
+        print(json.dumps(report, ensure_ascii=False), flush=True)
+        return
+    if "error" in report:
+        print(f"{report['collection']}: ERROR {report['error']}", flush=True)
+        return
+    print(f"{report['collection']}: {report['endpoints']} endpoints from "
+          f"{len(report['folders'])} folder(s) -> {len(report['files'])} file(s) written, "
+          f"{len(report['unchanged'])} unchanged", flush=True)
+    for file_path in report["files"]:
+        print(f"  {file_path}", flush=True)
+    if report["renamed"]:
+        print(f"  Renamed {len(report['renamed'])} colliding member(s):", flush=True)
+        for rename in report["renamed"]:
+            print(f"    {rename['folder']}: {rename['original']} -> {rename['renamed']} "
+                  f"({rename['reason']}, {rename['method']} {rename['url']})", flush=True)
+    if report["stale"]:
+        print(f"  No longer generated: {', '.join(report['stale'])}", flush=True)
+    if report["missing_folders"]:
+        print(f"  Folders not found: {', '.join(report['missing_folders'])}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Postman to TypeScript EndPoints Converter - Generate endpoint classes from collections'
+    )
+    parser.add_argument('inputs', nargs='+',
+                        help='Postman collections or OpenAPI specs (JSON/YAML), or directories of them')
+    parser.add_argument('--out-dir', '-o', help='Directory for the generated .ts files')
+    parser.add_argument('--diff', action='store_true',
+                        help='Compare two versions of a collection (OLD NEW) instead of converting; '
+                             'exits with 1 if endpoints were added, removed or changed')
+    parser.add_argument('--split', choices=['collection', 'folder'], default='collection',
+                        help='One .ts file per collection (default) or per top-level folder')
+    parser.add_argument('--folders', '-f', action='append', metavar='NAME',
+                        help='Only convert these top-level folders (repeatable, or comma-separated)')
+    parser.add_argument('--interfaces', action='store_true',
+                        help='Also generate request/response interfaces from the JSON examples in the collection')
+    parser.add_argument('--force', action='store_true',
+                        help='Rewrite every file, even if its endpoints did not change since the last run')
+    parser.add_argument('--jobs', '-j', type=int, help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--format', choices=['text', 'json', 'ndjson'], default='text',
+                        help='Report format: text, one JSON document, or one JSON object per '
+                             'collection (per change with --diff)')
+
+    args = parser.parse_args()
+
+    if args.diff:
+        if len(args.inputs) != 2:
+            parser.error('--diff takes exactly two collections: OLD NEW')
+        missing = [name for name in args.inputs if not Path(name).is_file()]
+        if missing:
+            print(f"Error: Not found: {', '.join(missing)}", file=sys.stderr)
+            return 2
+        return diff_main(Path(args.inputs[0]), Path(args.inputs[1]), args.format)
+    if not args.out_dir:
+        parser.error('the following arguments are required: --out-dir/-o')
+
+    files = find_collections(args.inputs)
+    if not files:
+        print("Error: No collection files found", file=sys.stderr)
+        return 1
+    missing = [str(path) for path in files if not path.is_file()]
+    if missing:
+        print(f"Error: Not found: {', '.join(missing)}", file=sys.stderr)
+        return 1
+    names = [collection_name(path) for path in files]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        print(f"Error: Several collections would write the same output: {', '.join(duplicates)}",
+              file=sys.stderr)
+        return 1
+
+    folders = None
+    if args.folders:
+        folders = [name.strip() for value in args.folders for name in value.split(',') if name.strip()]
+
+    out_dir = Path(args.out_dir)
+    tasks = [(path, out_dir, args.split, folders, args.force, args.interfaces) for path in files]
+    jobs = min(args.jobs or os.cpu_count() or 1, len(tasks))
+
+    failed = 0
+    collected = []
+
+    def handle(report):
+        nonlocal failed
+        if args.format == "json":
+            collected.append(report)
+        else:
+            print_report(report, args.format)
+        failed += "error" in report
+
+    if jobs <= 1:
+        for report in map(_convert_task, tasks):
+            handle(report)
+    else:
+        # Reports are printed in input order as soon as each collection is done
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for report in executor.map(_convert_task, tasks):
+                handle(report)
+    if args.format == "json":
+        print(json.dumps(collected, ensure_ascii=False, indent=2))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,53 +1,200 @@
 """
 Functions for generating TypeScript code from parsed endpoints.
 """
-from utils import camel_case, split_base_and_path, remove_postman_variables
+import hashlib
+import json
+import re
 
+from utils import camel_case, name_tokens, path_template
 
-def generate_ts_classes(endpoints, selected_folders):
+# Bump when the generated code changes for the same endpoints, so manifests
+# from older runs no longer match
+GENERATOR_VERSION = 3
+
+# Static members that clash with built-in properties of a class (a function)
+RESERVED_STATIC_NAMES = frozenset({"prototype", "name", "length", "caller", "arguments"})
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_$][A-Za-z0-9_$]*$")
+
+FILE_HEADER = "// Generated from Postman collection\n\n"
+
+
+def group_endpoints(endpoints, selected_folders=None):
     """
-    Generate TypeScript class strings from a list of (field_name, url, method, folder).
-    Creates a separate class for each selected folder. No base URL is used.
+    Group (field_name, url, method, folder) tuples into {folder: [(field_name, url, method)]},
+    keeping collection order inside each folder. None selects every folder.
     """
-    if not endpoints:
-        return ""
-
-    # Group by folder
-    # endpoints: (field_name, url, method, folder)
     grouped = {}
     for field_name, url, method, folder in endpoints:
-        if folder in selected_folders:
+        if selected_folders is None or folder in selected_folders:
             grouped.setdefault(folder, []).append((field_name, url, method))
+    return grouped
 
-    if not grouped:
-        return ""
 
-    # Build TS - one class per folder
-    all_lines = []
+def folder_digest(folder, folder_endpoints):
+    """
+    Hash of everything a folder's class is generated from: its name, its
+    (field_name, url, method) list in order and the generator version.
+    """
+    normalized = json.dumps([GENERATOR_VERSION, folder, folder_endpoints],
+                            ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
-    # Sort folders for stable output
-    for folder in sorted(grouped.keys()):
-        class_name = camel_case(folder) + "EndPoints"
-        lines = []
-        lines.append(f"export abstract class {class_name} {{")
-        lines.append("")
 
-        for field_name, url, method in grouped[folder]:
-            if not url:
-                continue
+def _path_suffix(url):
+    """Last literal path segment of a url in PascalCase, e.g. /users/:id/orders -> "Orders" """
+    path = url.split("?", 1)[0]
+    for segment in reversed(path.split("/")):
+        if segment.startswith(":"):
+            continue
+        tokens = name_tokens(segment)
+        if tokens:
+            return "".join(t.capitalize() for t in tokens)
+    return ""
+
+
+def resolve_field_names(folder_endpoints):
+    """
+    Unique TypeScript member names for one class, in collection order.
+    Returns (names, renames): names is aligned with folder_endpoints (None for
+    endpoints without a url, which are not emitted); renames lists a dict per
+    endpoint whose field_name had to change.
+
+    The first endpoint using a name keeps it. A later duplicate gets the HTTP
+    method appended, then its last path segment, then a number, skipping any
+    name another endpoint uses as is. Reserved static names and invalid
+    identifiers are renamed the same way.
+    """
+    originals = {field_name for field_name, url, _ in folder_endpoints if url}
+    used = set(RESERVED_STATIC_NAMES)
+    next_number = {}
+    names = []
+    renames = []
+
+    for field_name, url, method in folder_endpoints:
+        if not url:
+            names.append(None)
+            continue
 
-            # Remove Postman variables like {{trustserviceURL}}
-            url = remove_postman_variables(url)
+        if not _IDENTIFIER_RE.match(field_name):
+            reason, base = "invalid", "_" + field_name
+        elif field_name in RESERVED_STATIC_NAMES:
+            reason, base = "reserved", field_name
+        elif field_name in used:
+            reason, base = "duplicate", field_name
+        else:
+            used.add(field_name)
+            names.append(field_name)
+            continue
 
-            _, path = split_base_and_path(url)
-            if not path.startswith("/"):
-                path = "/" + path
+        method_suffix = "".join(t.capitalize() for t in name_tokens(method))
+        candidates = [base + method_suffix, base + method_suffix + _path_suffix(url)]
+        if reason == "invalid":
+            candidates.insert(0, base)
+        name = next((c for c in candidates if c not in used and c not in originals), None)
+        # Numbering continues where the last collision on the same stem stopped
+        stem = candidates[-1]
+        number = next_number.get(stem, 2)
+        while name is None:
+            candidate = stem + str(number)
+            if candidate not in used and candidate not in originals:
+                name = candidate
+            number += 1
+        next_number[stem] = number
 
-            # Just use the path directly, no base URL
-            lines.append(f'  public static {field_name} = `{path}`;')
+        used.add(name)
+        names.append(name)
+        renames.append({"original": field_name, "renamed": name, "reason": reason,
+                        "method": method, "url": url})
 
-        lines.append("")
-        lines.append("}")
-        all_lines.append("\n".join(lines))
+    return names, renames
+
+
+def collision_report(grouped):
+    """Renamed members of every folder's class, from group_endpoints output"""
+    report = []
+    for folder in sorted(grouped):
+        _, renames = resolve_field_names(grouped[folder])
+        report.extend(dict(rename, folder=folder) for rename in renames)
+    return report
+
+
+def format_member(name, url):
+    """
+    One static member for a normalized url: a template string, or a function
+    of its path parameters, e.g. `byId = (id: string) => \`/users/${id}\``.
+    """
+    template, params = path_template(url)
+    if not params:
+        return f'  public static {name} = `{template}`;'
+    args = ", ".join(f"{param}: string" for param in params)
+    return f'  public static {name} = ({args}) => `{template}`;'
+
+
+def generate_ts_class(folder, folder_endpoints):
+    """
+    Generate one TypeScript class string from a folder's (field_name, url, method) list,
+    with urls as normalized by the parsers. No base URL is used.
+    Member names are made unique with resolve_field_names.
+    """
+    class_name = camel_case(folder) + "EndPoints"
+    lines = []
+    lines.append(f"export abstract class {class_name} {{")
+    lines.append("")
+
+    names, _ = resolve_field_names(folder_endpoints)
+    for name, (_, url, _) in zip(names, folder_endpoints):
+        if name is None:
+            continue
+        lines.append(format_member(name, url))
+
+    lines.append("")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+class ClassCache:
+    """
+    Generated class per folder, kept while the folder's digest is unchanged,
+    so generating again after a reload only rebuilds the folders that changed.
+    """
+
+    def __init__(self):
+        self._classes = {}
+        # Running totals; the GUI reports them per generation
+        self.generated = 0
+        self.reused = 0
+
+    def get(self, folder, folder_endpoints):
+        digest = folder_digest(folder, folder_endpoints)
+        cached = self._classes.get(folder)
+        if cached is not None and cached[0] == digest:
+            self.reused += 1
+            return cached[1]
+        code = generate_ts_class(folder, folder_endpoints)
+        self._classes[folder] = (digest, code)
+        self.generated += 1
+        return code
+
+
+def generate_ts_classes(endpoints, selected_folders, cache=None):
+    """
+    Generate TypeScript class strings from a list of (field_name, url, method, folder).
+    Creates a separate class for each selected folder. No base URL is used.
+    With a ClassCache, folders whose endpoints did not change are not regenerated.
+    """
+    if not endpoints:
+        return ""
+
+    grouped = group_endpoints(endpoints, selected_folders)
+    if not grouped:
+        return ""
+
+    # Sort folders for stable output
+    all_classes = []
+    for folder in sorted(grouped.keys()):
+        if cache is not None:
+            all_classes.append(cache.get(folder, grouped[folder]))
+        else:
+            all_classes.append(generate_ts_class(folder, grouped[folder]))
 
-    return "\n\n".join(all_lines)
+    return "\n\n".join(all_classes)
@@ -0,0 +1,76 @@
+"""
+Compare two versions of a collection (or OpenAPI spec) endpoint by endpoint.
+
+Endpoints are keyed by (folder, field_name). Both files are streamed into
+flat endpoint lists by load_endpoints (the parsed JSON trees are never
+held), each list is sorted by key, and one linear merge over the two sorted
+lists reports what was added, removed, or changed in URL or method.
+"""
+CHANGE_KINDS = ("added", "removed", "changed")
+_CHANGE_MARKS = {"added": "+", "removed": "-", "changed": "~"}
+
+
+def _sorted_rows(endpoints) -> list:
+    """(folder, field_name, method, url) rows sorted by key, then method and url"""
+    return sorted((folder, field_name, method, url) for field_name, url, method, folder in endpoints)
+
+
+def _change(kind, old, new) -> dict:
+    row = old or new
+    change = {"change": kind, "folder": row[0], "name": row[1],
+              "old": {"method": old[2], "url": old[3]} if old else None,
+              "new": {"method": new[2], "url": new[3]} if new else None}
+    if kind == "changed":
+        change["fields"] = [field for field, index in (("method", 2), ("url", 3))
+                            if old[index] != new[index]]
+    return change
+
+
+def diff_endpoints(old_endpoints, new_endpoints):
+    """
+    Yield one dict per difference between two lists of (field_name, url, method,
+    folder) tuples, in (folder, field_name) order:
+    {"change": "added"|"removed"|"changed", "folder", "name", "old", "new"}
+    where old/new are {"method", "url"} (None for added/removed endpoints) and
+    changed entries also list the "fields" that differ. Endpoints sharing a key
+    (before collision renaming) are paired in method and url order.
+    """
+    old_rows = _sorted_rows(old_endpoints)
+    new_rows = _sorted_rows(new_endpoints)
+    i = j = 0
+    while i < len(old_rows) and j < len(new_rows):
+        old, new = old_rows[i], new_rows[j]
+        if old[:2] < new[:2]:
+            yield _change("removed", old, None)
+            i += 1
+        elif new[:2] < old[:2]:
+            yield _change("added", None, new)
+            j += 1
+        else:
+            if old != new:
+                yield _change("changed", old, new)
+            i += 1
+            j += 1
+    for old in old_rows[i:]:
+        yield _change("removed", old, None)
+    for new in new_rows[j:]:
+        yield _change("added", None, new)
+
+
+def summarize(changes) -> dict:
+    """Number of changes of each kind"""
+    summary = dict.fromkeys(CHANGE_KINDS, 0)
+    for change in changes:
+        summary[change["change"]] += 1
+    return summary
+
+
+def format_change(change: dict) -> str:
+    """One line of text for a change, e.g. '~ Users.usersGet: GET /users -> GET /users/:id'"""
+    old, new = change["old"], change["new"]
+    line = f"{_CHANGE_MARKS[change['change']]} {change['folder']}.{change['name']}: "
+    if old is None:
+        return line + f"{new['method']} {new['url']}"
+    if new is None:
+        return line + f"{old['method']} {old['url']}"
+    return line + f"{old['method']} {old['url']} -> {new['method']} {new['url']}"
@@ -0,0 +1,111 @@
+"""
+Searchable folder list with check marks for the converter GUI.
+
+A single ttk.Treeview holds one lightweight row per folder instead of one
+Checkbutton widget each, so Tk only draws the rows in view and loading a
+collection with hundreds of folders is instant. Typing in the filter box
+shows the matching folders only; check states are kept for hidden ones.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+CHECKED = "☑"
+UNCHECKED = "☐"
+# Delay before re-filtering after a key press
+FILTER_DELAY_MS = 150
+
+
+class FolderList(tk.Frame):
+    """Folders with a check mark each, filtered as you type"""
+
+    def __init__(self, master, bg="#1e1e1e", fg="#d4d4d4", entry_bg="#252526",
+                 select_bg="#37373d", font=("Segoe UI", 9)):
+        super().__init__(master, bg=bg)
+        self.counts = {}
+        self.checked = {}
+        self._rows = {}  # Treeview item id -> folder
+        self._filter_job = None
+
+        self.filter_var = tk.StringVar()
+        filter_entry = tk.Entry(
+            self, textvariable=self.filter_var, bg=entry_bg, fg=fg, insertbackground=fg,
+            relief=tk.FLAT, font=font)
+        filter_entry.pack(side=tk.TOP, fill=tk.X, pady=(0, 5), ipady=3)
+        self.filter_var.trace_add("write", lambda *args: self._schedule_filter())
+
+        style = ttk.Style(self)
+        style.configure("Folders.Treeview", background=bg, fieldbackground=bg, foreground=fg,
+                        borderwidth=0, font=font, rowheight=22)
+        style.configure("Folders.Treeview.Heading", background=entry_bg, foreground=fg, font=font)
+        style.map("Folders.Treeview", background=[("selected", select_bg)],
+                  foreground=[("selected", fg)])
+
+        tree_frame = tk.Frame(self, bg=bg)
+        tree_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(tree_frame, columns=("endpoints",), style="Folders.Treeview",
+                                 selectmode="browse")
+        self.tree.heading("#0", text="Folder", anchor="w")
+        self.tree.heading("endpoints", text="Endpoints", anchor="e")
+        self.tree.column("#0", width=220, stretch=True)
+        self.tree.column("endpoints", width=70, stretch=False, anchor="e")
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind("<Button-1>", self._on_click)
+        self.tree.bind("<space>", self._on_space)
+
+    def set_folders(self, counts: dict, keep_selection: bool = False):
+        """
+        Show these folders ({folder: endpoint count}), all checked; with
+        keep_selection, folders already listed keep their check mark.
+        """
+        previous = self.checked if keep_selection else {}
+        self.counts = dict(counts)
+        self.checked = {folder: previous.get(folder, True) for folder in counts}
+        self._refresh()
+
+    def selected(self) -> set:
+        return {folder for folder, checked in self.checked.items() if checked}
+
+    def set_visible_checked(self, checked: bool):
+        """Check or uncheck the folders the filter currently shows"""
+        for item, folder in self._rows.items():
+            self.checked[folder] = checked
+            self.tree.item(item, text=self._label(folder))
+
+    def _label(self, folder: str) -> str:
+        return f"{CHECKED if self.checked[folder] else UNCHECKED}  {folder}"
+
+    def _schedule_filter(self):
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(FILTER_DELAY_MS, self._refresh)
+
+    def _refresh(self):
+        """Re-insert the folders matching the filter"""
+        self._filter_job = None
+        needle = self.filter_var.get().strip().lower()
+        self.tree.delete(*self.tree.get_children())
+        self._rows = {}
+        for folder in sorted(self.counts):
+            if needle and needle not in folder.lower():
+                continue
+            item = self.tree.insert("", tk.END, text=self._label(folder), values=(self.counts[folder],))
+            self._rows[item] = folder
+
+    def _toggle(self, item: str):
+        folder = self._rows.get(item)
+        if folder is None:
+            return
+        self.checked[folder] = not self.checked[folder]
+        self.tree.item(item, text=self._label(folder))
+
+    def _on_click(self, event):
+        if self.tree.identify_region(event.x, event.y) in ("tree", "cell"):
+            self._toggle(self.tree.identify_row(event.y))
+
+    def _on_space(self, event):
+        self._toggle(self.tree.focus())
+        return "break"
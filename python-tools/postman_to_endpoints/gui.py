@@ -1,12 +1,25 @@
 """
 GUI application for Postman to TypeScript endpoints converter.
 """
-import json
 import tkinter as tk
-from tkinter import filedialog, messagebox, scrolledtext, ttk
+from tkinter import filedialog, messagebox, scrolledtext
 import os
-from postman_parser import walk_items
-from code_generator import generate_ts_classes
+import queue
+import threading
+from pathlib import Path
+from openapi_parser import load_endpoints
+from collection_diff import diff_endpoints, format_change, summarize
+from code_generator import FILE_HEADER, ClassCache, collision_report, generate_ts_classes, group_endpoints
+from interface_generator import generate_ts_interfaces, group_schemas, interface_file
+from output_writer import (code_output, folder_file, folder_outputs, manifest_path, unique_paths,
+                           write_changed)
+from folder_list import FolderList
+from utils import collection_name
+
+# Renames listed in the collision dialog; the rest are counted
+MAX_LISTED_RENAMES = 30
+# How often the Tk main thread picks up loading progress
+DRAIN_INTERVAL_MS = 100
 
 
 class App:
@@ -35,7 +48,12 @@ class App:
         self._create_ui()
         self.current_path = None
         self.endpoints = []
-        self.folder_vars = {}  # Dictionary to store folder checkbox variables
+        self.schemas = None  # (request, response) schemas per endpoint, read when interfaces are wanted
+        # Generated class per folder, reused while the folder's endpoints are unchanged
+        self.class_cache = ClassCache()
+        # Files are read on a worker thread, which only talks to Tk through this queue
+        self.load_queue = queue.Queue()
+        self.loading = False
 
     def _create_ui(self):
         """Create the user interface components."""
@@ -47,17 +65,17 @@ class App:
             top_frame, text="No file selected", bg=self.bg_color, fg=self.fg_color, font=("Segoe UI", 9))
         self.file_label.pack(side=tk.LEFT, expand=True, anchor="w")
 
-        browse_btn = tk.Button(
+        self.browse_btn = tk.Button(
             top_frame, text="Browse Postman Collection", command=self.browse_file,
             bg=self.button_bg, fg="white", activebackground=self.button_hover,
             activeforeground="white", relief=tk.FLAT, padx=10, pady=5, font=("Segoe UI", 9))
-        browse_btn.pack(side=tk.RIGHT, padx=5)
+        self.browse_btn.pack(side=tk.RIGHT, padx=5)
 
-        generate_btn = tk.Button(
+        self.generate_btn = tk.Button(
             top_frame, text="Generate", command=self.generate_code,
             bg=self.button_bg, fg="white", activebackground=self.button_hover,
             activeforeground="white", relief=tk.FLAT, padx=10, pady=5, font=("Segoe UI", 9))
-        generate_btn.pack(side=tk.RIGHT, padx=5)
+        self.generate_btn.pack(side=tk.RIGHT, padx=5)
 
         copy_btn = tk.Button(
             top_frame, text="Copy to Clipboard", command=self.copy_to_clipboard,
@@ -71,6 +89,26 @@ class App:
             activeforeground="white", relief=tk.FLAT, padx=10, pady=5, font=("Segoe UI", 9))
         save_btn.pack(side=tk.RIGHT, padx=5)
 
+        self.save_folders_btn = tk.Button(
+            top_frame, text="Save Folder Files", command=self.save_folder_files,
+            bg=self.button_bg, fg="white", activebackground=self.button_hover,
+            activeforeground="white", relief=tk.FLAT, padx=10, pady=5, font=("Segoe UI", 9))
+        self.save_folders_btn.pack(side=tk.RIGHT, padx=5)
+
+        self.compare_btn = tk.Button(
+            top_frame, text="Compare With...", command=self.compare_file,
+            bg=self.button_bg, fg="white", activebackground=self.button_hover,
+            activeforeground="white", relief=tk.FLAT, padx=10, pady=5, font=("Segoe UI", 9))
+        self.compare_btn.pack(side=tk.RIGHT, padx=5)
+
+        self.interfaces_var = tk.BooleanVar(value=False)
+        self.interfaces_check = tk.Checkbutton(
+            top_frame, text="Interfaces", variable=self.interfaces_var,
+            bg=self.checkbox_bg, fg=self.checkbox_fg, selectcolor=self.checkbox_select,
+            activebackground=self.checkbox_bg, activeforeground=self.checkbox_fg,
+            font=("Segoe UI", 9), command=self.on_interfaces_toggled)
+        self.interfaces_check.pack(side=tk.RIGHT, padx=5)
+
         # Middle frame with folder selection and code preview
         middle_frame = tk.Frame(self.root, bg=self.bg_color)
         middle_frame.pack(side=tk.TOP, fill=tk.BOTH,
@@ -85,33 +123,11 @@ class App:
             font=("Segoe UI", 10, "bold"), anchor="w")
         folder_label.pack(side=tk.TOP, fill=tk.X, pady=(0, 5))
 
-        # Scrollable frame for checkboxes
-        checkbox_frame = tk.Frame(left_panel, bg=self.bg_color)
-        checkbox_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-
-        # Canvas and scrollbar for folder selection
-        canvas = tk.Canvas(checkbox_frame, bg=self.bg_color,
-                           highlightthickness=0)
-        scrollbar = ttk.Scrollbar(
-            checkbox_frame, orient="vertical", command=canvas.yview)
-        self.checkbox_container = tk.Frame(canvas, bg=self.bg_color)
-
-        self.checkbox_container.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-
-        canvas.create_window(
-            (0, 0), window=self.checkbox_container, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        # Enable mousewheel scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
-
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Folder list, filtered as you type
+        self.folder_list = FolderList(
+            left_panel, bg=self.bg_color, fg=self.fg_color, entry_bg=self.entry_bg,
+            select_bg=self.select_bg)
+        self.folder_list.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
         # Select all/none buttons
         select_buttons_frame = tk.Frame(left_panel, bg=self.bg_color)
@@ -156,68 +172,200 @@ class App:
         status_bar.pack(side=tk.BOTTOM, fill=tk.X)
 
     def browse_file(self):
-        """Browse and load a Postman collection JSON file."""
+        """Browse for a Postman collection JSON file or an OpenAPI spec and load it."""
         file_path = filedialog.askopenfilename(
-            title="Select Postman Collection JSON",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            title="Select Postman Collection or OpenAPI Spec",
+            filetypes=[("JSON files", "*.json"), ("OpenAPI YAML files", "*.yaml *.yml"),
+                       ("All files", "*.*")]
         )
         if not file_path:
             return
+        self.start_loading(file_path, self.interfaces_var.get())
+
+    def on_interfaces_toggled(self):
+        """Read the examples in the background when interfaces are enabled after loading."""
+        if (self.interfaces_var.get() and self.endpoints and self.schemas is None
+                and not self.loading):
+            self.start_loading(self.current_path, True, keep_selection=True)
+
+    def start_loading(self, file_path, with_schemas, keep_selection=False, then=None):
+        """
+        Read a file on a worker thread; the UI stays responsive and shows progress.
+        then, if given, is called on the Tk thread once the file is loaded.
+        """
+        self.file_label.config(text=f"Loading {os.path.basename(file_path)}...")
+
+        def load(progress):
+            # Collections are streamed so large exports with embedded responses are never loaded whole
+            schemas = [] if with_schemas else None
+            endpoints = load_endpoints(file_path, schemas, progress)
+            return "done", (file_path, endpoints, schemas, keep_selection, then)
+
+        self.run_worker(load, "Loading...")
+
+    def compare_file(self):
+        """Compare the loaded collection with a newer version of it."""
+        if not self.endpoints:
+            messagebox.showwarning(
+                "No endpoints", "Please load a Postman collection first.")
+            return
 
-        self.current_path = file_path
-        self.file_label.config(text=os.path.basename(file_path))
-
+        new_path = filedialog.askopenfilename(
+            title="Select the New Version to Compare With",
+            filetypes=[("JSON files", "*.json"), ("OpenAPI YAML files", "*.yaml *.yml"),
+                       ("All files", "*.*")]
+        )
+        if not new_path:
+            return
+        old_endpoints = self.endpoints
+
+        def compare(progress):
+            new_endpoints = load_endpoints(new_path, progress=progress)
+            return "diff", (new_path, list(diff_endpoints(old_endpoints, new_endpoints)))
+
+        self.run_worker(compare, f"Comparing with {os.path.basename(new_path)}...")
+
+    def busy_widgets(self):
+        """Controls disabled while a worker runs (the Interfaces box too, as it triggers a re-read)"""
+        return (self.browse_btn, self.generate_btn, self.save_folders_btn, self.compare_btn,
+                self.interfaces_check)
+
+    def run_worker(self, work, status):
+        """
+        Run work(progress) on a worker thread. work never touches Tk: it returns
+        (kind, payload) for finish_loading, and progress posts to load_queue.
+        """
+        self.loading = True
+        for widget in self.busy_widgets():
+            widget.config(state=tk.DISABLED)
+        self.status_var.set(status)
+
+        def run():
+            def progress(done, total):
+                self.load_queue.put(("progress", (done, total)))
+            try:
+                self.load_queue.put(work(progress))
+            except Exception as e:
+                self.load_queue.put(("error", str(e)))
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+        self.root.after(DRAIN_INTERVAL_MS, self.drain_load_queue)
+
+    def drain_load_queue(self):
+        """Show the latest progress and handle the end of loading (Tk main thread)."""
+        progress = None
+        finished = None
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                collection = json.load(f)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to read JSON file:\n{e}")
+            while finished is None:
+                kind, payload = self.load_queue.get_nowait()
+                if kind == "progress":
+                    # Only the latest progress matters
+                    progress = payload
+                else:
+                    finished = (kind, payload)
+        except queue.Empty:
+            pass
+        if progress and not finished:
+            done, total = progress
+            percent = 100 * done // total if total else 100
+            self.status_var.set(
+                f"Loading... {done / (1024 * 1024):.1f} of {total / (1024 * 1024):.1f} MB ({percent}%)")
+        if finished:
+            self.finish_loading(*finished)
+        else:
+            self.root.after(DRAIN_INTERVAL_MS, self.drain_load_queue)
+
+    def finish_loading(self, kind, payload):
+        """Show the loaded folders, the comparison, or the error (Tk main thread)."""
+        self.loading = False
+        for widget in self.busy_widgets():
+            widget.config(state=tk.NORMAL)
+
+        if kind == "error":
+            self.file_label.config(
+                text=os.path.basename(self.current_path) if self.current_path else "No file selected")
+            messagebox.showerror("Error", f"Failed to read file:\n{payload}")
             self.status_var.set("Error reading file.")
             return
+        if kind == "diff":
+            self.show_diff(*payload)
+            return
 
-        items = collection.get("item", [])
-        self.endpoints = list(walk_items(items))
+        file_path, endpoints, schemas, keep_selection, then = payload
+        self.current_path = file_path
+        self.file_label.config(text=os.path.basename(file_path))
+        self.endpoints = endpoints
+        self.schemas = schemas
 
         if not self.endpoints:
+            self.folder_list.set_folders({})
             messagebox.showwarning(
                 "No endpoints", "No requests found in this collection.")
             self.status_var.set("No endpoints found.")
             return
 
-        # Get unique folders
-        folders = set()
+        counts = {}
         for _, _, _, folder in self.endpoints:
-            folders.add(folder)
-
-        # Clear existing checkboxes
-        for widget in self.checkbox_container.winfo_children():
-            widget.destroy()
-        self.folder_vars = {}
-
-        # Create checkboxes for each folder
-        for folder in sorted(folders):
-            var = tk.BooleanVar(value=True)  # Default to selected
-            self.folder_vars[folder] = var
-
-            checkbox = tk.Checkbutton(
-                self.checkbox_container, text=folder, variable=var,
-                bg=self.checkbox_bg, fg=self.checkbox_fg, selectcolor=self.checkbox_select,
-                activebackground=self.checkbox_bg, activeforeground=self.checkbox_fg,
-                font=("Segoe UI", 9), anchor="w", padx=5, pady=2)
-            checkbox.pack(fill=tk.X, padx=5, pady=2)
+            counts[folder] = counts.get(folder, 0) + 1
+        self.folder_list.set_folders(counts, keep_selection)
 
         self.status_var.set(
-            f"Loaded {len(self.endpoints)} endpoints from {len(folders)} folders. Select folders and click Generate.")
+            f"Loaded {len(self.endpoints)} endpoints from {len(counts)} folders. Select folders and click Generate.")
+        if then is not None:
+            then()
+
+    def needs_examples(self, then):
+        """
+        True if interfaces are wanted but the file was loaded without its examples;
+        the examples are read in the background and then() runs once they are.
+        """
+        if not self.interfaces_var.get() or self.schemas is not None:
+            return False
+        self.start_loading(self.current_path, True, keep_selection=True, then=then)
+        return True
+
+    def show_diff(self, new_path, changes):
+        """Summary of the endpoints added, removed or changed in new_path, in a window."""
+        summary = summarize(changes)
+        text = (f"{summary['added']} added, {summary['removed']} removed, "
+                f"{summary['changed']} changed")
+        self.status_var.set(f"Compared with {os.path.basename(new_path)}: {text}.")
+
+        window = tk.Toplevel(self.root)
+        window.title(f"Changes in {os.path.basename(new_path)}")
+        window.geometry("800x500")
+        window.configure(bg=self.bg_color)
+        tk.Label(
+            window, text=f"{os.path.basename(self.current_path)} -> {os.path.basename(new_path)}: {text}",
+            bg=self.bg_color, fg=self.fg_color, font=("Segoe UI", 10, "bold"), anchor="w"
+        ).pack(side=tk.TOP, fill=tk.X, padx=10, pady=(10, 5))
+        changes_area = scrolledtext.ScrolledText(
+            window, wrap=tk.NONE, font=("Consolas", 10),
+            bg=self.text_bg, fg=self.text_fg, insertbackground=self.fg_color,
+            selectbackground=self.select_bg, selectforeground=self.fg_color,
+            relief=tk.FLAT, borderwidth=1, highlightthickness=1,
+            highlightbackground="#3e3e42", highlightcolor=self.button_bg)
+        changes_area.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        changes_area.insert(tk.END, "\n".join(format_change(change) for change in changes)
+                            or "No endpoints were added, removed or changed.")
+        changes_area.config(state=tk.DISABLED)
 
     def select_all_folders(self):
-        """Select all folder checkboxes."""
-        for var in self.folder_vars.values():
-            var.set(True)
+        """Check the folders shown by the filter."""
+        self.folder_list.set_visible_checked(True)
 
     def select_none_folders(self):
-        """Deselect all folder checkboxes."""
-        for var in self.folder_vars.values():
-            var.set(False)
+        """Uncheck the folders shown by the filter."""
+        self.folder_list.set_visible_checked(False)
+
+    def interface_code(self, selected_folders):
+        """Interfaces per selected folder ("" for folders without JSON examples)."""
+        grouped = group_endpoints(self.endpoints, selected_folders)
+        grouped_schemas = group_schemas(self.endpoints, self.schemas, selected_folders)
+        return {folder: generate_ts_interfaces(folder, grouped[folder], grouped_schemas[folder])
+                for folder in sorted(grouped)}
 
     def generate_code(self):
         """Generate TypeScript code for selected folders."""
@@ -227,29 +375,99 @@ class App:
             return
 
         # Get selected folders
-        selected_folders = {
-            folder for folder, var in self.folder_vars.items() if var.get()
-        }
+        selected_folders = self.folder_list.selected()
 
         if not selected_folders:
             messagebox.showwarning(
                 "No folders selected", "Please select at least one folder.")
             return
+        if self.needs_examples(self.generate_code):
+            return
 
-        ts_code = generate_ts_classes(self.endpoints, selected_folders)
+        generated, reused = self.class_cache.generated, self.class_cache.reused
+        ts_code = generate_ts_classes(self.endpoints, selected_folders, self.class_cache)
+        if ts_code and self.interfaces_var.get():
+            interfaces = "\n\n".join(
+                code for code in self.interface_code(selected_folders).values() if code)
+            if interfaces:
+                ts_code += "\n\n" + interfaces
 
         self.text_area.delete("1.0", tk.END)
         if ts_code:
-            self.text_area.insert(
-                tk.END, "// Generated from Postman collection\n\n")
+            self.text_area.insert(tk.END, FILE_HEADER)
             self.text_area.insert(tk.END, ts_code)
             count = sum(1 for _, _, _,
                         f in self.endpoints if f in selected_folders)
             self.status_var.set(
-                f"Generated {count} endpoints from {len(selected_folders)} folder(s).")
+                f"Generated {count} endpoints from {len(selected_folders)} folder(s) "
+                f"({self.class_cache.generated - generated} regenerated, "
+                f"{self.class_cache.reused - reused} reused).")
+            self.show_collisions(
+                collision_report(group_endpoints(self.endpoints, selected_folders)))
         else:
             self.status_var.set("No endpoints to generate.")
 
+    def show_collisions(self, renamed):
+        """Tell which members were renamed because their names collided."""
+        if not renamed:
+            return
+        self.status_var.set(
+            f"{self.status_var.get()} {len(renamed)} colliding member(s) renamed.")
+        lines = [f"{r['folder']}: {r['original']} -> {r['renamed']} ({r['reason']}, {r['method']})"
+                 for r in renamed[:MAX_LISTED_RENAMES]]
+        if len(renamed) > MAX_LISTED_RENAMES:
+            lines.append(f"... and {len(renamed) - MAX_LISTED_RENAMES} more")
+        messagebox.showwarning(
+            "Renamed members",
+            "These endpoints had colliding names and were renamed:\n\n" + "\n".join(lines))
+
+    def save_folder_files(self):
+        """
+        Write one .ts file per selected folder (and its interfaces file, if enabled),
+        skipping files unchanged since the last save.
+        """
+        if not self.endpoints:
+            messagebox.showwarning(
+                "No endpoints", "Please load a Postman collection first.")
+            return
+
+        selected_folders = self.folder_list.selected()
+        if not selected_folders:
+            messagebox.showwarning(
+                "No folders selected", "Please select at least one folder.")
+            return
+        if self.needs_examples(self.save_folder_files):
+            return
+
+        out_dir = filedialog.askdirectory(title="Select Output Directory")
+        if not out_dir:
+            return
+
+        name = collection_name(self.current_path)
+        try:
+            paths = unique_paths(self.folder_list.counts, folder_file)
+            outputs = folder_outputs(group_endpoints(self.endpoints, selected_folders), paths)
+            kept = set(paths.values())
+            if self.interfaces_var.get():
+                interface_paths = unique_paths(self.folder_list.counts, interface_file)
+                outputs.extend(code_output(interface_paths[folder], code)
+                               for folder, code in self.interface_code(selected_folders).items() if code)
+                kept |= set(interface_paths.values())
+            result = write_changed(
+                Path(out_dir), outputs, manifest_path(Path(out_dir), name), kept=kept)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save files:\n{e}")
+            self.status_var.set("Error saving files.")
+            return
+
+        message = (f"Wrote {len(result['written'])} file(s), "
+                   f"{len(result['unchanged'])} unchanged.")
+        self.status_var.set(f"{message} Saved to {out_dir}")
+        if result["stale"]:
+            message += "\n\nNo longer generated:\n" + "\n".join(
+                os.path.basename(path) for path in result["stale"])
+        messagebox.showinfo("Saved", message)
+
     def save_file(self):
         """Save the generated TypeScript code to a file."""
         code = self.text_area.get("1.0", tk.END).strip()
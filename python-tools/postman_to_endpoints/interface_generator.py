@@ -0,0 +1,48 @@
+"""
+Functions for generating TypeScript interfaces from inferred request/response schemas.
+
+Interfaces go to types/interfaces/<name>Interface.ts next to the EndPoints
+classes, the layout generate_feature creates for a feature.
+"""
+from code_generator import resolve_field_names
+from schema_inference import render_declaration
+from utils import camel_case
+
+INTERFACES_DIR = "types/interfaces"
+
+
+def interface_file(name: str, subdir: str = "") -> str:
+    """Relative path of the interfaces file for a folder or collection"""
+    relative_path = f"{INTERFACES_DIR}/{camel_case(name)}Interface.ts"
+    return f"{subdir}/{relative_path}" if subdir else relative_path
+
+
+def group_schemas(endpoints, schemas, selected_folders=None):
+    """
+    Group the (request, response) schema pairs collected by stream_endpoints by
+    folder, aligned with group_endpoints for the same endpoints and selection.
+    """
+    grouped = {}
+    for (_, _, _, folder), pair in zip(endpoints, schemas):
+        if selected_folders is None or folder in selected_folders:
+            grouped.setdefault(folder, []).append(pair)
+    return grouped
+
+
+def generate_ts_interfaces(folder, folder_endpoints, folder_schemas):
+    """
+    Generate the interfaces of one folder: <Member>RequestInterface for raw JSON
+    request bodies and <Member>ResponseInterface for saved example responses,
+    named after the (collision-free) class members. Returns "" if no endpoint
+    has JSON examples.
+    """
+    names, _ = resolve_field_names(folder_endpoints)
+    declarations = []
+    for name, pair in zip(names, folder_schemas):
+        if name is None:
+            continue
+        pascal_name = name[0].upper() + name[1:]
+        for suffix, schema in zip(("Request", "Response"), pair):
+            if schema.examples:
+                declarations.append(render_declaration(f"{pascal_name}{suffix}Interface", schema))
+    return "\n\n".join(declarations)
@@ -0,0 +1,210 @@
+"""
+Functions for parsing OpenAPI 3 / Swagger 2 specs (JSON or YAML).
+
+iter_endpoints yields the same (field_name, url, method, folder) tuples as
+postman_parser.walk_items, with operations grouped by their first tag, so
+the code generator and the GUI handle specs like collections.
+
+Local $refs ("#/components/...") are resolved only when an operation needs
+them, and each one is resolved once: RefResolver caches every target.
+YAML specs need PyYAML (its C loader is used when available).
+"""
+import json
+import os
+import re
+from pathlib import Path
+from urllib.parse import urlparse
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from schema_inference import MAX_EXAMPLES, SchemaNode
+from streaming_parser import _JsonLexer, stream_endpoints
+from utils import camel_case, normalize_url, param_name
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+YAML_SUFFIXES = (".yaml", ".yml")
+DEFAULT_FOLDER = "General"
+
+# {id} path template variables
+_PATH_PARAM_RE = re.compile(r"\{([^{}/]+)\}")
+# Word boundaries inside camelCase operationIds ("getUserById")
+_CAMEL_BOUNDARY_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+class RefResolver:
+    """Resolve local JSON pointers ("#/a/b") in a spec, caching every resolved target"""
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self._cache = {}
+
+    def resolve(self, ref: str):
+        """Target of a $ref, following chained refs; None for external or broken refs"""
+        if ref in self._cache:
+            return self._cache[ref]
+        self._cache[ref] = None  # a ref cycle resolves to None
+        target = None
+        if ref.startswith("#"):
+            target = self.spec
+            for token in ref[1:].split("/")[1:]:
+                token = token.replace("~1", "/").replace("~0", "~")
+                if isinstance(target, dict):
+                    target = target.get(token)
+                elif isinstance(target, list) and token.isdigit() and int(token) < len(target):
+                    target = target[int(token)]
+                else:
+                    target = None
+                if target is None:
+                    break
+            if isinstance(target, dict) and isinstance(target.get("$ref"), str):
+                target = self.resolve(target["$ref"])
+        self._cache[ref] = target
+        return target
+
+    def deref(self, node):
+        """node itself, or its target if it is a {"$ref": ...} object"""
+        if isinstance(node, dict) and isinstance(node.get("$ref"), str):
+            return self.resolve(node["$ref"])
+        return node
+
+
+def is_openapi(file_path) -> bool:
+    """True for YAML files and JSON files with a top-level openapi/swagger key"""
+    if Path(file_path).suffix.lower() in YAML_SUFFIXES:
+        return True
+    with open(file_path, "r", encoding="utf-8") as f:
+        lexer = _JsonLexer(f)
+        if lexer.peek() != "{":
+            return False
+        # Only the top-level keys are read, up to the first telling one
+        for key in lexer.object_keys():
+            if key in ("openapi", "swagger"):
+                return True
+            if key == "item":
+                return False
+            lexer.skip_value()
+    return False
+
+
+def load_spec(file_path) -> dict:
+    """Load a JSON or YAML spec"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        if Path(file_path).suffix.lower() not in YAML_SUFFIXES:
+            spec = json.load(f)
+        elif yaml is None:
+            raise ValueError("Reading YAML specs needs PyYAML (pip install pyyaml)")
+        else:
+            spec = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    if not isinstance(spec, dict) or not ("openapi" in spec or "swagger" in spec):
+        raise ValueError("Not an OpenAPI or Swagger spec")
+    return spec
+
+
+def base_path(spec: dict) -> str:
+    """Path prefix every operation path is relative to (server url path or Swagger basePath)"""
+    if "swagger" in spec:
+        prefix = spec.get("basePath") or ""
+    else:
+        servers = spec.get("servers") or [{}]
+        prefix = urlparse((servers[0] or {}).get("url") or "").path
+    return prefix.rstrip("/")
+
+
+def operation_url(prefix: str, path: str) -> str:
+    """Normalized url of an operation: {id} path variables become :id"""
+    path = _PATH_PARAM_RE.sub(lambda m: ":" + param_name(m.group(1).strip()), path)
+    return normalize_url(prefix + path)
+
+
+def _media_examples(resolver: RefResolver, content):
+    """Example values of a JSON media type object (example, or examples[*].value)"""
+    if not isinstance(content, dict):
+        return
+    for media_type, media in content.items():
+        media = resolver.deref(media)
+        if "json" not in media_type or not isinstance(media, dict):
+            continue
+        if "example" in media:
+            yield media["example"]
+        examples = media.get("examples")
+        for example in (examples.values() if isinstance(examples, dict) else ()):
+            example = resolver.deref(example)
+            if isinstance(example, dict) and "value" in example:
+                yield example["value"]
+
+
+def _add_examples(schema: SchemaNode, examples):
+    for sampled, value in enumerate(examples):
+        if sampled >= MAX_EXAMPLES:
+            break
+        schema.add(value)
+
+
+def _operation_schemas(resolver: RefResolver, operation: dict):
+    """(request body, response) SchemaNodes from the JSON examples of an operation"""
+    request_schema, response_schema = SchemaNode(), SchemaNode()
+    request_body = resolver.deref(operation.get("requestBody"))
+    if isinstance(request_body, dict):
+        _add_examples(request_schema, _media_examples(resolver, request_body.get("content")))
+    responses = operation.get("responses") or {}
+    if isinstance(responses, dict):
+        success = (resolver.deref(response) for status, response in responses.items()
+                   if str(status).startswith("2"))
+        _add_examples(response_schema, (value for response in success if isinstance(response, dict)
+                                        for value in _media_examples(resolver, response.get("content"))))
+    return request_schema, response_schema
+
+
+def iter_endpoints(spec: dict, schemas: list = None):
+    """
+    Yield (field_name, url, method, folder) for every operation, in document order.
+    folder is the operation's first tag; field_name is built from the tag and the
+    operationId (or summary, or method and path), as Postman names are from folders.
+    If a schemas list is given, a (request body, response) pair of SchemaNodes
+    built from the operation's JSON examples is appended for each endpoint.
+    """
+    resolver = RefResolver(spec)
+    prefix = base_path(spec)
+    paths = spec.get("paths") or {}
+    for path, path_item in paths.items():
+        path_item = resolver.deref(path_item)
+        if not isinstance(path_item, dict):
+            continue
+        url = operation_url(prefix, path)
+        for method, operation in path_item.items():
+            if method not in HTTP_METHODS:
+                continue
+            operation = resolver.deref(operation)
+            if not isinstance(operation, dict):
+                continue
+            tags = operation.get("tags") or [DEFAULT_FOLDER]
+            folder = str(tags[0])
+            name = operation.get("operationId") or operation.get("summary") or f"{method} {path}"
+            if schemas is not None:
+                schemas.append(_operation_schemas(resolver, operation))
+            yield camel_case(folder, _CAMEL_BOUNDARY_RE.sub(" ", str(name))), url, method.upper(), folder
+
+
+def spec_endpoints(file_path, schemas: list = None):
+    """Yield the endpoints of an OpenAPI/Swagger spec file"""
+    yield from iter_endpoints(load_spec(file_path), schemas)
+
+
+def load_endpoints(file_path, schemas: list = None, progress=None) -> list:
+    """
+    Endpoints of a Postman collection or an OpenAPI/Swagger spec, whichever the file is.
+    progress, if given, is called with (bytes read, file size) as the file is read
+    (for specs, which are loaded whole, only at the start and the end).
+    """
+    if not is_openapi(file_path):
+        return list(stream_endpoints(file_path, schemas=schemas, progress=progress))
+    total = os.path.getsize(file_path)
+    if progress is not None:
+        progress(0, total)
+    endpoints = list(spec_endpoints(file_path, schemas))
+    if progress is not None:
+        progress(total, total)
+    return endpoints
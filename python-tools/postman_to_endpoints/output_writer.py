@@ -0,0 +1,142 @@
+"""
+Incremental writing of generated .ts files.
+
+A sidecar manifest next to the output records, for each file written, the
+digest of the endpoints it was generated from. On the next run a file whose
+digest still matches (and which still exists) is neither regenerated nor
+rewritten, so updating a collection only touches the folders that changed.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from code_generator import FILE_HEADER, folder_digest, generate_ts_class
+from utils import camel_case
+
+MANIFEST_VERSION = 1
+
+
+def manifest_path(out_dir: Path, name: str) -> Path:
+    """Sidecar manifest of one collection's output, inside out_dir"""
+    return Path(out_dir) / f".{name}.endpoints-manifest.json"
+
+
+class OutputManifest:
+    """Digest per generated file (paths relative to the output directory)"""
+
+    def __init__(self, manifest_file: Path = None):
+        self.manifest_file = manifest_file
+        self.files = {}
+
+    @classmethod
+    def load(cls, manifest_file: Path) -> 'OutputManifest':
+        """Load a manifest, or start empty if it is missing, unreadable or from another version"""
+        manifest = cls(manifest_file)
+        try:
+            with open(manifest_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+        if isinstance(data, dict) and data.get("version") == MANIFEST_VERSION:
+            manifest.files = data.get("files", {})
+        return manifest
+
+    def is_current(self, relative_path: str, digest: str, out_dir: Path) -> bool:
+        return self.files.get(relative_path) == digest and (out_dir / relative_path).is_file()
+
+    def save(self):
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_file, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "files": self.files}, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+def folder_file(folder: str, subdir: str = "") -> str:
+    """Relative path of a folder's .ts file"""
+    file_name = f"{camel_case(folder)}EndPoints.ts"
+    return f"{subdir}/{file_name}" if subdir else file_name
+
+
+def unique_paths(folders, path_for) -> dict:
+    """
+    Map each folder to path_for(folder). Folders whose paths clash (also when
+    they differ only in case) get a numbered path, e.g. usersEndPoints2.ts,
+    in sorted folder order, so the same folders always get the same files.
+    """
+    paths = {}
+    taken = set()
+    for folder in sorted(folders):
+        path = path_for(folder)
+        stem, suffix = os.path.splitext(path)
+        number = 2
+        while path.casefold() in taken:
+            path = f"{stem}{number}{suffix}"
+            number += 1
+        taken.add(path.casefold())
+        paths[folder] = path
+    return paths
+
+
+def folder_outputs(grouped: dict, paths: dict) -> list:
+    """
+    (relative path, digest, generate) for one .ts file per folder, from
+    group_endpoints output and the folders' paths from unique_paths;
+    generate() is only called for changed files.
+    """
+    outputs = []
+    for folder in sorted(grouped):
+        outputs.append((paths[folder], folder_digest(folder, grouped[folder]),
+                        lambda folder=folder: generate_ts_class(folder, grouped[folder])))
+    return outputs
+
+
+def combined_output(grouped: dict, relative_path: str) -> tuple:
+    """(relative path, digest, generate) for a single .ts file holding every folder's class"""
+    digests = [folder_digest(folder, grouped[folder]) for folder in sorted(grouped)]
+    digest = hashlib.sha256("\n".join(digests).encode("ascii")).hexdigest()
+
+    def generate():
+        return "\n\n".join(generate_ts_class(folder, grouped[folder]) for folder in sorted(grouped))
+    return relative_path, digest, generate
+
+
+def code_output(relative_path: str, code: str) -> tuple:
+    """(relative path, digest, generate) for code that is already generated"""
+    return relative_path, hashlib.sha256(code.encode("utf-8")).hexdigest(), lambda: code
+
+
+def write_changed(out_dir: Path, outputs: list, manifest_file: Path, force: bool = False,
+                  kept: set = frozenset()) -> dict:
+    """
+    Write the outputs whose digest differs from the manifest (all of them when
+    forced) and save the updated manifest. kept lists relative paths that are
+    not written this time but still valid (e.g. folders left out of the
+    selection); other files recorded in the manifest but no longer produced are
+    reported as stale and left in place.
+    Returns {'written', 'unchanged', 'stale'} lists of paths.
+    """
+    out_dir = Path(out_dir)
+    manifest = OutputManifest.load(manifest_file)
+    written, unchanged = [], []
+
+    for relative_path, digest, generate in outputs:
+        target = out_dir / relative_path
+        if not force and manifest.is_current(relative_path, digest, out_dir):
+            unchanged.append(target)
+            continue
+        code = generate()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "w", encoding="utf-8") as f:
+            f.write(FILE_HEADER + code + "\n")
+        manifest.files[relative_path] = digest
+        written.append(target)
+
+    produced = {relative_path for relative_path, _, _ in outputs} | set(kept)
+    stale = sorted(out_dir / relative_path for relative_path in manifest.files if relative_path not in produced)
+    manifest.files = {relative_path: digest for relative_path, digest in manifest.files.items()
+                      if relative_path in produced}
+    if written or stale or not manifest_file.is_file():
+        manifest.save()
+
+    return {"written": written, "unchanged": unchanged, "stale": stale}
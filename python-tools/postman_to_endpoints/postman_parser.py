@@ -1,7 +1,10 @@
 """
 Functions for parsing Postman collection JSON files.
 """
-from utils import camel_case
+from utils import join_camel, name_tokens, normalize_url
+
+# Marks an exhausted item iterator on the walk stack
+_DONE = object()
 
 
 def extract_url(request_obj):
@@ -33,35 +36,40 @@ def extract_url(request_obj):
 
 def walk_items(items, parent_names=None, top_folder=None):
     """
-    Recursively walk Postman 'item' array and yield (field_name, url, method, top_folder_name).
-    top_folder_name is the first-level folder under collection root.
-    """
-    if parent_names is None:
-        parent_names = []
+    Walk Postman 'item' array and yield (field_name, url, method, top_folder_name).
+    top_folder_name is the first-level folder under collection root; url is
+    normalized with normalize_url (base removed, path variables as :param).
 
+    Iterative, with an explicit stack: each frame keeps its ancestors' names
+    already joined in camelCase, so every name is tokenized once and a
+    request costs only its own name, however deep the folder tree is.
+    """
     if not items:
         return
 
-    for it in items:
+    prefix = join_camel([t for name in parent_names or [] for t in name_tokens(name)])
+    # (remaining items, camelCased ancestor names, nested below a root folder, top folder)
+    stack = [(iter(items), prefix, bool(parent_names), top_folder)]
+
+    while stack:
+        siblings, prefix, nested, top = stack[-1]
+        it = next(siblings, _DONE)
+        if it is _DONE:
+            stack.pop()
+            continue
+
         item_name = it.get("name", "Unnamed")
         children = it.get("item")
         request = it.get("request")
 
-        # determine current top folder
-        if parent_names:
-            current_top = top_folder
-        else:
-            # this is a direct child of root collection
-            current_top = item_name if children else item_name if top_folder is None else top_folder
-
         if children:
-            # Folder
-            new_parent = parent_names + [item_name]
-            # if this is the first folder level, set top_folder to its name
-            new_top = current_top if parent_names else item_name
-            yield from walk_items(children, new_parent, new_top)
+            # Folder: the first folder level sets the top folder to its name
+            own_prefix = join_camel(name_tokens(item_name), prefix)
+            stack.append((iter(children), own_prefix, True, top if nested else item_name))
         elif request:
-            url = extract_url(request)
+            # Direct children of the root collection are their own top folder
+            current_top = top if nested or top is not None else item_name
+            url = normalize_url(extract_url(request))
             method = request.get("method", "GET")
-            field_name = camel_case(*parent_names, item_name)
-            yield field_name, url, method, (top_folder or current_top or "General")
+            field_name = join_camel(name_tokens(item_name), prefix) or "endpoint"
+            yield field_name, url, method, (top or current_top or "General")
@@ -0,0 +1,130 @@
+"""
+Infer TypeScript types from JSON examples (request bodies, saved responses).
+
+Examples are merged one at a time into a SchemaNode, so only the merged
+schema is kept, never the examples themselves. Inference is bounded: only
+the first MAX_ARRAY_SAMPLES elements of an array and MAX_DEPTH levels of
+nesting are looked at, and callers sample at most MAX_EXAMPLES examples of
+at most MAX_EXAMPLE_CHARS characters per endpoint.
+"""
+import datetime
+import json
+import re
+
+# Examples sampled per endpoint and kind (request body / response)
+MAX_EXAMPLES = 5
+# Larger example bodies are skipped without being decoded
+MAX_EXAMPLE_CHARS = 1024 * 1024
+# Array elements merged into the element type
+MAX_ARRAY_SAMPLES = 20
+# Deeper values are typed as unknown
+MAX_DEPTH = 10
+
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_$][A-Za-z0-9_$]*$")
+_PRIMITIVE_ORDER = ("string", "number", "boolean", "null")
+
+
+class SchemaNode:
+    """Merged type of every value seen at one position"""
+
+    __slots__ = ("examples", "primitives", "object_count", "fields", "field_counts", "items", "truncated")
+
+    def __init__(self):
+        self.examples = 0
+        self.primitives = set()
+        self.object_count = 0
+        self.fields = {}
+        self.field_counts = {}
+        self.items = None
+        self.truncated = False
+
+    def add(self, value, depth: int = 0):
+        """Merge one decoded JSON value into this node"""
+        self.examples += 1
+        if depth >= MAX_DEPTH:
+            self.truncated = True
+        elif isinstance(value, dict):
+            self.object_count += 1
+            for key, child in value.items():
+                node = self.fields.get(key)
+                if node is None:
+                    node = self.fields[key] = SchemaNode()
+                    self.field_counts[key] = 0
+                node.add(child, depth + 1)
+                self.field_counts[key] += 1
+        elif isinstance(value, list):
+            if self.items is None:
+                self.items = SchemaNode()
+            for child in value[:MAX_ARRAY_SAMPLES]:
+                self.items.add(child, depth + 1)
+        elif isinstance(value, str):
+            self.primitives.add("string")
+        elif isinstance(value, bool):
+            self.primitives.add("boolean")
+        elif isinstance(value, (int, float)):
+            self.primitives.add("number")
+        elif value is None:
+            self.primitives.add("null")
+        elif isinstance(value, (datetime.date, datetime.time)):
+            # Unquoted YAML dates and times; JSON sends them as strings
+            self.primitives.add("string")
+        else:
+            # Any other non-JSON value (e.g. YAML binary or sets)
+            self.truncated = True
+
+    def add_text(self, text) -> bool:
+        """Merge one example given as JSON text; False if it is not JSON (or too large)"""
+        if not isinstance(text, str) or not text.strip() or len(text) > MAX_EXAMPLE_CHARS:
+            return False
+        try:
+            value = json.loads(text)
+        except ValueError:
+            return False
+        self.add(value)
+        return True
+
+    def to_ts(self, indent: str = "") -> str:
+        """TypeScript type expression; nested objects are written inline"""
+        if self.truncated or not self.examples:
+            return "unknown"
+        types = []
+        if self.object_count:
+            types.append(self._object_ts(indent))
+        if self.items is not None:
+            item_type = self.items.to_ts(indent)
+            types.append(f"({item_type})[]" if " | " in item_type else f"{item_type}[]")
+        types.extend(name for name in _PRIMITIVE_ORDER if name in self.primitives)
+        return " | ".join(types) or "unknown"
+
+    def _object_ts(self, indent: str) -> str:
+        if not self.fields:
+            return "Record<string, unknown>"
+        lines = ["{"]
+        lines.extend(self.field_lines(indent + "  "))
+        lines.append(indent + "}")
+        return "\n".join(lines)
+
+    def field_lines(self, indent: str) -> list:
+        """One 'name: type;' line per field; fields missing from some examples are optional"""
+        lines = []
+        for key, node in self.fields.items():
+            name = key if _IDENTIFIER_RE.match(key) else json.dumps(key)
+            optional = "?" if self.field_counts[key] < self.object_count else ""
+            lines.append(f"{indent}{name}{optional}: {node.to_ts(indent)};")
+        return lines
+
+    @property
+    def is_object(self) -> bool:
+        """True if every example seen was an object, so it can be an interface"""
+        return (not self.truncated and self.object_count == self.examples
+                and self.items is None and not self.primitives)
+
+
+def render_declaration(name: str, node: SchemaNode) -> str:
+    """An exported interface for object examples, otherwise an exported type alias"""
+    if node.is_object:
+        lines = [f"export interface {name} {{"]
+        lines.extend(node.field_lines("  "))
+        lines.append("}")
+        return "\n".join(lines)
+    return f"export type {name} = {node.to_ts()};"
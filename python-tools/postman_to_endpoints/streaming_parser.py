@@ -0,0 +1,391 @@
+"""
+Streaming parser for large Postman collection files.
+
+Yields the same (field_name, url, method, top_folder_name) tuples as
+postman_parser.walk_items, but reads the file in chunks instead of loading
+the whole collection. Only item names, request urls and methods are decoded;
+every other subtree (response, event, request body, ...) is skipped by
+scanning for brackets and strings, so memory stays bounded by folder depth
+rather than by the size of embedded examples.
+
+Skipped subtrees are only checked for balanced brackets and strings, not
+fully validated as JSON.
+
+When asked for schemas, request bodies and up to MAX_EXAMPLES saved
+responses per request are also decoded (bodies over MAX_EXAMPLE_CHARS are
+skipped unread) and merged into per-endpoint SchemaNodes on the fly.
+"""
+import json
+import os
+import re
+
+from postman_parser import extract_url
+from schema_inference import MAX_EXAMPLES, MAX_EXAMPLE_CHARS, SchemaNode
+from utils import join_camel, name_tokens, normalize_url
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+_WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+_STRING_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+# Rest of a string body, up to the closing quote or an escape split across chunks
+_STRING_BODY_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.S)
+_SCALAR_RE = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null')
+_STRUCTURE_RE = re.compile(r'["\[\]{}]')
+# What may follow a number or literal
+_SCALAR_END_RE = re.compile(r'[ \t\n\r,\]}]')
+
+_MISSING = object()
+
+
+class _JsonLexer:
+    """Pull lexer over a text stream, holding one chunk (plus any partial token) in memory"""
+
+    def __init__(self, stream, chunk_size: int = DEFAULT_CHUNK_SIZE, on_chunk=None):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.on_chunk = on_chunk  # called after each chunk is read
+        self.buf = ''
+        self.pos = 0
+        self.offset = 0  # file offset of buf[0], for error messages
+        self.eof = False
+        self._capture = None
+        self._capture_from = 0
+        self._capture_limit = None
+        self._captured = 0
+
+    def _fill(self) -> bool:
+        """Read the next chunk, keeping the unconsumed tail; False at end of input"""
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if self.on_chunk is not None:
+            self.on_chunk()
+        if self._capture is not None:
+            piece = self.buf[self._capture_from:self.pos]
+            self._captured += len(piece)
+            # Past the limit the value is still scanned, but no longer kept
+            if self._capture_limit is None or self._captured <= self._capture_limit:
+                self._capture.append(piece)
+            self._capture_from = 0
+        self.offset += self.pos
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+        return bool(chunk)
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"{message} at offset {self.offset + self.pos}")
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at end of input)"""
+        while True:
+            self.pos = _WHITESPACE_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise self.error(f"Expected '{char}'")
+        self.pos += 1
+
+    def expect_end(self):
+        if self.peek():
+            raise self.error("Extra data")
+
+    def _match_token(self, pattern):
+        """Match a complete token at the current position, reading more input if it may be cut off"""
+        while True:
+            match = pattern.match(self.buf, self.pos)
+            if match and (match.end() < len(self.buf) or self.eof):
+                return match
+            if not self._fill() and not match:
+                return None
+
+    def read_string(self) -> str:
+        self.peek()
+        match = self._match_token(_STRING_RE)
+        if match is None:
+            raise self.error("Expected string")
+        self.pos = match.end()
+        token = match.group()
+        return token[1:-1] if '\\' not in token else json.loads(token)
+
+    def object_keys(self):
+        """Yield each key of an object; the caller consumes its value before asking for the next"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.read_string()
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                self.pos -= 1
+                raise self.error("Expected ',' or '}'")
+
+    def array_items(self):
+        """Yield once per element of an array; the caller consumes each element"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                self.pos -= 1
+                raise self.error("Expected ',' or ']'")
+
+    def _skip_string_body(self):
+        """Skip the rest of a string whose opening quote was consumed, chunk by chunk"""
+        while True:
+            quote = self.buf.find('"', self.pos)
+            if quote >= 0 and self.buf.find('\\', self.pos, quote) < 0:
+                # No escapes: the first quote closes the string
+                self.pos = quote + 1
+                return
+            self.pos = _STRING_BODY_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) and self.buf[self.pos] == '"':
+                self.pos += 1
+                return
+            # End of buffer, or an escape split across chunks
+            if not self._fill():
+                raise self.error("Unterminated string")
+
+    def skip_value(self):
+        """Skip one value without decoding it"""
+        char = self.peek()
+        if char == '"':
+            self.pos += 1
+            self._skip_string_body()
+        elif char in ('{', '['):
+            self.pos += 1
+            depth = 1
+            while depth:
+                match = _STRUCTURE_RE.search(self.buf, self.pos)
+                if match is None:
+                    self.pos = len(self.buf)
+                    if not self._fill():
+                        raise self.error("Unterminated object or array")
+                    continue
+                self.pos = match.end()
+                found = match.group()
+                if found == '"':
+                    self._skip_string_body()
+                elif found in '{[':
+                    depth += 1
+                else:
+                    depth -= 1
+        else:
+            # A number can be cut after any digit or '.', so read up to its end first
+            while not _SCALAR_END_RE.search(self.buf, self.pos) and self._fill():
+                pass
+            match = self._match_token(_SCALAR_RE)
+            if match is None:
+                raise self.error("Expected value")
+            self.pos = match.end()
+
+    def read_value(self, limit: int = None):
+        """
+        Decode one (small) value, e.g. a name or a url object. With a limit,
+        a value whose JSON text is longer is skipped and _MISSING returned.
+        """
+        self.peek()
+        self._capture = []
+        self._capture_from = self.pos
+        self._capture_limit = limit
+        self._captured = 0
+        try:
+            self.skip_value()
+            tail = self.buf[self._capture_from:self.pos]
+            if limit is not None and self._captured + len(tail) > limit:
+                return _MISSING
+            self._capture.append(tail)
+            text = ''.join(self._capture)
+        finally:
+            self._capture = None
+            self._capture_limit = None
+        return json.loads(text)
+
+    def read_string_value(self, limit: int = None):
+        """A string value (at most limit characters of JSON text), or _MISSING for anything else"""
+        if self.peek() != '"':
+            self.skip_value()
+            return _MISSING
+        return self.read_value(limit)
+
+
+def _read_body(lexer: _JsonLexer, schema: SchemaNode):
+    """Merge a request body into schema if it is raw JSON text"""
+    if lexer.peek() != '{':
+        lexer.skip_value()
+        return
+    mode, raw = _MISSING, _MISSING
+    for key in lexer.object_keys():
+        if key == 'mode':
+            mode = lexer.read_value()
+        elif key == 'raw':
+            raw = lexer.read_string_value(MAX_EXAMPLE_CHARS)
+        else:
+            lexer.skip_value()
+    if mode in (_MISSING, 'raw') and raw is not _MISSING:
+        schema.add_text(raw)
+
+
+def _read_responses(lexer: _JsonLexer, schema: SchemaNode):
+    """Merge the bodies of the first MAX_EXAMPLES saved responses into schema"""
+    if lexer.peek() != '[':
+        lexer.skip_value()
+        return
+    sampled = 0
+    for _ in lexer.array_items():
+        if sampled >= MAX_EXAMPLES or lexer.peek() != '{':
+            lexer.skip_value()
+            continue
+        for key in lexer.object_keys():
+            if key == 'body':
+                body = lexer.read_string_value(MAX_EXAMPLE_CHARS)
+                if body is not _MISSING and schema.add_text(body):
+                    sampled += 1
+            else:
+                lexer.skip_value()
+
+
+def _read_request(lexer: _JsonLexer, schema: SchemaNode = None):
+    """
+    (request, present): the request with only its url and method decoded, and
+    whether walk_items would see a truthy request value. With a schema, a raw
+    JSON body is merged into it.
+    """
+    if lexer.peek() != '{':
+        request = lexer.read_value()
+        return request, bool(request)
+    request = {}
+    present = False
+    for key in lexer.object_keys():
+        present = True
+        if key in ('url', 'method'):
+            request[key] = lexer.read_value()
+        elif key == 'body' and schema is not None:
+            _read_body(lexer, schema)
+        else:
+            lexer.skip_value()
+    return request, present
+
+
+def _with_name(name, field, prefix):
+    """A child record's field with this item's name put in front of it"""
+    if prefix is None:
+        return (name,) + field
+    if isinstance(field, tuple):
+        # Names collected before this item's name was known
+        return join_camel([t for part in (name,) + field for t in name_tokens(part)], prefix)
+    return field
+
+
+def _item_records(lexer: _JsonLexer, with_schemas: bool = False, prefix=""):
+    """
+    Yield (field_name, url, method, schemas, name) for the requests under one
+    item object, where schemas is a (request body, response) pair of
+    SchemaNodes, or None without with_schemas, and name is this item's name.
+    prefix is the ancestors' names already joined in camelCase, so each
+    request costs only its own name however deep the folder tree is (the
+    same as walk_items). Below an item whose "name" comes after its "item"
+    array, prefix is None and field_name is the tuple of names from the
+    child down to the request; those (small) records are held until the
+    name is known.
+    """
+    name = _MISSING
+    has_children = False
+    pending = []
+    request, has_request = None, False
+    schemas = (SchemaNode(), SchemaNode()) if with_schemas else None
+
+    for key in lexer.object_keys():
+        if key == 'name':
+            name = lexer.read_value()
+        elif key == 'item' and lexer.peek() == '[':
+            has_children = False
+            if name is _MISSING or prefix is None:
+                child_prefix = None
+            else:
+                child_prefix = join_camel(name_tokens(name), prefix)
+            for _ in lexer.array_items():
+                has_children = True
+                if lexer.peek() != '{':
+                    raise lexer.error("Expected item object")
+                for field, url, method, child_schemas, _ in _item_records(lexer, with_schemas, child_prefix):
+                    if name is _MISSING:
+                        pending.append((field, url, method, child_schemas))
+                    else:
+                        yield _with_name(name, field, prefix), url, method, child_schemas, name
+        elif key == 'item':
+            if lexer.read_value():
+                raise lexer.error("Expected 'item' array")
+            has_children = False
+        elif key == 'request':
+            request, has_request = _read_request(lexer, schemas and schemas[0])
+        elif key == 'response' and with_schemas:
+            _read_responses(lexer, schemas[1])
+        else:
+            lexer.skip_value()
+
+    if name is _MISSING:
+        name = "Unnamed"
+    if has_children:
+        for field, url, method, child_schemas in pending:
+            yield _with_name(name, field, prefix), url, method, child_schemas, name
+    elif has_request:
+        field = (name,) if prefix is None else join_camel(name_tokens(name), prefix)
+        yield field, normalize_url(extract_url(request)), request.get("method", "GET"), schemas, name
+
+
+def iter_endpoints(stream, chunk_size: int = DEFAULT_CHUNK_SIZE, schemas: list = None, on_chunk=None):
+    """
+    Yield (field_name, url, method, top_folder_name) from a Postman collection
+    text stream, in the same order and with the same values as walk_items.
+    If a schemas list is given, a (request body, response) pair of SchemaNodes
+    is appended to it for each endpoint yielded. on_chunk is called after each
+    chunk is read, e.g. to report progress.
+    """
+    lexer = _JsonLexer(stream, chunk_size, on_chunk)
+    if lexer.peek() != '{':
+        raise lexer.error("Expected a collection object")
+    for key in lexer.object_keys():
+        if key == 'item' and lexer.peek() == '[':
+            for _ in lexer.array_items():
+                if lexer.peek() != '{':
+                    raise lexer.error("Expected item object")
+                for field_name, url, method, item_schemas, name in _item_records(lexer, schemas is not None):
+                    if schemas is not None:
+                        schemas.append(item_schemas)
+                    yield field_name or "endpoint", url, method, name or "General"
+        elif key == 'item':
+            if lexer.read_value():
+                raise lexer.error("Expected 'item' array")
+        else:
+            lexer.skip_value()
+    lexer.expect_end()
+
+
+def stream_endpoints(file_path, chunk_size: int = DEFAULT_CHUNK_SIZE, schemas: list = None,
+                     progress=None):
+    """
+    Yield the endpoints of a Postman collection file without loading it whole.
+    progress, if given, is called with (bytes read, file size) after each chunk.
+    """
+    total = os.path.getsize(file_path)
+    with open(file_path, "r", encoding="utf-8") as f:
+        on_chunk = (lambda: progress(f.buffer.tell(), total)) if progress is not None else None
+        yield from iter_endpoints(f, chunk_size, schemas, on_chunk)
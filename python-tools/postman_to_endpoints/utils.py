@@ -2,29 +2,55 @@
 Utility functions for string manipulation and URL processing.
 """
 import re
+from functools import lru_cache
+from pathlib import Path
 from urllib.parse import urlparse
 
+COLLECTION_SUFFIX = ".postman_collection"
+# Distinct raw URLs remembered by normalize_url; collections reuse a few bases heavily
+URL_CACHE_SIZE = 8192
+
+_NAME_SEPARATOR_RE = re.compile(r"[^a-zA-Z0-9]+")
+_POSTMAN_VARIABLE_RE = re.compile(r"\{\{[^}]+\}\}")
+_LEADING_VARIABLES_RE = re.compile(r"^(?:\{\{[^}]+\}\})+")
+# A {{var}} that makes up a whole path segment
+_VARIABLE_SEGMENT_RE = re.compile(r"(?<=/)\{\{\s*([^}]+?)\s*\}\}(?=/|\?|#|$)")
+# A :param path segment, in the form normalize_url produces
+_PARAM_SEGMENT_RE = re.compile(r"(?<=/):([A-Za-z_$][A-Za-z0-9_$]*)(?=/|\?|#|$)")
+_TEMPLATE_ESCAPE_RE = re.compile(r"\\|`|\$(?=\{)")
+# Words a TypeScript parameter cannot be named
+_TS_RESERVED_WORDS = frozenset(
+    "break case catch class const continue debugger default delete do else enum export extends "
+    "false finally for function if import in instanceof new null return super switch this throw "
+    "true try typeof var void while with".split())
+
+
+def name_tokens(part):
+    """
+    Split one name into its alphanumeric tokens, e.g. "Create-Item" -> ["Create", "Item"]
+    """
+    if not part:
+        return []
+    return [t for t in _NAME_SEPARATOR_RE.split(part) if t]
+
+
+def join_camel(tokens, prefix=""):
+    """
+    Join tokens in camelCase, continuing an already camelCased prefix ("" for none).
+    Returns "" when there is nothing to join.
+    """
+    if prefix:
+        return prefix + "".join(t.capitalize() for t in tokens)
+    if not tokens:
+        return ""
+    return tokens[0].lower() + "".join(t.capitalize() for t in tokens[1:])
+
 
 def camel_case(*parts):
     """
     Convert multiple string parts to camelCase, e.g. ("Persons", "Create") -> "personsCreate"
     """
-    cleaned = []
-    for p in parts:
-        if not p:
-            continue
-        tokens = re.split(r"[^a-zA-Z0-9]+", p)
-        tokens = [t for t in tokens if t]
-        if not tokens:
-            continue
-        cleaned.append(tokens)
-    if not cleaned:
-        return "endpoint"
-
-    flat = [t for part in cleaned for t in part]
-    first = flat[0].lower()
-    rest = [w.capitalize() for w in flat[1:]]
-    return first + "".join(rest)
+    return join_camel([t for p in parts for t in name_tokens(p)]) or "endpoint"
 
 
 def split_base_and_path(url):
@@ -56,5 +82,70 @@ def remove_postman_variables(url):
     if not url:
         return url
     # Remove Postman variables like {{trustserviceURL}}
-    url = re.sub(r'\{\{[^}]+\}\}', '', url)
+    url = _POSTMAN_VARIABLE_RE.sub('', url)
     return url.strip()
+
+
+def param_name(name):
+    """A path variable name made a valid identifier, e.g. "user-id" -> "userId" """
+    if _NAME_SEPARATOR_RE.search(name):
+        name = camel_case(name)
+    if name[0].isdigit():
+        name = "_" + name
+    return name
+
+
+def _param_segment(match):
+    """:param for a {{var}} segment"""
+    return ":" + param_name(match.group(1))
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def normalize_url(url):
+    """
+    Normalize a raw request URL to the path (and query) used in the generated class,
+    e.g. "{{baseUrl}}/users/{{userId}}?full=1" -> "/users/:userId?full=1".
+    Leading base variables and scheme://host are dropped; {{var}} path segments
+    become :var parameters and other variables are removed. Empty stays empty.
+    """
+    if not url:
+        return ""
+    url = _LEADING_VARIABLES_RE.sub("", url.strip())
+    _, path = split_base_and_path(url)
+    path = _VARIABLE_SEGMENT_RE.sub(_param_segment, path)
+    path = remove_postman_variables(path)
+    if not path.startswith("/"):
+        path = "/" + path
+    return path
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def path_template(path):
+    """
+    Split a normalized path into (template literal body, parameter names), e.g.
+    "/users/:id" -> ("/users/${id}", ("id",)). The body is escaped for a TS template literal.
+    """
+    params = []
+    parts = []
+    last = 0
+    for match in _PARAM_SEGMENT_RE.finditer(path):
+        name = match.group(1)
+        if name in _TS_RESERVED_WORDS:
+            name += "Param"
+        if name not in params:
+            params.append(name)
+        parts.append(_TEMPLATE_ESCAPE_RE.sub(lambda m: "\\" + m.group(), path[last:match.start()]))
+        parts.append("${" + name + "}")
+        last = match.end()
+    parts.append(_TEMPLATE_ESCAPE_RE.sub(lambda m: "\\" + m.group(), path[last:]))
+    return "".join(parts), tuple(params)
+
+
+def collection_name(file_path):
+    """
+    Collection name from its file name, without the .postman_collection.json suffix.
+    """
+    name = Path(file_path).stem
+    if name.endswith(COLLECTION_SUFFIX):
+        name = name[:-len(COLLECTION_SUFFIX)]
+    return name
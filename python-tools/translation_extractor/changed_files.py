@@ -0,0 +1,59 @@
+"""
+Select the source files a change touches, from git or from a file list.
+"""
+import subprocess
+import sys
+from pathlib import Path
+from typing import Iterable, List
+
+from source_corpus import CODE_EXTENSIONS
+
+
+def _code_files_under(source_dir: Path, paths: Iterable[str], extensions: tuple) -> List[Path]:
+    """Keep existing code files inside source_dir, as source_dir-based paths"""
+    root = source_dir.resolve()
+    selected = set()
+    for name in paths:
+        name = name.strip()
+        if not name or not name.endswith(extensions):
+            continue
+        path = Path(name)
+        if not path.is_absolute():
+            # Relative to source_dir, or to the working directory (e.g. a repo-root git diff)
+            path = source_dir / path if (source_dir / path).is_file() else path.absolute()
+        try:
+            relative_path = path.resolve().relative_to(root)
+        except ValueError:
+            continue
+        if (source_dir / relative_path).is_file():
+            selected.add(source_dir / relative_path)
+    return sorted(selected)
+
+
+def _git(source_dir: Path, *args: str) -> List[str]:
+    result = subprocess.run(['git', '-C', str(source_dir), *args],
+                            capture_output=True, text=True, encoding='utf-8')
+    if result.returncode != 0:
+        raise ValueError(result.stderr.strip() or f"git {args[0]} failed")
+    return [name for name in result.stdout.split('\0') if name]
+
+
+def git_changed_files(source_dir: Path, ref: str, extensions: tuple = CODE_EXTENSIONS) -> List[Path]:
+    """
+    Code files under source_dir added, copied, modified or renamed since ref
+    (committed or not), plus untracked files. Raises ValueError if git fails.
+    """
+    names = _git(source_dir, 'diff', '--name-only', '-z', '--diff-filter=ACMR', '--relative', ref, '--')
+    names += _git(source_dir, 'ls-files', '--others', '--exclude-standard', '-z')
+    return _code_files_under(source_dir, names, extensions)
+
+
+def read_file_list(list_file: str, source_dir: Path, extensions: tuple = CODE_EXTENSIONS) -> List[Path]:
+    """
+    Code files named in a list file, one per line: absolute, or relative to
+    source_dir or the working directory. '-' reads the list from stdin.
+    """
+    if list_file == '-':
+        return _code_files_under(source_dir, sys.stdin.read().splitlines(), extensions)
+    with open(list_file, 'r', encoding='utf-8') as f:
+        return _code_files_under(source_dir, f.read().splitlines(), extensions)
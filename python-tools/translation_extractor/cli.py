@@ -3,8 +3,10 @@
 CLI interface for Translation Key Extractor
 """
 import argparse
+import signal
 import sys
 import json
+from contextlib import contextmanager
 from pathlib import Path
 from typing import List
 
@@ -12,10 +14,70 @@ from typing import List
 sys.path.insert(0, str(Path(__file__).parent))
 
 from extractors.hardcoded_extractor import HardcodedStringExtractor
+from extractors.detection_rules import RulePipeline
 from extractors.translation_extractor import TranslationKeyExtractor
 from extractors.missing_keys_finder import MissingKeysFinder
 from extractors.unused_keys_finder import UnusedKeysFinder
 from generators.translation_generator import TranslationFileGenerator
+from generators.translation_memory import TranslationMemory
+from key_registry import KeyRegistry
+from extractors.tsx_tokenizer import PARSERS
+from source_corpus import SourceCorpus, SourceReader, format_scan_summary, DEFAULT_MAX_FILE_SIZE
+from changed_files import git_changed_files, read_file_list
+from extraction_cache import ExtractionCache
+from locale_store import LAYOUTS
+from progress import CancellationToken, ScanCancelled, TextProgressBar
+from server import DEFAULT_POLL_INTERVAL
+
+
+def select_files(args, source_dir: Path):
+    """Files chosen with --since or --files-from, or None for the whole directory"""
+    if getattr(args, 'since', None):
+        return git_changed_files(source_dir, args.since)
+    if getattr(args, 'files_from', None):
+        return read_file_list(args.files_from, source_dir)
+    return None
+
+
+def open_extraction_cache(args, source_dir: Path, changed_files=None):
+    """Load the key extraction cache unless --no-cache; changed files are always re-read"""
+    if args.no_cache:
+        return None
+    cache = ExtractionCache.for_source_dir(source_dir)
+    if changed_files:
+        cache.invalidate(str(path.relative_to(source_dir)) for path in changed_files)
+    return cache
+
+
+def add_file_selection_arguments(subparser, cache: bool = True):
+    """Add --since/--files-from (and --no-cache) to a command that scans source files"""
+    subparser.add_argument('--since', metavar='REF',
+                           help='Only scan files changed since a git ref (e.g. origin/main)')
+    subparser.add_argument('--files-from', metavar='FILE',
+                           help='Only scan the files listed in FILE, one per line ("-" for stdin)')
+    if cache:
+        subparser.add_argument('--no-cache', action='store_true',
+                               help='Do not use or update the extraction cache in <source_dir>/.translation-cache')
+
+
+@contextmanager
+def cancellable():
+    """
+    While a scan or migration runs, the first Ctrl+C cancels it cleanly and a
+    second one interrupts at once; outside of it Ctrl+C interrupts as usual.
+    """
+    token = CancellationToken()
+
+    def handle_interrupt(signum, frame):
+        if token.cancelled:
+            raise KeyboardInterrupt
+        token.cancel()
+
+    signal.signal(signal.SIGINT, handle_interrupt)
+    try:
+        yield token
+    finally:
+        signal.signal(signal.SIGINT, signal.default_int_handler)
 
 
 def print_results(data: dict, format: str = 'text'):
@@ -38,15 +100,38 @@ def print_results(data: dict, format: str = 'text'):
 
 def cmd_scan(args):
     """Scan directory for hardcoded strings"""
-    extractor = HardcodedStringExtractor()
     source_dir = Path(args.source_dir)
     
     if not source_dir.exists():
         print(f"Error: Directory {source_dir} does not exist")
         return 1
     
-    results = extractor.extract_from_directory(source_dir)
+    try:
+        rules = RulePipeline.from_project(
+            source_dir, Path(args.rules_config) if args.rules_config else None,
+            profile=args.profile_rules)
+    except (OSError, ValueError) as e:
+        print(f"Error: Invalid rules config: {e}")
+        return 1
+    
+    try:
+        files = select_files(args, source_dir)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not select files: {e}")
+        return 1
     
+    key_registry = KeyRegistry.load(Path(args.key_registry)) if args.key_registry else None
+    extractor = HardcodedStringExtractor(key_registry=key_registry, rules=rules, parser=args.parser)
+    reader = SourceReader(max_size=args.max_file_size * 1024 if args.max_file_size else None,
+                          skip_minified=not args.include_minified)
+    corpus = SourceCorpus(source_dir, reader=reader).register('hardcoded', extractor)
+    with cancellable() as cancel, TextProgressBar('Scanning') as progress:
+        corpus_results = corpus.run(files, progress=progress, cancel=cancel)
+    results = corpus_results['hardcoded']
+    if key_registry is not None:
+        key_registry.save(Path(args.key_registry))
+    
+    print(format_scan_summary(corpus_results['summary']))
     total_strings = sum(len(strings) for strings in results.values())
     print(f"Found {total_strings} hardcoded strings in {len(results)} files")
     
@@ -58,19 +143,34 @@ def cmd_scan(args):
     else:
         print_results(results, args.format)
     
+    if args.profile_rules:
+        print("\nDetection rules:")
+        print(rules.format_stats())
+    
     return 0
 
 
 def cmd_extract(args):
     """Extract translation keys from code"""
-    extractor = TranslationKeyExtractor()
+    extractor = TranslationKeyExtractor(parser=args.parser)
     source_dir = Path(args.source_dir)
     
     if not source_dir.exists():
         print(f"Error: Directory {source_dir} does not exist")
         return 1
     
-    results = extractor.extract_from_directory(source_dir)
+    try:
+        files = select_files(args, source_dir)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not select files: {e}")
+        return 1
+    
+    cache = open_extraction_cache(args, source_dir, files)
+    with cancellable() as cancel, TextProgressBar('Extracting') as progress:
+        results = extractor.extract_from_directory(source_dir, files=files, cache=cache,
+                                                   progress=progress, cancel=cancel)
+    if cache is not None:
+        cache.save()
     
     print(f"Found {len(results['all_keys'])} unique translation keys")
     print(f"Found {len(results['all_namespaces'])} namespaces: {', '.join(results['all_namespaces'])}")
@@ -110,13 +210,23 @@ def cmd_find_missing(args):
         print(f"Error: Translation directory {translation_dir} does not exist")
         return 1
     
-    # First extract keys from code
-    extractor = TranslationKeyExtractor()
+    # First extract keys from code (only from the selected files with --since/--files-from)
+    extractor = TranslationKeyExtractor(parser=args.parser)
     source_dir = Path(args.source_dir)
-    extraction_results = extractor.extract_from_directory(source_dir)
+    try:
+        files = select_files(args, source_dir)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not select files: {e}")
+        return 1
+    cache = open_extraction_cache(args, source_dir, files)
+    with cancellable() as cancel, TextProgressBar('Extracting') as progress:
+        extraction_results = extractor.extract_from_directory(source_dir, files=files, cache=cache,
+                                                              progress=progress, cancel=cancel)
+    if cache is not None:
+        cache.save()
     
     # Find missing keys
-    finder = MissingKeysFinder(translation_dir, locale)
+    finder = MissingKeysFinder(translation_dir, locale, args.layout)
     results = finder.find_missing_keys(extraction_results['all_keys'])
     
     print(f"Missing keys for locale '{locale}': {results['missing_count']}")
@@ -154,13 +264,24 @@ def cmd_find_unused(args):
         print(f"Error: Translation directory {translation_dir} does not exist")
         return 1
     
-    # First extract keys from code
-    extractor = TranslationKeyExtractor()
+    # First extract keys from all code; with --since/--files-from only the selected
+    # files are re-read and the other files come from the extraction cache
+    extractor = TranslationKeyExtractor(parser=args.parser)
     source_dir = Path(args.source_dir)
-    extraction_results = extractor.extract_from_directory(source_dir)
+    try:
+        changed_files = select_files(args, source_dir)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not select files: {e}")
+        return 1
+    cache = open_extraction_cache(args, source_dir, changed_files)
+    with cancellable() as cancel, TextProgressBar('Extracting') as progress:
+        extraction_results = extractor.extract_from_directory(source_dir, cache=cache,
+                                                              progress=progress, cancel=cancel)
+    if cache is not None:
+        cache.save()
     
     # Find unused keys
-    finder = UnusedKeysFinder(translation_dir, locale)
+    finder = UnusedKeysFinder(translation_dir, locale, args.layout)
     results = finder.find_unused_keys(extraction_results['all_keys'])
     
     print(f"Unused keys for locale '{locale}': {results['unused_count']}")
@@ -200,27 +321,46 @@ def cmd_update(args):
         print(f"Error: Translation directory {translation_dir} does not exist")
         return 1
     
-    # First extract keys and find missing
-    extractor = TranslationKeyExtractor()
+    # First extract keys and find missing; source literals for auto-fill come from the same pass
     source_dir = Path(args.source_dir)
-    extraction_results = extractor.extract_from_directory(source_dir)
-    
-    finder = MissingKeysFinder(translation_dir, locale)
+    corpus = SourceCorpus(source_dir).register('extraction', TranslationKeyExtractor(parser=args.parser))
+    if args.auto_fill and args.fill_from_source:
+        try:
+            rules = RulePipeline.from_project(source_dir)
+        except (OSError, ValueError) as e:
+            print(f"Error: Invalid rules config: {e}")
+            return 1
+        corpus.register('hardcoded', HardcodedStringExtractor(rules=rules, parser=args.parser))
+    cache = open_extraction_cache(args, source_dir)
+    with cancellable() as cancel, TextProgressBar('Scanning') as progress:
+        corpus_results = corpus.run(cache=cache, progress=progress, cancel=cancel)
+    if cache is not None:
+        cache.save()
+    extraction_results = corpus_results['extraction']
+    
+    finder = MissingKeysFinder(translation_dir, locale, args.layout)
     missing_results = finder.find_missing_keys(extraction_results['all_keys'])
     
     if not missing_results['missing_keys']:
         print(f"No missing keys found for locale '{locale}'")
         return 0
     
+    # Build translation memory from other locales (and source literals) for auto-fill
+    memory = None
+    if args.auto_fill:
+        memory = TranslationMemory.from_directory(translation_dir, locale, corpus_results.get('hardcoded'))
+    
     # Update translation file
-    generator = TranslationFileGenerator(translation_dir, locale)
+    generator = TranslationFileGenerator(translation_dir, locale, args.layout)
     update_results = generator.update_file(
         missing_results['missing_keys'],
-        auto_fill=args.auto_fill
+        auto_fill=args.auto_fill,
+        memory=memory
     )
     
     if update_results['success']:
-        print(f"Successfully updated {update_results['added_count']} keys in {translation_dir / f'{locale}.json'}")
+        written = ', '.join(str(path) for path in update_results['files']) or str(generator.store.locale_path)
+        print(f"Successfully updated {update_results['added_count']} keys in {written}")
         if update_results['skipped_count'] > 0:
             print(f"Skipped {update_results['skipped_count']} keys (already exist)")
     else:
@@ -230,6 +370,119 @@ def cmd_update(args):
     return 0
 
 
+def cmd_migrate(args):
+    """Replace hardcoded strings with translation calls"""
+    from generators.source_migrator import SourceMigrator
+    
+    source_dir = Path(args.source_dir)
+    translation_dir = Path(args.translations)
+    
+    if not source_dir.exists():
+        print(f"Error: Directory {source_dir} does not exist")
+        return 1
+    
+    key_registry = KeyRegistry.load(Path(args.key_registry)) if args.key_registry else KeyRegistry()
+    if args.from_scan:
+        with open(args.from_scan, 'r', encoding='utf-8') as f:
+            hardcoded_results = json.load(f)
+    else:
+        try:
+            rules = RulePipeline.from_project(source_dir)
+        except (OSError, ValueError) as e:
+            print(f"Error: Invalid rules config: {e}")
+            return 1
+        # Rewriting needs exact JSX spans, so migrate always scans with the tsx tokenizer
+        with cancellable() as cancel, TextProgressBar('Scanning') as progress:
+            hardcoded_results = HardcodedStringExtractor(
+                rules=rules, parser='tsx').extract_from_directory(
+                    source_dir, progress=progress, cancel=cancel)
+    
+    migrator = SourceMigrator(source_dir, translation_dir, args.locale,
+                              namespace=args.namespace,
+                              include_literals=args.include_literals,
+                              jobs=args.jobs,
+                              key_registry=key_registry,
+                              layout=args.layout)
+    with cancellable() as cancel, TextProgressBar('Migrating') as progress:
+        results = migrator.rewrite(hardcoded_results, dry_run=args.dry_run,
+                                   progress=progress, cancel=cancel)
+    if not args.dry_run:
+        results = migrator.write(results)
+    if args.key_registry and not args.dry_run:
+        key_registry.save(Path(args.key_registry))
+    
+    for diff in results['diffs']:
+        print(diff)
+    
+    action = "Would migrate" if args.dry_run else "Migrated"
+    print(f"{action} {results['strings_migrated']} strings in {results['files_changed']} files "
+          f"({len(results['keys'])} keys for locale '{args.locale}')")
+    if results['skipped']:
+        print(f"Skipped {len(results['skipped'])} strings:")
+        for skip in results['skipped'][:50]:
+            print(f"  - {skip['file']}: \"{skip['text'][:50]}\" ({skip['reason']})")
+        if len(results['skipped']) > 50:
+            print(f"... and {len(results['skipped']) - 50} more")
+    
+    if not results['success']:
+        print("Error: Failed to update translation file")
+        return 1
+    
+    return 0
+
+
+def cmd_merge(args):
+    """Three-way merge translation files"""
+    from generators.translation_merger import merge_files
+    
+    for file_arg in (args.base, args.ours, args.theirs):
+        if not Path(file_arg).exists():
+            print(f"Error: File {file_arg} does not exist")
+            return 1
+    
+    output_file = Path(args.output or args.ours)
+    results = merge_files(Path(args.base), Path(args.ours), Path(args.theirs),
+                          output_file, prefer=args.prefer)
+    if not results['success']:
+        print(f"Error: {results['error']}")
+        return 1
+    
+    print(f"Merged {results['key_count']} keys into {output_file}")
+    print(f"Conflicts: {results['conflict_count']} (resolved with '{args.prefer}')")
+    for conflict in results['conflicts'][:50]:
+        print(f"  - {conflict['key']} [{conflict['type']}]")
+    if results['conflict_count'] > 50:
+        print(f"... and {results['conflict_count'] - 50} more")
+    
+    if args.report:
+        report_file = Path(args.report)
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump(results['conflicts'], f, indent=2, ensure_ascii=False)
+        print(f"Conflict report saved to {report_file}")
+    
+    return 2 if results['conflict_count'] and args.fail_on_conflict else 0
+
+
+def cmd_serve(args):
+    """Run the JSON-RPC server on stdin/stdout"""
+    from server import TranslationServer, serve_stdio
+    
+    source_dir = Path(args.source_dir)
+    if not source_dir.exists():
+        print(f"Error: Directory {source_dir} does not exist", file=sys.stderr)
+        return 1
+    
+    # The server runs until shutdown or end of input; Ctrl+C just stops it
+    server = TranslationServer(source_dir, Path(args.translations) if args.translations else None,
+                               args.locale, parser=args.parser, layout=args.layout,
+                               poll_interval=args.poll_interval, use_cache=not args.no_cache)
+    try:
+        serve_stdio(server)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Translation Key Extractor - Manage translations in Next.js projects'
@@ -243,6 +496,19 @@ def main():
     scan_parser.add_argument('--output', '-o', help='Output file path (JSON)')
     scan_parser.add_argument('--format', '-f', choices=['text', 'json'], default='text',
                            help='Output format')
+    scan_parser.add_argument('--key-registry', help='Key registry file shared between runs (JSON)')
+    scan_parser.add_argument('--rules-config',
+                           help='Detection rules config (default: <source_dir>/.translation-extractor.json)')
+    scan_parser.add_argument('--profile-rules', action='store_true',
+                           help='Print hit counts and time spent per detection rule')
+    scan_parser.add_argument('--max-file-size', type=int, default=DEFAULT_MAX_FILE_SIZE // 1024,
+                           help='Skip files larger than this many KB, 0 for no limit '
+                                f'(default: {DEFAULT_MAX_FILE_SIZE // 1024})')
+    scan_parser.add_argument('--include-minified', action='store_true',
+                           help='Also scan minified files (very long lines or .min.js names)')
+    scan_parser.add_argument('--parser', choices=list(PARSERS), default='regex',
+                              help='Source scanning backend: regex or the JSX-aware tsx tokenizer')
+    add_file_selection_arguments(scan_parser, cache=False)
     
     # Extract command
     extract_parser = subparsers.add_parser('extract', help='Extract translation keys from code')
@@ -250,6 +516,9 @@ def main():
     extract_parser.add_argument('--output', '-o', help='Output file path (JSON)')
     extract_parser.add_argument('--format', '-f', choices=['text', 'json'], default='text',
                               help='Output format')
+    extract_parser.add_argument('--parser', choices=list(PARSERS), default='regex',
+                              help='Source scanning backend: regex or the JSX-aware tsx tokenizer')
+    add_file_selection_arguments(extract_parser)
     
     # Find missing command
     missing_parser = subparsers.add_parser('find-missing', help='Find missing translation keys')
@@ -259,6 +528,11 @@ def main():
     missing_parser.add_argument('--locale', '-l', default='en',
                                help='Locale to check (default: en)')
     missing_parser.add_argument('--output', '-o', help='Output file path (JSON)')
+    missing_parser.add_argument('--parser', choices=list(PARSERS), default='regex',
+                              help='Source scanning backend: regex or the JSX-aware tsx tokenizer')
+    missing_parser.add_argument('--layout', choices=list(LAYOUTS), default='auto',
+                                help='Locale files: <locale>.json, or <locale>/<namespace>.json (default: detect)')
+    add_file_selection_arguments(missing_parser)
     
     # Find unused command
     unused_parser = subparsers.add_parser('find-unused', help='Find unused translation keys')
@@ -268,6 +542,11 @@ def main():
     unused_parser.add_argument('--locale', '-l', default='en',
                               help='Locale to check (default: en)')
     unused_parser.add_argument('--output', '-o', help='Output file path (JSON)')
+    unused_parser.add_argument('--parser', choices=list(PARSERS), default='regex',
+                              help='Source scanning backend: regex or the JSX-aware tsx tokenizer')
+    unused_parser.add_argument('--layout', choices=list(LAYOUTS), default='auto',
+                               help='Locale files: <locale>.json, or <locale>/<namespace>.json (default: detect)')
+    add_file_selection_arguments(unused_parser)
     
     # Update command
     update_parser = subparsers.add_parser('update', help='Update translation files with missing keys')
@@ -277,7 +556,61 @@ def main():
     update_parser.add_argument('--locale', '-l', default='en',
                               help='Locale to update (default: en)')
     update_parser.add_argument('--auto-fill', action='store_true',
-                              help='Auto-fill missing keys with default values')
+                              help='Auto-fill missing keys from other locales, falling back to the key name')
+    update_parser.add_argument('--fill-from-source', action='store_true',
+                              help='Also auto-fill from matching hardcoded strings in source code')
+    update_parser.add_argument('--parser', choices=list(PARSERS), default='regex',
+                              help='Source scanning backend: regex or the JSX-aware tsx tokenizer')
+    update_parser.add_argument('--layout', choices=list(LAYOUTS), default='auto',
+                               help='Locale files: <locale>.json, or <locale>/<namespace>.json (default: detect)')
+    update_parser.add_argument('--no-cache', action='store_true',
+                              help='Do not use or update the extraction cache in <source_dir>/.translation-cache')
+    
+    # Migrate command
+    migrate_parser = subparsers.add_parser('migrate', help='Replace hardcoded strings with t() calls')
+    migrate_parser.add_argument('source_dir', help='Source directory to migrate')
+    migrate_parser.add_argument('--translations', '-t', required=True,
+                               help='Translation directory (e.g., messages/)')
+    migrate_parser.add_argument('--locale', '-l', default='en',
+                               help='Locale to add the keys to (default: en)')
+    migrate_parser.add_argument('--layout', choices=list(LAYOUTS), default='auto',
+                                help='Locale files: <locale>.json, or <locale>/<namespace>.json (default: detect)')
+    migrate_parser.add_argument('--namespace', '-n',
+                               help='Namespace for files without a useTranslations call')
+    migrate_parser.add_argument('--include-literals', action='store_true',
+                               help='Also migrate string and template literals (not only JSX)')
+    migrate_parser.add_argument('--from-scan', help='Use results saved by "scan --output" instead of scanning')
+    migrate_parser.add_argument('--dry-run', action='store_true',
+                               help='Print diffs without writing any file')
+    migrate_parser.add_argument('--jobs', '-j', type=int, help='Number of worker processes')
+    migrate_parser.add_argument('--key-registry', help='Key registry file shared between runs (JSON)')
+    
+    # Merge command
+    merge_parser = subparsers.add_parser('merge', help='Three-way merge translation files')
+    merge_parser.add_argument('base', help='Common ancestor translation file')
+    merge_parser.add_argument('ours', help='Our translation file (e.g., messages/en.json)')
+    merge_parser.add_argument('theirs', help='Incoming translation file (e.g., vendor delivery)')
+    merge_parser.add_argument('--output', '-o', help='Output file path (default: overwrite ours)')
+    merge_parser.add_argument('--prefer', choices=['ours', 'theirs'], default='ours',
+                             help='Side to keep when both changed a key (default: ours)')
+    merge_parser.add_argument('--report', '-r', help='Conflict report file path (JSON)')
+    merge_parser.add_argument('--fail-on-conflict', action='store_true',
+                             help='Exit with code 2 when conflicts are found')
+    
+    # Serve command
+    serve_parser = subparsers.add_parser('serve', help='Answer JSON-RPC requests on stdin/stdout (for editors)')
+    serve_parser.add_argument('source_dir', help='Source directory to keep indexed')
+    serve_parser.add_argument('--translations', '-t', help='Translation directory (e.g., messages/)')
+    serve_parser.add_argument('--locale', '-l', default='en', help='Locale to check (default: en)')
+    serve_parser.add_argument('--layout', choices=list(LAYOUTS), default='auto',
+                              help='Locale files: <locale>.json, or <locale>/<namespace>.json (default: detect)')
+    serve_parser.add_argument('--parser', choices=list(PARSERS), default='regex',
+                              help='Source scanning backend: regex or the JSX-aware tsx tokenizer')
+    serve_parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                              help='Seconds between checks of the whole tree for files changed outside '
+                                   'the editor; saves are reported with didChangeFiles (default: 60)')
+    serve_parser.add_argument('--no-cache', action='store_true',
+                              help='Do not use or update the extraction cache in <source_dir>/.translation-cache')
     
     args = parser.parse_args()
     
@@ -291,12 +624,19 @@ def main():
         'extract': cmd_extract,
         'find-missing': cmd_find_missing,
         'find-unused': cmd_find_unused,
-        'update': cmd_update
+        'update': cmd_update,
+        'migrate': cmd_migrate,
+        'merge': cmd_merge,
+        'serve': cmd_serve
     }
     
     command_func = commands.get(args.command)
     if command_func:
-        return command_func(args)
+        try:
+            return command_func(args)
+        except ScanCancelled:
+            print("Cancelled", file=sys.stderr)
+            return 130
     else:
         parser.print_help()
         return 1
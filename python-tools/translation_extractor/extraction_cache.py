@@ -0,0 +1,93 @@
+"""
+Persistent per-file cache of analyzer results for a source tree.
+
+Entries are keyed by relative path and validated by the file's mtime and
+size, so unchanged files are not read again on the next run. Each analyzer
+stores its data under its own cache_id (which includes its parser).
+"""
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from locale_snapshot import SNAPSHOT_DIR_NAME
+
+CACHE_FILE_NAME = 'extraction.json'
+CACHE_VERSION = 1
+
+
+class ExtractionCache:
+    """Per-file analyzer results, reused while a file's mtime and size are unchanged"""
+
+    def __init__(self, cache_file: Path = None):
+        self.cache_file = cache_file
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = False
+
+    @classmethod
+    def for_source_dir(cls, source_dir: Path) -> 'ExtractionCache':
+        return cls.load(source_dir / SNAPSHOT_DIR_NAME / CACHE_FILE_NAME)
+
+    @classmethod
+    def load(cls, cache_file: Path) -> 'ExtractionCache':
+        """Load a cache file, or start empty if it is missing or from another version"""
+        cache = cls(cache_file)
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return cache
+        if data.get('version') == CACHE_VERSION:
+            cache._entries = data.get('files', {})
+        return cache
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, relative_path: str, stat: os.stat_result, cache_id: str) -> Optional[any]:
+        """Cached data for a file, or None if absent or the file changed"""
+        entry = self._entries.get(relative_path)
+        if entry is None or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+            return None
+        return entry['results'].get(cache_id)
+
+    def store(self, relative_path: str, stat: os.stat_result, cache_id: str, data):
+        entry = self._entries.get(relative_path)
+        if entry is None or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+            entry = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'results': {}}
+            self._entries[relative_path] = entry
+        entry['results'][cache_id] = data
+        self._dirty = True
+
+    def invalidate(self, relative_paths: Iterable[str]):
+        """Forget files known to have changed"""
+        for relative_path in relative_paths:
+            if self._entries.pop(relative_path, None) is not None:
+                self._dirty = True
+
+    def prune(self, present: Iterable[str]):
+        """Drop entries for files that no longer exist"""
+        present = set(present)
+        for relative_path in [path for path in self._entries if path not in present]:
+            del self._entries[relative_path]
+            self._dirty = True
+
+    def save(self) -> bool:
+        """Write the cache atomically if anything changed"""
+        if not self._dirty or self.cache_file is None:
+            return True
+        tmp_path = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'files': self._entries}, f,
+                          ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.cache_file)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
+        self._dirty = False
+        return True
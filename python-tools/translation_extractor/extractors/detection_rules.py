@@ -0,0 +1,341 @@
+import json
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CONFIG_FILE_NAME = '.translation-extractor.json'
+
+# Patterns to exclude (false positives) when found near a string literal
+EXCLUDE_PATTERNS = [
+    r'import\s+.*?from\s+["\']',  # Import statements
+    r'require\s*\(["\']',  # Require statements
+    r'console\.(log|error|warn|info|debug)\s*\(',  # Console statements
+    r'["\']use\s+(client|server)["\']',  # React directives
+    r'["\']use\s+strict["\']',  # Strict mode
+    r'@ts-',  # TypeScript directives
+    r'\/\/.*',  # Comments
+    r'\/\*.*?\*\/',  # Block comments
+    r'className\s*=\s*["\']',  # CSS classes (often intentional)
+    r'id\s*=\s*["\']',  # IDs (often intentional)
+    r'data-testid\s*=\s*["\']',  # Test IDs
+    r'key\s*=\s*["\']',  # React keys
+    r'href\s*=\s*["\']',  # URLs
+    r'src\s*=\s*["\']',  # Source URLs
+    r'type\s*[:=]\s*["\']',  # Type annotations
+    r'as\s+["\']',  # Type assertions
+    r'useTranslations\s*\(\s*["\']',  # Translation namespaces
+    r'useState\s*\(',  # React useState
+    r'useEffect\s*\(',  # React useEffect
+    r'useCallback\s*\(',  # React useCallback
+    r'useMemo\s*\(',  # React useMemo
+    r'const\s+\w+\s*=\s*["\']',  # Variable assignments (often code)
+    r'let\s+\w+\s*=\s*["\']',  # Let assignments
+    r'var\s+\w+\s*=\s*["\']',  # Var assignments
+]
+
+# Tailwind class fragments (matched against lowercased text)
+TAILWIND_PATTERNS = [
+    'flex', 'grid', 'gap-', 'space-', 'p-', 'px-', 'py-', 'pt-', 'pb-', 'pl-', 'pr-',
+    'm-', 'mx-', 'my-', 'mt-', 'mb-', 'ml-', 'mr-', 'w-', 'h-', 'min-h-', 'max-w-',
+    'bg-', 'text-', 'border-', 'rounded-', 'shadow-', 'hover:', 'focus:', 'sm:', 'md:', 'lg:',
+    'items-', 'justify-', 'self-', 'col-', 'row-', 'resize-', 'min-h-', 'max-h-'
+]
+
+# Common code fragments
+CODE_PATTERNS = [
+    'const ', 'let ', 'var ', 'function', '=>', '()', '{}', '[]',
+    'useState', 'useEffect', 'onClick', 'onChange', 'setState',
+    'className', 'value={', 'onChange=', 'e.target', 'e =>'
+]
+
+# URL and CSS value prefixes
+EXCLUDED_PREFIXES = ('http://', 'https://', 'www.', 'mailto:', '#', 'rgb', 'rgba', 'var(')
+
+LITERAL_TYPES = ('string_literal', 'template_literal')
+
+# Callees whose string arguments are never UI text (only known with the tsx parser)
+NON_UI_CALLEES = ('t', 't.rich', 't.raw', 'useTranslations', 'getTranslations', 'require',
+                  'import', 'addEventListener', 'removeEventListener', 'querySelector',
+                  'querySelectorAll', 'getElementById', 'fetch', 'JSON.parse')
+
+
+def _compile_substring_matcher(patterns):
+    """Compile literal substrings into one alternation, longest first"""
+    unique = sorted(set(patterns), key=len, reverse=True)
+    return re.compile('|'.join(re.escape(pattern) for pattern in unique))
+
+
+class Candidate:
+    """A possible hardcoded string and where it was found"""
+
+    __slots__ = ('text', 'type', 'content', 'match_start', 'match_end', 'start', 'end', 'callee')
+
+    def __init__(self, text: str, type: str, content: str = '', match_start: int = 0,
+                 match_end: int = 0, start: int = 0, end: int = 0, callee: str = None):
+        self.text = text
+        self.type = type
+        self.content = content
+        # Span of the whole regex match (used for context and line numbers)
+        self.match_start = match_start
+        self.match_end = match_end
+        # Span to replace when migrating the string
+        self.start = start
+        self.end = end
+        # Function the literal is passed to, when the parser knows it (tsx backend)
+        self.callee = callee
+
+
+class Rule:
+    """Base class for a detection rule; rejects() returns True to drop a candidate"""
+
+    name = ''
+    description = ''
+    # Candidate types the rule runs on, None for all types
+    applies_to = None
+
+    def applies(self, candidate: Candidate) -> bool:
+        return self.applies_to is None or candidate.type in self.applies_to
+
+    def rejects(self, candidate: Candidate) -> bool:
+        raise NotImplementedError
+
+
+class CommentBeforeRule(Rule):
+    name = 'comment_before'
+    description = 'Line comment marker before the literal on the same line'
+    applies_to = LITERAL_TYPES
+
+    def rejects(self, candidate):
+        content = candidate.content
+        line_start = content.rfind('\n', 0, candidate.match_start) + 1
+        return '//' in content[line_start:candidate.match_start]
+
+
+class ExcludeContextRule(Rule):
+    name = 'exclude_context'
+    description = 'Import, console, directive, comment or code pattern near the literal'
+    applies_to = LITERAL_TYPES
+
+    def __init__(self, patterns: List[str] = None):
+        self.regex = re.compile('|'.join(patterns or EXCLUDE_PATTERNS), re.MULTILINE | re.DOTALL)
+
+    def rejects(self, candidate):
+        content = candidate.content
+        start = candidate.match_start
+        if candidate.type == 'template_literal':
+            context = content[max(0, start - 100):min(len(content), start + 200)]
+        else:
+            context = content[max(0, start - 150):min(len(content), candidate.match_end + 150)]
+        return bool(self.regex.search(context))
+
+
+class BeforeStringRule(Rule):
+    """Reject string literals when the 50 characters before them match a pattern"""
+
+    applies_to = ('string_literal',)
+
+    def __init__(self, name: str, pattern: str, description: str, flags: int = 0):
+        self.name = name
+        self.description = description
+        self.regex = re.compile(pattern, flags)
+
+    def rejects(self, candidate):
+        start = candidate.match_start
+        return bool(self.regex.search(candidate.content[max(0, start - 50):start]))
+
+
+class CallArgumentRule(Rule):
+    """Reject literals passed to translation, module or logging functions"""
+
+    name = 'non_ui_call_argument'
+    description = 'Argument of t(), require(), console.* or similar'
+    applies_to = LITERAL_TYPES
+
+    def __init__(self, callees: tuple = NON_UI_CALLEES):
+        self.callees = set(callees)
+
+    def rejects(self, candidate):
+        callee = candidate.callee
+        if callee is None:
+            return False
+        return (callee in self.callees or callee.rsplit('.', 1)[-1] in self.callees
+                or callee.startswith('console.'))
+
+
+class TernaryExpressionRule(Rule):
+    name = 'ternary_expression'
+    description = 'Part of a ternary or logical expression outside a t() call'
+    applies_to = ('string_literal',)
+
+    ternary_regex = re.compile(r'[?:]\s*["\']')
+    call_regex = re.compile(r't\s*\(')
+
+    def rejects(self, candidate):
+        start = candidate.match_start
+        before = candidate.content[max(0, start - 50):start]
+        return bool(self.ternary_regex.search(before)) and not self.call_regex.search(before)
+
+
+class DynamicTemplateRule(Rule):
+    name = 'dynamic_template'
+    description = 'Template literal with ${} substitutions'
+    applies_to = ('template_literal',)
+
+    def rejects(self, candidate):
+        return '${' in candidate.text
+
+
+class TextRule(Rule):
+    """Rule that only looks at the candidate text"""
+
+    def __init__(self, name: str, description: str, check):
+        self.name = name
+        self.description = description
+        self.check = check
+
+    def rejects(self, candidate):
+        return self.check(candidate.text)
+
+
+_CODE_CHARS_REGEX = re.compile(r'[{}()\[\];=<>]')
+_LETTER_REGEX = re.compile(r'[a-zA-Z]')
+_VOWEL_REGEX = re.compile(r'[aeiouAEIOU]')
+_ALNUM_SPACE_REGEX = re.compile(r'[a-zA-Z0-9\s]')
+_TAILWIND_MATCHER = _compile_substring_matcher(TAILWIND_PATTERNS)
+_CODE_MATCHER = _compile_substring_matcher(CODE_PATTERNS)
+
+
+def default_rules() -> List[Rule]:
+    """Build the default rule pipeline, cheapest checks first within each group"""
+    return [
+        CommentBeforeRule(),
+        ExcludeContextRule(),
+        CallArgumentRule(),
+        BeforeStringRule('translation_namespace', r'useTranslations\s*\(\s*["\']',
+                         'Argument of useTranslations'),
+        BeforeStringRule('react_hook_argument', r'(useState|useEffect|useCallback|useMemo|useRef)\s*\(',
+                         'Argument of a React hook'),
+        BeforeStringRule('variable_assignment', r'(const|let|var)\s+\w+\s*=\s*["\']',
+                         'Variable assignment'),
+        BeforeStringRule('non_ui_attribute', r'(className|id|data-testid|key|href|src|type|as)\s*=\s*["\']',
+                         'Non user-facing JSX attribute', re.IGNORECASE),
+        TernaryExpressionRule(),
+        DynamicTemplateRule(),
+        TextRule('too_short', 'Shorter than 2 characters',
+                 lambda text: not text or len(text.strip()) < 2),
+        TextRule('url_or_css_prefix', 'URL or CSS value',
+                 lambda text: text.startswith(EXCLUDED_PREFIXES)),
+        TextRule('file_path', 'File path',
+                 lambda text: '/' in text and (text.startswith('/') or '\\' in text)),
+        TextRule('number', 'Pure number',
+                 lambda text: text.strip().replace('.', '').replace(',', '').isdigit()),
+        TextRule('code_characters', 'Contains operators or brackets',
+                 lambda text: bool(_CODE_CHARS_REGEX.search(text))),
+        TextRule('no_letters', 'Contains no letters',
+                 lambda text: not _LETTER_REGEX.search(text)),
+        TextRule('short_identifier', 'Short string without vowels',
+                 lambda text: len(text.strip()) <= 3 and not _VOWEL_REGEX.search(text)),
+        TextRule('mostly_symbols', 'More than half symbols',
+                 lambda text: len(_ALNUM_SPACE_REGEX.sub('', text)) > len(text) * 0.5),
+        TextRule('tailwind_classes', 'Contains Tailwind class fragments',
+                 lambda text: bool(_TAILWIND_MATCHER.search(text.lower()))),
+        TextRule('code_fragments', 'Contains common code fragments',
+                 lambda text: bool(_CODE_MATCHER.search(text))),
+    ]
+
+
+class RulePipeline:
+    """Ordered detection rules with per-rule hit counters and optional timing"""
+
+    def __init__(self, rules: List[Rule] = None, profile: bool = False):
+        self.rules = rules if rules is not None else default_rules()
+        self.profile = profile
+        self.reset_stats()
+
+    @property
+    def signature(self) -> str:
+        """The rules in order; pipelines with the same signature detect the same strings"""
+        return ','.join(rule.name for rule in self.rules)
+
+    @classmethod
+    def from_config(cls, config: Dict, profile: bool = False) -> 'RulePipeline':
+        """
+        Build a pipeline from a config dict:
+        {"rules": {"disable": ["rule_name"], "order": ["rule_name", ...]}}
+        Rules listed in "order" run first, in that order; the rest keep the default order.
+        """
+        rule_config = config.get('rules', {}) if isinstance(config, dict) else None
+        if not isinstance(rule_config, dict):
+            raise ValueError('expected {"rules": {"disable": [...], "order": [...]}}')
+        for field in ('disable', 'order'):
+            names = rule_config.get(field, [])
+            if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+                raise ValueError(f'"rules.{field}" must be a list of rule names')
+        by_name = {rule.name: rule for rule in default_rules()}
+        unknown = [name for name in rule_config.get('disable', []) + rule_config.get('order', [])
+                   if name not in by_name]
+        if unknown:
+            raise ValueError(f"Unknown detection rules: {', '.join(unknown)}")
+
+        disabled = set(rule_config.get('disable', []))
+        ordered = [name for name in rule_config.get('order', []) if name not in disabled]
+        ordered += [name for name in by_name if name not in ordered and name not in disabled]
+        return cls([by_name[name] for name in ordered], profile)
+
+    @classmethod
+    def from_project(cls, source_dir: Path = None, config_file: Path = None,
+                     profile: bool = False) -> 'RulePipeline':
+        """Load rules from an explicit config file or <source_dir>/.translation-extractor.json"""
+        if config_file is None and source_dir is not None:
+            candidate = Path(source_dir) / CONFIG_FILE_NAME
+            if candidate.exists():
+                config_file = candidate
+        if config_file is None:
+            return cls(profile=profile)
+        with open(config_file, 'r', encoding='utf-8') as f:
+            return cls.from_config(json.load(f), profile)
+
+    def reset_stats(self):
+        self.stats = {rule.name: {'checked': 0, 'rejected': 0, 'time': 0.0} for rule in self.rules}
+
+    def rejected_by(self, candidate: Candidate) -> Optional[str]:
+        """Run the rules in order, return the name of the first rule that rejects"""
+        stats = self.stats
+        if self.profile:
+            for rule in self.rules:
+                if not rule.applies(candidate):
+                    continue
+                started = time.perf_counter()
+                rejected = rule.rejects(candidate)
+                rule_stats = stats[rule.name]
+                rule_stats['time'] += time.perf_counter() - started
+                rule_stats['checked'] += 1
+                if rejected:
+                    rule_stats['rejected'] += 1
+                    return rule.name
+            return None
+
+        for rule in self.rules:
+            if rule.applies_to is not None and candidate.type not in rule.applies_to:
+                continue
+            rule_stats = stats[rule.name]
+            rule_stats['checked'] += 1
+            if rule.rejects(candidate):
+                rule_stats['rejected'] += 1
+                return rule.name
+        return None
+
+    def accepts(self, candidate: Candidate) -> bool:
+        return self.rejected_by(candidate) is None
+
+    def format_stats(self) -> str:
+        """Format the per-rule counters as a text table"""
+        lines = [f"{'Rule':<24}{'Checked':>10}{'Rejected':>10}{'Time (ms)':>12}{'us/check':>10}"]
+        for rule in self.rules:
+            rule_stats = self.stats[rule.name]
+            checked = rule_stats['checked']
+            per_check = rule_stats['time'] * 1e6 / checked if checked else 0.0
+            lines.append(f"{rule.name:<24}{checked:>10}{rule_stats['rejected']:>10}"
+                         f"{rule_stats['time'] * 1000:>12.1f}{per_check:>10.2f}")
+        return '\n'.join(lines)
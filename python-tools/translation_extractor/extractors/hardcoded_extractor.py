@@ -1,272 +1,175 @@
 from utils import suggest_translation_key
+import hashlib
 import re
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 import sys
 import os
 
 # Add parent directory to path for utils import
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from extractors.detection_rules import Candidate, RulePipeline
+from extractors import tsx_tokenizer
+from source_corpus import CODE_EXTENSIONS, SourceCorpus, SourceFile, read_source
+
+JSX_TEXT_PATTERN = re.compile(r'>\s*([^<>{}\n]+?)\s*<')
+JSX_ATTR_PATTERN = re.compile(
+    r'(placeholder|title|aria-label|alt|label)\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+STRING_LITERAL_PATTERN = re.compile(r'["\']([^"\']{3,})["\']')
+TEMPLATE_PATTERN = re.compile(r'`([^`]{3,})`')
+USER_FACING_ATTRIBUTES = ('placeholder', 'title', 'aria-label', 'alt', 'label')
 
 
 class HardcodedStringExtractor:
     """Extract hardcoded strings from TypeScript/JavaScript files"""
 
-    # Patterns to exclude (false positives)
-    EXCLUDE_PATTERNS = [
-        r'import\s+.*?from\s+["\']',  # Import statements
-        r'require\s*\(["\']',  # Require statements
-        r'console\.(log|error|warn|info|debug)\s*\(',  # Console statements
-        r'["\']use\s+(client|server)["\']',  # React directives
-        r'["\']use\s+strict["\']',  # Strict mode
-        r'@ts-',  # TypeScript directives
-        r'\/\/.*',  # Comments
-        r'\/\*.*?\*\/',  # Block comments
-        r'className\s*=\s*["\']',  # CSS classes (often intentional)
-        r'id\s*=\s*["\']',  # IDs (often intentional)
-        r'data-testid\s*=\s*["\']',  # Test IDs
-        r'key\s*=\s*["\']',  # React keys
-        r'href\s*=\s*["\']',  # URLs
-        r'src\s*=\s*["\']',  # Source URLs
-        r'type\s*[:=]\s*["\']',  # Type annotations
-        r'as\s+["\']',  # Type assertions
-        r'useTranslations\s*\(\s*["\']',  # Translation namespaces
-        r'useState\s*\(',  # React useState
-        r'useEffect\s*\(',  # React useEffect
-        r'useCallback\s*\(',  # React useCallback
-        r'useMemo\s*\(',  # React useMemo
-        r'const\s+\w+\s*=\s*["\']',  # Variable assignments (often code)
-        r'let\s+\w+\s*=\s*["\']',  # Let assignments
-        r'var\s+\w+\s*=\s*["\']',  # Var assignments
-    ]
-
-    def __init__(self):
-        self.exclude_regex = re.compile(
-            '|'.join(self.EXCLUDE_PATTERNS), re.MULTILINE | re.DOTALL)
+    def __init__(self, key_registry=None, rules: RulePipeline = None, parser: str = 'regex'):
+        if parser not in tsx_tokenizer.PARSERS:
+            raise ValueError(f"Unknown parser: {parser}")
+        # Optional KeyRegistry shared across files so one text gets one key
+        self.key_registry = key_registry
+        # Ordered detection rules deciding which candidates are reported
+        self.rules = rules if rules is not None else RulePipeline()
+        # 'regex' scanners or the 'tsx' tokenizer
+        self.parser = parser
+
+    def _suggest_key(self, text: str) -> str:
+        """Suggest a key for text, through the shared registry if one is set"""
+        if self.key_registry is not None:
+            return self.key_registry.key_for(text)
+        return suggest_translation_key(text)
 
     def extract_from_file(self, file_path: Path) -> List[Dict[str, any]]:
         """Extract hardcoded strings from a single file"""
-        try:
-            content = file_path.read_text(encoding='utf-8')
-        except Exception:
+        content = read_source(file_path)
+        if content is None:
             return []
 
-        results = []
+        return self.extract_from_content(content, jsx=tsx_tokenizer.jsx_enabled_for(file_path))
 
-        # Extract strings from JSX text content
-        jsx_text_pattern = r'>\s*([^<>{}\n]+?)\s*<'
-        jsx_matches = re.finditer(jsx_text_pattern, content)
-        for match in jsx_matches:
+    def _iter_candidates(self, content: str) -> Iterator[Candidate]:
+        """Yield every possible hardcoded string found by the regex scanners"""
+        # Strings from JSX text content
+        for match in JSX_TEXT_PATTERN.finditer(content):
             text = match.group(1).strip()
-            if self._is_valid_string(text):
-                results.append({
-                    'text': text,
-                    'line': content[:match.start()].count('\n') + 1,
-                    'column': match.start() - content.rfind('\n', 0, match.start()) - 1,
-                    'type': 'jsx_text',
-                    'suggested_key': suggest_translation_key(text)
-                })
-
-        # Extract strings from JSX attributes (placeholder, title, aria-label, etc.)
-        jsx_attr_pattern = r'(placeholder|title|aria-label|alt|label)\s*=\s*["\']([^"\']+)["\']'
-        attr_matches = re.finditer(jsx_attr_pattern, content, re.IGNORECASE)
-        for match in attr_matches:
-            text = match.group(2).strip()
-            if self._is_valid_string(text):
-                results.append({
-                    'text': text,
-                    'line': content[:match.start()].count('\n') + 1,
-                    'column': match.start() - content.rfind('\n', 0, match.start()) - 1,
-                    'type': f'jsx_attr_{match.group(1).lower()}',
-                    'suggested_key': suggest_translation_key(text)
-                })
-
-        # Extract string literals in code (but exclude common patterns)
-        # More precise pattern: only match strings that are likely user-facing
-        # Exclude strings in function calls, variable assignments, etc.
-        string_literal_pattern = r'["\']([^"\']{3,})["\']'
-        string_matches = re.finditer(string_literal_pattern, content)
-        for match in string_matches:
-            # Check if this match is in an excluded pattern
-            match_start = match.start()
-            match_end = match.end()
-
-            # Get line context to check for comments and code context
-            line_start = content.rfind('\n', 0, match_start) + 1
-            line_end = content.find('\n', match_end)
-            if line_end == -1:
-                line_end = len(content)
-            line_content = content[line_start:line_end]
-
-            # Check if line contains comment markers before the string
-            if '//' in line_content:
-                comment_pos = line_content.find('//')
-                if comment_pos < match_start - line_start:
-                    continue  # Skip if comment is before the string
-
-            # Get broader context to check for code patterns
-            context_start = max(0, match_start - 150)
-            context_end = min(len(content), match_end + 150)
-            context = content[context_start:context_end]
-
-            # Check if this is in an excluded pattern
-            if self.exclude_regex.search(context):
-                continue
-
-            # Additional checks for code context
-            # Skip if it's in a function call that's clearly code
-            before_string = content[max(0, match_start - 50):match_start]
-            after_string = content[match_end:min(len(content), match_end + 50)]
-
-            # Skip if it looks like a translation namespace
-            if re.search(r'useTranslations\s*\(\s*["\']', before_string):
-                continue
-
-            # Skip if it's in a useState, useEffect, etc.
-            if re.search(r'(useState|useEffect|useCallback|useMemo|useRef)\s*\(', before_string):
-                continue
+            text_start = match.start(1) + match.group(1).find(text)
+            yield Candidate(text, 'jsx_text', content, match.start(), match.end(),
+                            text_start, text_start + len(text))
+
+        # Strings from JSX attributes (placeholder, title, aria-label, etc.)
+        for match in JSX_ATTR_PATTERN.finditer(content):
+            # Replace the quoted attribute value, including the quotes
+            yield Candidate(match.group(2).strip(), f'jsx_attr_{match.group(1).lower()}', content,
+                            match.start(), match.end(), match.start(2) - 1, match.end(2) + 1)
+
+        # String literals in code
+        for match in STRING_LITERAL_PATTERN.finditer(content):
+            yield Candidate(match.group(1).strip(), 'string_literal', content,
+                            match.start(), match.end(), match.start(), match.end())
+
+        # Template literals
+        for match in TEMPLATE_PATTERN.finditer(content):
+            yield Candidate(match.group(1).strip(), 'template_literal', content,
+                            match.start(), match.end(), match.start(), match.end())
+
+    def _iter_node_candidates(self, content: str, nodes) -> Iterator[Candidate]:
+        """Yield candidates from a tsx node stream, in source order"""
+        for node in nodes:
+            kind = node.kind
+            if kind == tsx_tokenizer.JSX_TEXT:
+                # Multi-line text is reported with its whitespace collapsed
+                yield Candidate(' '.join(node.value.split()), 'jsx_text', content,
+                                node.start, node.end, node.start, node.end)
+            elif kind == tsx_tokenizer.JSX_ATTRIBUTE:
+                name = node.name.lower()
+                if node.value is not None and name in USER_FACING_ATTRIBUTES:
+                    yield Candidate(node.value.strip(), f'jsx_attr_{name}', content,
+                                    node.start, node.end, node.start, node.end)
+            elif kind == tsx_tokenizer.STRING_LITERAL:
+                if len(node.value) >= 3:
+                    yield Candidate(node.value.strip(), 'string_literal', content,
+                                    node.start, node.end, node.start, node.end, node.callee)
+            elif kind == tsx_tokenizer.TEMPLATE_LITERAL:
+                if len(node.value) >= 3:
+                    yield Candidate(node.value.strip(), 'template_literal', content,
+                                    node.start, node.end, node.start, node.end)
+
+    def extract_from_content(self, content: str, nodes: list = None,
+                             jsx: bool = True) -> List[Dict[str, any]]:
+        """
+        Extract hardcoded strings from source text.
+        nodes: tsx node stream already built for this content (tsx parser only).
+        """
+        return self.extract_from_source(SourceFile.from_text(content, jsx, nodes))
+
+    def extract_from_source(self, source: SourceFile) -> List[Dict[str, any]]:
+        """Extract hardcoded strings from a file read by SourceCorpus"""
+        content = source.content
+        results = []
+        seen = set()
 
-            # Skip if it's clearly a variable assignment
-            if re.search(r'(const|let|var)\s+\w+\s*=\s*["\']', before_string):
-                continue
+        if self.parser == 'tsx':
+            candidates = self._iter_node_candidates(content, source.nodes())
+        else:
+            candidates = self._iter_candidates(content)
 
-            # Skip if it's in JSX attribute that's not user-facing (like className, id, etc.)
-            if re.search(r'(className|id|data-testid|key|href|src|type|as)\s*=\s*["\']', before_string, re.IGNORECASE):
+        for candidate in candidates:
+            if self.rules.rejected_by(candidate) is not None:
                 continue
 
-            # Skip if it's part of a ternary or logical expression that's code
-            if re.search(r'[?:]\s*["\']', before_string) and not re.search(r't\s*\(', before_string):
+            match_start = candidate.match_start
+            line = source.line_of(match_start)
+            # Remove duplicates (same text, same line)
+            if (candidate.text, line) in seen:
                 continue
+            seen.add((candidate.text, line))
+
+            results.append({
+                'text': candidate.text,
+                'line': line,
+                'column': source.column_of(match_start),
+                'type': candidate.type,
+                'suggested_key': self._suggest_key(candidate.text),
+                'start': candidate.start,
+                'end': candidate.end
+            })
 
-            text = match.group(1).strip()
-            if self._is_valid_string(text):
-                results.append({
-                    'text': text,
-                    'line': content[:match_start].count('\n') + 1,
-                    'column': match_start - content.rfind('\n', 0, match_start) - 1,
-                    'type': 'string_literal',
-                    'suggested_key': suggest_translation_key(text)
-                })
-
-        # Extract template literals (but exclude common patterns)
-        template_pattern = r'`([^`]{3,})`'
-        template_matches = re.finditer(template_pattern, content)
-        for match in template_matches:
-            match_start = match.start()
-
-            # Get line context to check for comments
-            line_start = content.rfind('\n', 0, match_start) + 1
-            line_end = content.find('\n', match_start)
-            if line_end == -1:
-                line_end = len(content)
-            line_content = content[line_start:line_end]
-
-            # Check if line contains comment markers before the template
-            if '//' in line_content:
-                comment_pos = line_content.find('//')
-                if comment_pos < match_start - line_start:
-                    continue  # Skip if comment is before the template
+        return results
 
-            context_start = max(0, match_start - 100)
-            context_end = min(len(content), match_start + 200)
-            context = content[context_start:context_end]
+    @property
+    def cache_id(self) -> Optional[str]:
+        """
+        Identifies this extractor's entries in an ExtractionCache: its parser and
+        rule configuration. None (not cached) with a shared key registry, whose
+        suggestions depend on every file seen before, or when profiling rules.
+        """
+        if self.key_registry is not None or self.rules.profile:
+            return None
+        rules = hashlib.sha1(self.rules.signature.encode('utf-8')).hexdigest()[:12]
+        return f'hardcoded-{self.parser}-{rules}'
 
-            if not self.exclude_regex.search(context):
-                text = match.group(1).strip()
-                # Skip if contains ${} (dynamic content)
-                if '${' not in text and self._is_valid_string(text):
-                    results.append({
-                        'text': text,
-                        'line': content[:match_start].count('\n') + 1,
-                        'column': match_start - content.rfind('\n', 0, match_start) - 1,
-                        'type': 'template_literal',
-                        'suggested_key': suggest_translation_key(text)
-                    })
+    def to_cache_data(self, result: List[Dict]) -> List[Dict]:
+        return result
 
-        # Remove duplicates (same text, same line)
-        seen = set()
-        unique_results = []
-        for result in results:
-            key = (result['text'], result['line'])
-            if key not in seen:
-                seen.add(key)
-                unique_results.append(result)
+    def from_cache_data(self, data: List[Dict]) -> List[Dict]:
+        return data
 
-        return unique_results
+    def build_directory_results(self, file_results: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """Keep the files with at least one hardcoded string"""
+        return {path: strings for path, strings in file_results.items() if strings}
 
     def _is_valid_string(self, text: str) -> bool:
         """Check if string is valid for translation"""
-        if not text or len(text.strip()) < 2:
-            return False
-
-        # Exclude single characters, numbers, URLs, file paths
-        if len(text.strip()) < 2:
-            return False
-
-        # Exclude URLs
-        if text.startswith(('http://', 'https://', 'www.', 'mailto:')):
-            return False
-
-        # Exclude file paths
-        if '/' in text and (text.startswith('/') or '\\' in text):
-            return False
-
-        # Exclude pure numbers
-        if text.strip().replace('.', '').replace(',', '').isdigit():
-            return False
-
-        # Exclude CSS values
-        if text.startswith(('#', 'rgb', 'rgba', 'var(')):
-            return False
-
-        # Exclude Tailwind classes (contain common Tailwind patterns)
-        tailwind_patterns = [
-            'flex', 'grid', 'gap-', 'space-', 'p-', 'px-', 'py-', 'pt-', 'pb-', 'pl-', 'pr-',
-            'm-', 'mx-', 'my-', 'mt-', 'mb-', 'ml-', 'mr-', 'w-', 'h-', 'min-h-', 'max-w-',
-            'bg-', 'text-', 'border-', 'rounded-', 'shadow-', 'hover:', 'focus:', 'sm:', 'md:', 'lg:',
-            'items-', 'justify-', 'self-', 'col-', 'row-', 'resize-', 'min-h-', 'max-h-'
-        ]
-        text_lower = text.lower()
-        if any(pattern in text_lower for pattern in tailwind_patterns):
-            return False
-
-        # Exclude code-like strings (contain operators, brackets, etc.)
-        if re.search(r'[{}()\[\];=<>]', text):
-            return False
-
-        # Exclude strings that look like code (contain common code patterns)
-        code_patterns = [
-            'const ', 'let ', 'var ', 'function', '=>', '()', '{}', '[]',
-            'useState', 'useEffect', 'onClick', 'onChange', 'setState',
-            'className', 'value={', 'onChange=', 'e.target', 'e =>'
-        ]
-        if any(pattern in text for pattern in code_patterns):
-            return False
-
-        # Exclude strings that are mostly symbols or operators
-        if len(re.sub(r'[a-zA-Z0-9\s]', '', text)) > len(text) * 0.5:
-            return False
-
-        # Must contain at least one letter
-        if not re.search(r'[a-zA-Z]', text):
-            return False
-
-        # Exclude very short strings that are likely code identifiers
-        if len(text.strip()) <= 3 and not re.search(r'[aeiouAEIOU]', text):
-            return False
-
-        return True
-
-    def extract_from_directory(self, directory: Path, extensions: tuple = ('.ts', '.tsx', '.js', '.jsx')) -> Dict[str, List[Dict]]:
-        """Extract hardcoded strings from all files in directory"""
-        from utils import get_code_files
-
-        results = {}
-        files = get_code_files(directory, extensions)
-
-        for file_path in files:
-            file_results = self.extract_from_file(file_path)
-            if file_results:
-                results[str(file_path.relative_to(directory))] = file_results
-
-        return results
+        return self.rules.accepts(Candidate(text, 'text'))
+
+    def count_hits(self, file_result: List[Dict]) -> int:
+        return len(file_result)
+
+    def extract_from_directory(self, directory: Path, extensions: tuple = CODE_EXTENSIONS,
+                               files: List[Path] = None, progress=None, cancel=None) -> Dict[str, List[Dict]]:
+        """
+        Extract hardcoded strings from all files in directory (or only files).
+        progress/cancel: see SourceCorpus.run; a cancelled scan raises ScanCancelled.
+        """
+        corpus = SourceCorpus(directory, extensions).register('hardcoded', self)
+        return corpus.run(files, progress=progress, cancel=cancel)['hardcoded']
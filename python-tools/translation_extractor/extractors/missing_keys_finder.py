@@ -1,3 +1,4 @@
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Dict, Set, List
 import sys
@@ -5,36 +6,28 @@ import os
 
 # Add parent directory to path for utils import
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils import load_json_file, get_all_keys
+from locale_store import LocaleStore
 
 
 class MissingKeysFinder:
     """Find translation keys used in code but missing from translation files"""
     
-    def __init__(self, translation_dir: Path, locale: str = 'en'):
+    def __init__(self, translation_dir: Path, locale: str = 'en', layout: str = 'auto',
+                 store: LocaleStore = None):
         self.translation_dir = translation_dir
         self.locale = locale
+        self.layout = layout
+        # A long-lived store (e.g. the server's) is reused and left open
+        self.store = store
         self.translation_file = translation_dir / f"{locale}.json"
     
+    def _open_store(self):
+        if self.store is not None:
+            return nullcontext(self.store)
+        return LocaleStore(self.translation_dir, self.locale, self.layout)
+    
     def find_missing_keys(self, extracted_keys: Set[str], namespace: str = None) -> Dict[str, any]:
         """Find keys that are in code but not in translation files"""
-        # Load existing translation file
-        existing_translations = load_json_file(self.translation_file)
-        existing_keys = get_all_keys(existing_translations)
-        
-        # Normalize existing keys - remove leading dots and create variations
-        normalized_existing = set()
-        for key in existing_keys:
-            normalized_existing.add(key)
-            # Add without leading namespace if it has one
-            if '.' in key:
-                parts = key.split('.')
-                # Add just the last part (key name)
-                normalized_existing.add(parts[-1])
-                # Add all variations
-                for i in range(1, len(parts)):
-                    normalized_existing.add('.'.join(parts[i:]))
-        
         # Filter keys by namespace if provided
         if namespace:
             filtered_keys = {k for k in extracted_keys if k.startswith(f"{namespace}.") or k == namespace}
@@ -47,57 +40,37 @@ class MissingKeysFinder:
         missing_keys = set()
         missing_details = []
         
-        for key in namespace_keys:
-            # Check if key exists (with or without namespace prefix)
-            key_exists = False
-            
-            # First check: exact match in normalized keys or existing keys
-            if key in normalized_existing or key in existing_keys:
-                key_exists = True
-            # Second check: key exists at root level of JSON
-            elif key in existing_translations:
-                key_exists = True
-            else:
-                # Third check: if it's a nested key, check if it exists in the JSON structure
-                parts = key.split('.')
-                if len(parts) > 1:
-                    current = existing_translations
-                    found = True
-                    for part in parts:
-                        if isinstance(current, dict) and part in current:
-                            current = current[part]
-                        else:
-                            found = False
-                            break
-                    if found:
-                        key_exists = True
-                
-                # Fourth check: check if the key name (last part) exists anywhere
+        # Split layouts only open the namespace file(s) the keys live in
+        with self._open_store() as store:
+            scope = store.scope(namespace)
+            existing_count = len(scope)
+            for key in namespace_keys:
+                key_exists = self._key_exists(scope, key)
                 if not key_exists:
-                    key_name = parts[-1] if parts else key
-                    # Check if key name exists at root
-                    if key_name in existing_translations:
-                        key_exists = True
-                    # Check if key name is the last part of any existing key
-                    elif any(k.split('.')[-1] == key_name for k in existing_keys):
-                        key_exists = True
-            
-            if not key_exists:
-                missing_keys.add(key)
-                missing_details.append({
-                    'key': key,
-                    'namespace': namespace,
-                    'suggested_path': self._suggest_key_path(key, namespace)
-                })
+                    missing_keys.add(key)
+                    missing_details.append({
+                        'key': key,
+                        'namespace': namespace,
+                        'suggested_path': self._suggest_key_path(key, namespace)
+                    })
         
         return {
             'missing_keys': missing_keys,
             'missing_count': len(missing_keys),
-            'existing_count': len(existing_keys),
+            'existing_count': existing_count,
             'total_extracted': len(namespace_keys),
             'missing_details': missing_details
         }
     
+    def _key_exists(self, scope, key: str) -> bool:
+        """Check if a key exists (with or without namespace prefix) in a store or snapshot"""
+        # Exact path match, either a value or a nested object
+        if scope.has_node(key):
+            return True
+        # Key name (last part) exists at root or as the last part of any key
+        key_name = key.split('.')[-1]
+        return scope.has_node(key_name) or scope.has_leaf_name(key_name)
+    
     def find_missing_for_all_namespaces(self, namespace_keys: Dict[str, Set[str]]) -> Dict[str, Dict]:
         """Find missing keys for all namespaces"""
         results = {}
@@ -125,7 +98,7 @@ class MissingKeysFinder:
         results = {}
         
         for locale in locales:
-            finder = MissingKeysFinder(self.translation_dir, locale)
+            finder = MissingKeysFinder(self.translation_dir, locale, self.layout)
             results[locale] = finder.find_missing_keys(extracted_keys)
         
         return results
@@ -6,25 +6,47 @@ import os
 
 # Add parent directory to path for utils import
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from extractors import tsx_tokenizer
+from source_corpus import CODE_EXTENSIONS, SourceCorpus, SourceFile, read_source
+
+# Parameter names that make t(name) a pass-through rather than a dynamic key
+PASS_THROUGH_NAMES = ('key', 'message', 'text')
 
 
 class TranslationKeyExtractor:
     """Extract translation keys from code files"""
     
-    def __init__(self):
+    def __init__(self, parser: str = 'regex'):
+        if parser not in tsx_tokenizer.PARSERS:
+            raise ValueError(f"Unknown parser: {parser}")
         self.namespace_contexts = {}  # Track namespace per file/scope
+        self.parser = parser  # 'regex' patterns or the 'tsx' tokenizer
     
     def extract_from_file(self, file_path: Path) -> Dict[str, any]:
         """Extract all translation keys from a file"""
-        try:
-            content = file_path.read_text(encoding='utf-8')
-        except Exception:
+        content = read_source(file_path)
+        if content is None:
             return {
                 'keys': set(),
                 'namespaces': set(),
                 'key_details': []
             }
         
+        return self.extract_from_content(content, jsx=tsx_tokenizer.jsx_enabled_for(file_path))
+    
+    def extract_from_content(self, content: str, nodes: list = None, jsx: bool = True) -> Dict[str, any]:
+        """
+        Extract all translation keys from source text.
+        nodes: tsx node stream already built for this content (tsx parser only).
+        """
+        return self.extract_from_source(SourceFile.from_text(content, jsx, nodes))
+    
+    def extract_from_source(self, source: SourceFile) -> Dict[str, any]:
+        """Extract all translation keys from a file read by SourceCorpus"""
+        if self.parser == 'tsx':
+            return self._extract_from_nodes(source)
+        
+        content = source.content
         keys = set()
         namespaces = set()
         key_details = []
@@ -36,7 +58,7 @@ class TranslationKeyExtractor:
             namespace = match.group(1)
             namespaces.add(namespace)
             # Store namespace context (simplified - assumes one namespace per file)
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = source.line_of(match.start())
             self.namespace_contexts[line_num] = namespace
         
         # Extract t() calls with simple keys
@@ -46,7 +68,7 @@ class TranslationKeyExtractor:
         for match in simple_matches:
             key = match.group(1)
             keys.add(key)
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = source.line_of(match.start())
             key_details.append({
                 'key': key,
                 'line': line_num,
@@ -60,7 +82,7 @@ class TranslationKeyExtractor:
         for match in nested_matches:
             full_key = match.group(1)
             keys.add(full_key)
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = source.line_of(match.start())
             # Extract namespace if present
             if '.' in full_key:
                 parts = full_key.split('.')
@@ -87,8 +109,8 @@ class TranslationKeyExtractor:
         for match in dynamic_matches:
             var_name = match.group(1)
             # Skip if it's a known translation function parameter
-            if var_name not in ('key', 'message', 'text'):
-                line_num = content[:match.start()].count('\n') + 1
+            if var_name not in PASS_THROUGH_NAMES:
+                line_num = source.line_of(match.start())
                 key_details.append({
                     'key': f'[DYNAMIC:{var_name}]',
                     'line': line_num,
@@ -102,6 +124,57 @@ class TranslationKeyExtractor:
             'key_details': key_details
         }
     
+    def _extract_from_nodes(self, source: SourceFile) -> Dict[str, any]:
+        """Read useTranslations/getTranslations and t() calls from CallExpression nodes"""
+        keys = set()
+        namespaces = set()
+        calls = []
+        
+        for node in source.nodes():
+            if node.kind != tsx_tokenizer.CALL_EXPRESSION:
+                continue
+            line_num = source.line_of(node.start)
+            if node.name in ('useTranslations', 'getTranslations'):
+                if node.arg_kind == 'string' and node.single_arg and node.value:
+                    namespaces.add(node.value)
+                    self.namespace_contexts[line_num] = node.value
+            elif node.name == 't' and node.arg_kind is not None and node.value:
+                calls.append((node, line_num))
+        
+        key_details = []
+        for node, line_num in calls:
+            if node.arg_kind == 'string':
+                # Unlike the regex patterns, t("key", values) calls are found too
+                key = node.value
+                keys.add(key)
+                key_details.append({
+                    'key': key,
+                    'line': line_num,
+                    'type': 'simple',
+                    'namespace': self._get_namespace_for_line(line_num, namespaces)
+                })
+                if '.' in key:
+                    possible_namespace = key.split('.')[0]
+                    key_details.append({
+                        'key': key,
+                        'line': line_num,
+                        'type': 'nested',
+                        'namespace': possible_namespace if possible_namespace in namespaces else None
+                    })
+            elif node.single_arg and node.value not in PASS_THROUGH_NAMES:
+                key_details.append({
+                    'key': f'[DYNAMIC:{node.value}]',
+                    'line': line_num,
+                    'type': 'dynamic',
+                    'namespace': self._get_namespace_for_line(line_num, namespaces)
+                })
+        
+        return {
+            'keys': keys,
+            'namespaces': namespaces,
+            'key_details': key_details
+        }
+    
     def _get_namespace_for_line(self, line_num: int, namespaces: Set[str]) -> Optional[str]:
         """Get namespace context for a given line number"""
         # Simple heuristic: use the first namespace found before this line
@@ -110,27 +183,55 @@ class TranslationKeyExtractor:
             return list(namespaces)[0]  # Return first namespace found
         return None
     
-    def extract_from_directory(self, directory: Path, extensions: tuple = ('.ts', '.tsx', '.js', '.jsx')) -> Dict[str, any]:
-        """Extract translation keys from all files in directory"""
-        from utils import get_code_files
-        
+    @property
+    def cache_id(self) -> str:
+        """Identifies this extractor's entries in an ExtractionCache"""
+        return f'keys-{self.parser}'
+    
+    def to_cache_data(self, result: Dict[str, any]) -> Dict[str, any]:
+        return {
+            'keys': sorted(result['keys']),
+            'namespaces': sorted(result['namespaces']),
+            'key_details': result['key_details']
+        }
+    
+    def from_cache_data(self, data: Dict[str, any]) -> Dict[str, any]:
+        return {
+            'keys': set(data['keys']),
+            'namespaces': set(data['namespaces']),
+            'key_details': data['key_details']
+        }
+    
+    def count_hits(self, file_result: Dict[str, any]) -> int:
+        return len(file_result['keys'])
+    
+    def extract_from_directory(self, directory: Path, extensions: tuple = CODE_EXTENSIONS,
+                               files: List[Path] = None, cache=None, progress=None,
+                               cancel=None) -> Dict[str, any]:
+        """
+        Extract translation keys from all files in directory (or only files).
+        cache: optional ExtractionCache serving unchanged files without reading them.
+        progress/cancel: see SourceCorpus.run; a cancelled scan raises ScanCancelled.
+        """
+        corpus = SourceCorpus(directory, extensions).register('extraction', self)
+        return corpus.run(files, cache, progress=progress, cancel=cancel)['extraction']
+    
+    def build_directory_results(self, file_results: Dict[str, Dict]) -> Dict[str, any]:
+        """Combine per-file results, keeping files with keys or namespaces"""
         all_keys = set()
         all_namespaces = set()
-        file_results = {}
-        
-        files = get_code_files(directory, extensions)
+        kept_results = {}
         
-        for file_path in files:
-            result = self.extract_from_file(file_path)
+        for relative_path, result in file_results.items():
             if result['keys'] or result['namespaces']:
-                file_results[str(file_path.relative_to(directory))] = result
+                kept_results[relative_path] = result
                 all_keys.update(result['keys'])
                 all_namespaces.update(result['namespaces'])
         
         return {
             'all_keys': all_keys,
             'all_namespaces': all_namespaces,
-            'file_results': file_results
+            'file_results': kept_results
         }
     
     def get_keys_by_namespace(self, extraction_result: Dict) -> Dict[str, Set[str]]:
@@ -0,0 +1,400 @@
+"""
+Pure-Python TSX/JSX tokenizer producing a lightweight node stream.
+
+It is not a full parser. It tracks just enough context (strings, comments,
+template literals, regex literals and JSX nesting) to tell JSX text apart
+from TypeScript generics such as `Array<string>`, and to report:
+
+- JSXText: text between JSX tags, may span several lines
+- JSXAttribute: attribute name and string value (value is None for {expr})
+- StringLiteral: quoted string in code, with the callee when it is a call argument
+- TemplateLiteral: backtick string, with has_substitutions for `${}`
+- CallExpression: callee name (dotted for member calls) and its first argument
+"""
+import re
+from typing import Iterator, List
+
+# Backends accepted by the extractors' parser option
+PARSERS = ('regex', 'tsx')
+
+JSX_TEXT = 'JSXText'
+JSX_ATTRIBUTE = 'JSXAttribute'
+STRING_LITERAL = 'StringLiteral'
+TEMPLATE_LITERAL = 'TemplateLiteral'
+CALL_EXPRESSION = 'CallExpression'
+
+IDENT_RE = re.compile(r'[A-Za-z_$À-￿][\w$À-￿]*')
+WHITESPACE_RE = re.compile(r'\s+')
+NUMBER_RE = re.compile(r'0[xXbBoO][0-9a-fA-F_]+n?|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d+)?n?')
+JSX_NAME_RE = re.compile(r'[A-Za-z_$][\w$.:-]*')
+JSX_ATTR_NAME_RE = re.compile(r'[A-Za-z_$][\w$:-]*')
+JSX_TEXT_RE = re.compile(r'[^<{]+')
+TEMPLATE_CHUNK_RE = re.compile(r'[^`\\$]+|\\[\s\S]?|\$\{|\$')
+REGEX_FLAGS_RE = re.compile(r'[a-z]*')
+# Type arguments of a generic call such as useState<string | null>(...)
+TYPE_ARGUMENTS_RE = re.compile(r'<[\w$\s,.|&\[\]]*(?:<[\w$\s,.|&\[\]]*>[\w$\s,.|&\[\]]*)*>(?=\s*\()')
+# First argument of a call: a quoted string or an identifier, then ")" or ","
+CALL_ARGUMENT_RE = re.compile(
+    r'\s*(?:"((?:[^"\\\n]|\\.)*)"|\'((?:[^\'\\\n]|\\.)*)\'|([A-Za-z_$][\w$]*))\s*([),])?')
+
+KEYWORDS = {
+    'break', 'case', 'catch', 'class', 'const', 'continue', 'debugger', 'default', 'delete',
+    'do', 'else', 'export', 'extends', 'finally', 'for', 'function', 'if', 'import', 'in',
+    'instanceof', 'let', 'new', 'return', 'switch', 'this', 'throw', 'try', 'typeof', 'var',
+    'void', 'while', 'with', 'yield', 'await', 'of', 'as', 'async'
+}
+# Keywords after which an expression (and so a regex or JSX) may start
+EXPRESSION_KEYWORDS = {
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void', 'throw',
+    'case', 'do', 'else', 'yield', 'await', 'default', 'export'
+}
+# Punctuators after which an operand is expected
+OPERAND_END_PUNCTUATORS = {')', ']', '}'}
+THREE_CHAR_PUNCTUATORS = {'===', '!==', '**=', '...', '<<=', '>>=', '>>>', '&&=', '||=', '??='}
+TWO_CHAR_PUNCTUATORS = {
+    '=>', '==', '!=', '<=', '>=', '&&', '||', '??', '?.', '++', '--', '+=', '-=', '*=',
+    '/=', '%=', '&=', '|=', '^=', '<<', '>>', '**'
+}
+
+
+class Node:
+    """One entry of the node stream"""
+
+    __slots__ = ('kind', 'start', 'end', 'value', 'name', 'callee', 'arg_kind',
+                 'single_arg', 'has_substitutions')
+
+    def __init__(self, kind: str, start: int, end: int, value: str = None, name: str = None):
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.value = value
+        # JSXAttribute name or CallExpression callee
+        self.name = name
+        # StringLiteral: callee when the string is a call's first argument
+        self.callee = None
+        # CallExpression: 'string', 'identifier' or None, and whether it is the only argument
+        self.arg_kind = None
+        self.single_arg = False
+        self.has_substitutions = False
+
+    def __repr__(self):
+        return f"Node({self.kind}, {self.start}, {self.end}, {self.value!r}, {self.name!r})"
+
+
+class TsxTokenizer:
+    """Incremental tokenizer; iterate nodes() to stream the nodes of one file"""
+
+    def __init__(self, content: str, jsx: bool = True):
+        self.content = content
+        self.length = len(content)
+        self.jsx = jsx
+        # Last significant code token as (kind, value)
+        self.prev = None
+        self.prev_prev = None
+        # Start of the last identifier (or member chain)
+        self.ident_start = 0
+        # (position, callee) of a string literal known to be a call's first argument
+        self.call_argument = None
+
+    def nodes(self) -> Iterator[Node]:
+        yield from self._scan_code(0, nested=False)
+
+    def _set_prev(self, kind: str, value: str = None):
+        self.prev_prev = self.prev
+        self.prev = (kind, value)
+
+    def _expression_allowed(self) -> bool:
+        """Check if an operand may start here (regex or JSX rather than an operator)"""
+        if self.prev is None:
+            return True
+        kind, value = self.prev
+        if kind == 'punct':
+            return value not in OPERAND_END_PUNCTUATORS
+        if kind == 'keyword':
+            return value in EXPRESSION_KEYWORDS
+        return False
+
+    def _skip_space(self, pos: int) -> int:
+        """Skip whitespace and comments"""
+        content = self.content
+        while pos < self.length:
+            ch = content[pos]
+            if ch.isspace():
+                pos = WHITESPACE_RE.match(content, pos).end()
+            elif content.startswith('//', pos):
+                end = content.find('\n', pos)
+                pos = self.length if end == -1 else end
+            elif content.startswith('/*', pos):
+                end = content.find('*/', pos + 2)
+                pos = self.length if end == -1 else end + 2
+            else:
+                break
+        return pos
+
+    def _string_end(self, pos: int, quote: str) -> int:
+        """Return the position after a quoted string (or the end of an unterminated line)"""
+        content = self.content
+        i = pos + 1
+        while i < self.length:
+            ch = content[i]
+            if ch == '\\':
+                i += 2
+            elif ch == quote:
+                return i + 1
+            elif ch == '\n':
+                return i
+            else:
+                i += 1
+        return self.length
+
+    def _regex_end(self, pos: int) -> int:
+        """Return the position after a regex literal, or pos + 1 if it is not one"""
+        content = self.content
+        i = pos + 1
+        in_class = False
+        while i < self.length:
+            ch = content[i]
+            if ch == '\\':
+                i += 2
+                continue
+            if ch == '\n':
+                return pos + 1
+            if in_class:
+                in_class = ch != ']'
+            elif ch == '[':
+                in_class = True
+            elif ch == '/':
+                return REGEX_FLAGS_RE.match(content, i + 1).end()
+            i += 1
+        return pos + 1
+
+    def _scan_code(self, pos: int, nested: bool):
+        """
+        Scan code from pos. When nested (inside `${}` or a JSX expression),
+        stop after the unmatched closing brace and return that position.
+        """
+        content = self.content
+        depth = 0
+        while pos < self.length:
+            ch = content[pos]
+
+            if ch.isspace():
+                pos = WHITESPACE_RE.match(content, pos).end()
+                continue
+
+            if ch == '/':
+                following = content[pos + 1:pos + 2]
+                if following == '/' or following == '*':
+                    pos = self._skip_space(pos)
+                elif self._expression_allowed():
+                    pos = self._regex_end(pos)
+                    self._set_prev('regex')
+                else:
+                    pos += 2 if following == '=' else 1
+                    self._set_prev('punct', '/')
+                continue
+
+            if ch == '"' or ch == "'":
+                end = self._string_end(pos, ch)
+                node = Node(STRING_LITERAL, pos, end, content[pos + 1:end - 1])
+                if self.call_argument and self.call_argument[0] == pos:
+                    node.callee = self.call_argument[1]
+                self.call_argument = None
+                yield node
+                self._set_prev('string')
+                pos = end
+                continue
+
+            if ch == '`':
+                pos = yield from self._scan_template(pos)
+                self._set_prev('template')
+                continue
+
+            if ch == '<' and self.prev and self.prev[0] == 'ident':
+                match = TYPE_ARGUMENTS_RE.match(content, pos)
+                if match:
+                    # Generic call: keep the identifier as the callee
+                    pos = match.end()
+                    continue
+
+            if ch == '<' and self.jsx and self._expression_allowed():
+                following = content[pos + 1:pos + 2]
+                if following == '>' or following.isalpha() or following == '_':
+                    pos = yield from self._scan_jsx_element(pos)
+                    self._set_prev('jsx')
+                    continue
+
+            match = IDENT_RE.match(content, pos)
+            if match:
+                name = match.group(0)
+                if self.prev == ('punct', '.') and self.prev_prev and self.prev_prev[0] == 'ident':
+                    # Member chain such as console.log
+                    self._set_prev('ident', f"{self.prev_prev[1]}.{name}")
+                elif name in KEYWORDS:
+                    self._set_prev('keyword', name)
+                else:
+                    self._set_prev('ident', name)
+                    self.ident_start = pos
+                pos = match.end()
+                continue
+
+            if ch.isdigit() or (ch == '.' and content[pos + 1:pos + 2].isdigit()):
+                pos = NUMBER_RE.match(content, pos).end() or pos + 1
+                self._set_prev('number')
+                continue
+
+            if ch == '{':
+                depth += 1
+            elif ch == '}':
+                if depth == 0 and nested:
+                    return pos + 1
+                depth = max(0, depth - 1)
+            elif ch == '(' and self.prev and self.prev[0] == 'ident' \
+                    and self.prev_prev != ('keyword', 'function'):
+                yield self._call_node(pos)
+
+            for size, punctuators in ((3, THREE_CHAR_PUNCTUATORS), (2, TWO_CHAR_PUNCTUATORS)):
+                if content[pos:pos + size] in punctuators:
+                    token = content[pos:pos + size]
+                    break
+            else:
+                token = ch
+            # Optional chaining behaves like member access for callee names
+            self._set_prev('punct', '.' if token == '?.' else token)
+            pos += len(token)
+
+        return pos
+
+    def _call_node(self, pos: int) -> Node:
+        """Build a CallExpression for the "(" at pos, looking ahead at its first argument"""
+        callee = self.prev[1]
+        node = Node(CALL_EXPRESSION, self.ident_start, pos + 1, name=callee)
+        match = CALL_ARGUMENT_RE.match(self.content, pos + 1)
+        if match:
+            if match.group(3) is not None:
+                node.arg_kind = 'identifier'
+                node.value = match.group(3)
+            else:
+                node.arg_kind = 'string'
+                node.value = match.group(1) if match.group(1) is not None else match.group(2)
+                string_start = self.content.index(match.group(0).lstrip()[0], pos + 1)
+                self.call_argument = (string_start, callee)
+            node.single_arg = match.group(4) == ')'
+        return node
+
+    def _scan_template(self, pos: int):
+        """Scan a template literal starting at the backtick; return the position after it"""
+        content = self.content
+        node = Node(TEMPLATE_LITERAL, pos, self.length)
+        substitutions = []
+        i = pos + 1
+        while i < self.length:
+            if content[i] == '`':
+                i += 1
+                break
+            match = TEMPLATE_CHUNK_RE.match(content, i)
+            chunk = match.group(0)
+            if chunk == '${':
+                node.has_substitutions = True
+                saved = (self.prev, self.prev_prev)
+                self._set_prev('punct', '{')
+                # Collect nested nodes so the literal is reported before its contents
+                nested = self._scan_code(i + 2, nested=True)
+                try:
+                    while True:
+                        substitutions.append(next(nested))
+                except StopIteration as stop:
+                    i = stop.value
+                self.prev, self.prev_prev = saved
+            else:
+                i = match.end()
+        node.end = min(i, self.length)
+        node.value = content[pos + 1:node.end - 1] if content[node.end - 1:node.end] == '`' \
+            else content[pos + 1:node.end]
+        yield node
+        yield from substitutions
+        return node.end
+
+    def _scan_expression_container(self, pos: int):
+        """Scan a JSX {expression} starting at "{"; return the position after "}" """
+        saved = (self.prev, self.prev_prev)
+        self._set_prev('punct', '{')
+        end = yield from self._scan_code(pos + 1, nested=True)
+        self.prev, self.prev_prev = saved
+        return end
+
+    def _scan_jsx_element(self, pos: int):
+        """Scan a JSX element or fragment starting at "<"; return the position after it"""
+        content = self.content
+        pos = self._skip_space(pos + 1)
+
+        if content[pos:pos + 1] != '>':
+            match = JSX_NAME_RE.match(content, pos)
+            if not match:
+                return pos
+            pos = match.end()
+
+            # Attributes
+            while True:
+                pos = self._skip_space(pos)
+                if pos >= self.length:
+                    return pos
+                ch = content[pos]
+                if content.startswith('/>', pos):
+                    return pos + 2
+                if ch == '>':
+                    break
+                if ch == '{':
+                    pos = yield from self._scan_expression_container(pos)
+                    continue
+                match = JSX_ATTR_NAME_RE.match(content, pos)
+                if not match:
+                    pos += 1
+                    continue
+                name = match.group(0)
+                pos = self._skip_space(match.end())
+                if content[pos:pos + 1] != '=':
+                    continue
+                pos = self._skip_space(pos + 1)
+                value_char = content[pos:pos + 1]
+                if value_char in ('"', "'"):
+                    end = content.find(value_char, pos + 1)
+                    end = self.length if end == -1 else end + 1
+                    yield Node(JSX_ATTRIBUTE, pos, end, content[pos + 1:end - 1], name)
+                    pos = end
+                elif value_char == '{':
+                    yield Node(JSX_ATTRIBUTE, pos, pos + 1, None, name)
+                    pos = yield from self._scan_expression_container(pos)
+                elif value_char == '<':
+                    pos = yield from self._scan_jsx_element(pos)
+
+        # Children
+        pos += 1
+        while pos < self.length:
+            ch = content[pos]
+            if ch == '{':
+                pos = yield from self._scan_expression_container(pos)
+            elif ch == '<':
+                if content[self._skip_space(pos + 1):self._skip_space(pos + 1) + 1] == '/':
+                    end = content.find('>', pos)
+                    return self.length if end == -1 else end + 1
+                pos = yield from self._scan_jsx_element(pos)
+            else:
+                match = JSX_TEXT_RE.match(content, pos)
+                raw = match.group(0)
+                stripped = raw.strip()
+                if stripped:
+                    start = pos + raw.index(stripped[0])
+                    yield Node(JSX_TEXT, start, start + len(stripped), stripped)
+                pos = match.end()
+        return pos
+
+
+def tokenize_tsx(content: str, jsx: bool = True) -> List[Node]:
+    """Tokenize a whole file into a node list"""
+    return list(TsxTokenizer(content, jsx).nodes())
+
+
+def jsx_enabled_for(file_path) -> bool:
+    """JSX is parsed in .tsx/.jsx/.js files; in .ts files "<" is always a type or operator"""
+    return str(file_path).lower().endswith(('.tsx', '.jsx', '.js'))
@@ -1,3 +1,4 @@
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Dict, Set, List
 import sys
@@ -5,23 +6,28 @@ import os
 
 # Add parent directory to path for utils import
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils import load_json_file, get_all_keys
+from locale_store import LocaleStore
 
 
 class UnusedKeysFinder:
     """Find translation keys in files but not used in code"""
     
-    def __init__(self, translation_dir: Path, locale: str = 'en'):
+    def __init__(self, translation_dir: Path, locale: str = 'en', layout: str = 'auto',
+                 store: LocaleStore = None):
         self.translation_dir = translation_dir
         self.locale = locale
+        self.layout = layout
+        # A long-lived store (e.g. the server's) is reused and left open
+        self.store = store
         self.translation_file = translation_dir / f"{locale}.json"
     
+    def _open_store(self):
+        if self.store is not None:
+            return nullcontext(self.store)
+        return LocaleStore(self.translation_dir, self.locale, self.layout)
+    
     def find_unused_keys(self, extracted_keys: Set[str], namespace: str = None) -> Dict[str, any]:
         """Find keys that are in translation files but not used in code"""
-        # Load existing translation file
-        existing_translations = load_json_file(self.translation_file)
-        existing_keys = get_all_keys(existing_translations)
-        
         # Filter extracted keys by namespace if provided
         if namespace:
             # Keys might be prefixed with namespace or not
@@ -35,35 +41,29 @@ class UnusedKeysFinder:
             extracted_keys = namespace_extracted
         
         # Find unused keys
-        unused_keys = existing_keys - extracted_keys
-        
+        unused_keys = set()
         unused_details = []
-        for key in unused_keys:
-            unused_details.append({
-                'key': key,
-                'namespace': namespace,
-                'value': self._get_key_value(existing_translations, key)
-            })
+        # Split layouts only open the namespace file(s) being checked
+        with self._open_store() as store:
+            scope = store.scope(namespace)
+            total_in_file = len(scope)
+            for key, value in scope.items():
+                if key not in extracted_keys and key not in unused_keys:
+                    unused_keys.add(key)
+                    unused_details.append({
+                        'key': key,
+                        'namespace': namespace,
+                        'value': value
+                    })
         
         return {
             'unused_keys': unused_keys,
             'unused_count': len(unused_keys),
-            'total_in_file': len(existing_keys),
+            'total_in_file': total_in_file,
             'total_used': len(extracted_keys),
             'unused_details': unused_details
         }
     
-    def _get_key_value(self, translations: dict, key_path: str) -> str:
-        """Get the value of a key from nested dict"""
-        keys = key_path.split('.')
-        current = translations
-        for key in keys:
-            if isinstance(current, dict) and key in current:
-                current = current[key]
-            else:
-                return ""
-        return str(current) if not isinstance(current, dict) else "[nested object]"
-    
     def find_unused_for_all_namespaces(self, namespace_keys: Dict[str, Set[str]]) -> Dict[str, Dict]:
         """Find unused keys for all namespaces"""
         results = {}
@@ -85,7 +85,7 @@ class UnusedKeysFinder:
         results = {}
         
         for locale in locales:
-            finder = UnusedKeysFinder(self.translation_dir, locale)
+            finder = UnusedKeysFinder(self.translation_dir, locale, self.layout)
             results[locale] = finder.find_unused_keys(extracted_keys)
         
         return results
@@ -0,0 +1,394 @@
+import bisect
+import difflib
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+import sys
+import os
+
+# Add parent directory to path for utils import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from locale_store import LocaleStore
+from key_registry import KeyRegistry
+from extractors import tsx_tokenizer
+from utils import suggest_translation_key
+
+# Hit types migrated by default; string/template literals need an explicit opt-in
+DEFAULT_TYPES = ('jsx_text', 'jsx_attr')
+LITERAL_TYPES = ('string_literal', 'template_literal')
+# Files sent to a worker process per round trip
+CHUNK_SIZE = 16
+# Node a hit must be found at before it is rewritten, by hit type prefix
+HIT_NODE_KINDS = {
+    'jsx_text': tsx_tokenizer.JSX_TEXT,
+    'jsx_attr': tsx_tokenizer.JSX_ATTRIBUTE,
+    'string_literal': tsx_tokenizer.STRING_LITERAL,
+    'template_literal': tsx_tokenizer.TEMPLATE_LITERAL,
+}
+
+T_DECLARATION_PATTERN = re.compile(
+    r'(?:const|let)\s+t\s*=\s*(?:await\s+)?(?:useTranslations|getTranslations)\s*\(\s*'
+    r'(?:["\']([^"\']*)["\'])?\s*\)')
+COMPONENT_PATTERNS = (
+    re.compile(r'^[ \t]*(?:export\s+(?:default\s+)?)?(async\s+)?function\s+[A-Z]\w*\s*'
+               r'\([^)]*\)\s*(?::\s*[^{]+)?\{', re.MULTILINE),
+    re.compile(r'^[ \t]*(?:export\s+)?const\s+[A-Z]\w*\s*(?::\s*[^=]+)?=\s*(async\s*)?'
+               r'\([^)]*\)\s*(?::\s*[^=]+)?=>\s*[{(]', re.MULTILINE),
+)
+CLOSING_BRACKETS = {'{': '}', '(': ')'}
+DIRECTIVE_PATTERN = re.compile(r'^\s*(["\'])use (?:client|server)\1;?[^\n]*\n')
+TRANSLATION_CALL_PATTERN = re.compile(r'\bt(?:\.\w+)?\s*\(\s*$')
+
+
+def _type_selected(hit_type: str, types: tuple) -> bool:
+    return any(hit_type == t or hit_type.startswith(t + '_') for t in types)
+
+
+def _hit_node_kind(hit_type: str) -> Optional[str]:
+    for prefix, kind in HIT_NODE_KINDS.items():
+        if hit_type == prefix or hit_type.startswith(prefix + '_'):
+            return kind
+    return None
+
+
+class _SourceNodes:
+    """
+    Where the tsx tokenizer finds JSX text, attribute values and literals in a
+    file, so hits (possibly from the regex backend or an old scan) are only
+    rewritten where the source really has such a node.
+    """
+
+    def __init__(self, content: str, jsx: bool = True):
+        self.spans = {}
+        self.text_starts = []
+        self.text_ends = []
+        # start -> end of literal text, which brace matching must not look into
+        self.literals = {}
+        for node in tsx_tokenizer.tokenize_tsx(content, jsx):
+            self.spans[(node.start, node.end)] = node.kind
+            if node.value is not None:
+                self.literals[node.start] = node.end
+            if node.kind == tsx_tokenizer.JSX_TEXT:
+                self.text_starts.append(node.start)
+                self.text_ends.append(node.end)
+
+    def matches(self, start: int, end: int, kind: str) -> bool:
+        if kind == tsx_tokenizer.JSX_TEXT:
+            # Regex hits may cover only part of a JSX text node
+            index = bisect.bisect_right(self.text_starts, start) - 1
+            return index >= 0 and end <= self.text_ends[index]
+        return self.spans.get((start, end)) == kind
+
+
+def _closing_end(content: str, open_pos: int, literals: Dict[int, int]) -> int:
+    """Offset just past the bracket closing the one at open_pos, skipping literals and comments"""
+    opening = content[open_pos]
+    closing = CLOSING_BRACKETS[opening]
+    depth = 0
+    pos = open_pos
+    length = len(content)
+    while pos < length:
+        if pos in literals:
+            pos = literals[pos]
+            continue
+        ch = content[pos]
+        if content.startswith('//', pos):
+            end = content.find('\n', pos)
+            pos = length if end == -1 else end
+            continue
+        if content.startswith('/*', pos):
+            end = content.find('*/', pos + 2)
+            pos = length if end == -1 else end + 2
+            continue
+        if ch == opening:
+            depth += 1
+        elif ch == closing:
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    return length
+
+
+def _find_components(content: str, nodes: _SourceNodes) -> List[tuple]:
+    """
+    Return (body_start, body_end, indent, is_async, expression) for each
+    component, sorted by position. Block bodies span the braces' contents;
+    expression bodies (`=> (...)`) span the parentheses themselves.
+    """
+    components = []
+    for pattern in COMPONENT_PATTERNS:
+        for match in pattern.finditer(content):
+            line = match.group(0)
+            indent = line[:len(line) - len(line.lstrip())]
+            open_pos = match.end() - 1
+            body_end = _closing_end(content, open_pos, nodes.literals)
+            if content[open_pos] == '{':
+                components.append((match.end(), body_end - 1, indent, bool(match.group(1)), False))
+            else:
+                components.append((open_pos, body_end, indent, bool(match.group(1)), True))
+    return sorted(components)
+
+
+def rewrite_source(content: str, hits: List[Dict], namespace: Optional[str],
+                   jsx: bool = True) -> Dict[str, any]:
+    """
+    Apply all replacements for one file in reverse offset order.
+    hits: dicts with start, end, type, text and key; a hit is only rewritten
+    where the tsx tokenizer finds a node of its type at its offsets.
+    Each component gets a t hook unless it already declares one; expression-bodied
+    arrow components are turned into block bodies to hold it. Hits outside every
+    component body are skipped.
+    Returns new content, applied (key, text) pairs, skipped hits and the namespace used.
+    """
+    edits = []
+    applied = []
+    skipped = []
+
+    declarations = list(T_DECLARATION_PATTERN.finditer(content))
+    declaration_starts = [declaration.start() for declaration in declarations]
+    if declarations:
+        namespace = declarations[0].group(1) or None
+    nodes = _SourceNodes(content, jsx)
+    components = _find_components(content, nodes)
+
+    used_components = {}
+    last_end = -1
+    for hit in sorted(hits, key=lambda h: h['start']):
+        start, end = hit['start'], hit['end']
+        # Whitespace-insensitive, as multi-line JSX text is reported collapsed
+        if start < last_end or ' '.join(hit['text'].split()) not in ' '.join(content[start:end].split()):
+            skipped.append({'text': hit['text'], 'reason': 'stale or overlapping offsets'})
+            continue
+        kind = _hit_node_kind(hit['type'])
+        if kind is None or not nodes.matches(start, end, kind):
+            skipped.append({'text': hit['text'], 'reason': 'not JSX text, an attribute value or a literal'})
+            continue
+        if TRANSLATION_CALL_PATTERN.search(content[max(0, start - 20):start]):
+            skipped.append({'text': hit['text'], 'reason': 'already a translation key'})
+            continue
+
+        # The innermost component whose body contains the hit
+        owner = None
+        for component in components:
+            if component[0] <= start and end <= component[1]:
+                owner = component
+        if owner is None:
+            skipped.append({'text': hit['text'], 'reason': 'outside a component'})
+            continue
+        # The closest t declaration before the hit counts if it is inside the same body
+        index = bisect.bisect_right(declaration_starts, start) - 1
+        declaration = declarations[index] if index >= 0 else None
+        if declaration is not None and declaration.start() >= owner[0]:
+            if (declaration.group(1) or None) != namespace:
+                skipped.append({'text': hit['text'], 'reason': 'component uses another namespace'})
+                continue
+        else:
+            used_components[owner[0]] = owner
+
+        call = f't("{hit["key"]}")'
+        if kind in (tsx_tokenizer.JSX_TEXT, tsx_tokenizer.JSX_ATTRIBUTE):
+            call = '{' + call + '}'
+        edits.append((start, end, call))
+        applied.append((hit['key'], hit['text']))
+        last_end = end
+
+    if not edits:
+        return {'content': content, 'applied': applied, 'skipped': skipped, 'namespace': namespace}
+
+    imports = set()
+    ns_arg = f'"{namespace}"' if namespace else ''
+    for body_start, body_end, indent, is_async, expression in used_components.values():
+        if is_async:
+            hook = f'const t = await getTranslations({ns_arg});'
+            imports.add(('getTranslations', 'next-intl/server'))
+        else:
+            hook = f'const t = useTranslations({ns_arg});'
+            imports.add(('useTranslations', 'next-intl'))
+        if expression:
+            edits.append((body_start, body_start, f'{{\n{indent}  {hook}\n{indent}  return '))
+            edits.append((body_end, body_end, f';\n{indent}}}'))
+        else:
+            edits.append((body_start, body_start, f'\n{indent}  {hook}'))
+
+    import_lines = ''
+    for name, module in sorted(imports):
+        if not re.search(r'import\s*\{[^}]*\b' + name + r'\b[^}]*\}\s*from', content):
+            import_lines += f'import {{ {name} }} from "{module}";\n'
+    if import_lines:
+        directive = DIRECTIVE_PATTERN.match(content)
+        position = directive.end() if directive else 0
+        edits.append((position, position, import_lines))
+
+    # Build the output from the untouched segments between edits in one join
+    pieces = []
+    position = len(content)
+    for start, end, replacement in sorted(edits, key=lambda e: (e[0], e[1]), reverse=True):
+        pieces.append(content[end:position])
+        pieces.append(replacement)
+        position = start
+    pieces.append(content[:position])
+    new_content = ''.join(reversed(pieces))
+
+    return {'content': new_content, 'applied': applied, 'skipped': skipped, 'namespace': namespace}
+
+
+def _migrate_file(task: tuple) -> Dict[str, any]:
+    """Worker: rewrite one source file in memory and build its diff"""
+    file_path, relative_path, hits, namespace = task
+    result = {'file': relative_path, 'applied': [], 'skipped': [], 'namespace': namespace,
+              'content': None, 'diff': '', 'size': 0}
+    try:
+        raw = Path(file_path).read_bytes().decode('utf-8')
+    except (OSError, UnicodeDecodeError) as e:
+        result['skipped'] = [{'text': hit['text'], 'reason': f'unreadable file: {e}'} for hit in hits]
+        return result
+
+    result['size'] = len(raw)
+    newline = '\r\n' if '\r\n' in raw else '\n'
+    content = raw.replace('\r\n', '\n')
+    rewritten = rewrite_source(content, hits, namespace, tsx_tokenizer.jsx_enabled_for(relative_path))
+    result.update(applied=rewritten['applied'], skipped=rewritten['skipped'],
+                  namespace=rewritten['namespace'])
+
+    if rewritten['applied']:
+        result['content'] = rewritten['content'].replace('\n', newline) if newline != '\n' else rewritten['content']
+        result['diff'] = ''.join(difflib.unified_diff(
+            content.splitlines(keepends=True), rewritten['content'].splitlines(keepends=True),
+            fromfile=f'a/{relative_path}', tofile=f'b/{relative_path}'))
+    return result
+
+
+def _migrate_files(tasks: List[tuple]) -> List[Dict[str, any]]:
+    """Worker: migrate a chunk of files (one round trip per chunk)"""
+    return [_migrate_file(task) for task in tasks]
+
+
+class SourceMigrator:
+    """Replace hardcoded strings with t() calls and add their keys to the locale file"""
+
+    def __init__(self, source_dir: Path, translation_dir: Path, locale: str = 'en',
+                 namespace: str = None, include_literals: bool = False, jobs: int = None,
+                 key_registry: KeyRegistry = None, layout: str = 'auto'):
+        self.source_dir = source_dir
+        self.translation_dir = translation_dir
+        self.locale = locale
+        self.layout = layout
+        self.namespace = namespace
+        self.types = DEFAULT_TYPES + (LITERAL_TYPES if include_literals else ())
+        self.jobs = jobs
+        self.key_registry = key_registry if key_registry is not None else KeyRegistry()
+
+    def assign_keys(self, hardcoded_results: Dict[str, List[Dict]],
+                    skipped: List[Dict] = None) -> Dict[str, List[Dict]]:
+        """
+        Give each selected hit a key from the registry; one text maps to one key.
+        Texts whose key would start with a digit (not a usable message key) get
+        none and are appended to skipped, if given.
+        """
+        planned = {}
+
+        with LocaleStore(self.translation_dir, self.locale, self.layout) as store:
+            self.key_registry.seed_from_snapshot(store, self.namespace)
+
+        for relative_path in sorted(hardcoded_results):
+            file_hits = []
+            for hit in hardcoded_results[relative_path]:
+                if 'start' not in hit or not _type_selected(hit['type'], self.types):
+                    continue
+                if suggest_translation_key(KeyRegistry.normalize_text(hit['text']))[:1].isdigit():
+                    if skipped is not None:
+                        skipped.append({'text': hit['text'], 'reason': 'key would start with a digit',
+                                        'file': relative_path})
+                    continue
+                file_hits.append(dict(hit, key=self.key_registry.key_for(hit['text'])))
+            if file_hits:
+                planned[relative_path] = file_hits
+        return planned
+
+    def _rewrite_all(self, tasks: List[tuple], progress=None, cancel=None) -> List[Dict[str, any]]:
+        """Rewrite files in worker processes; cancelling drops the chunks not yet started"""
+        chunks = [tasks[i:i + CHUNK_SIZE] for i in range(0, len(tasks), CHUNK_SIZE)]
+        chunk_results = [None] * len(chunks)
+        report = {'files_done': 0, 'files_total': len(tasks), 'bytes_done': 0, 'hits': 0, 'file': None}
+
+        def record(index: int, results: List[Dict]):
+            chunk_results[index] = results
+            for result in results:
+                report['files_done'] += 1
+                report['bytes_done'] += result['size']
+                report['hits'] += len(result['applied'])
+                report['file'] = result['file']
+            if progress is not None:
+                progress(dict(report))
+
+        if len(tasks) > 1 and self.jobs != 1:
+            executor = ProcessPoolExecutor(max_workers=self.jobs)
+            try:
+                futures = {executor.submit(_migrate_files, chunk): index for index, chunk in enumerate(chunks)}
+                for future in as_completed(futures):
+                    if cancel is not None:
+                        cancel.raise_if_cancelled()
+                    record(futures[future], future.result())
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            for index, chunk in enumerate(chunks):
+                if cancel is not None:
+                    cancel.raise_if_cancelled()
+                record(index, _migrate_files(chunk))
+
+        return [result for results in chunk_results for result in results]
+
+    def rewrite(self, hardcoded_results: Dict[str, List[Dict]], dry_run: bool = False,
+                progress=None, cancel=None) -> Dict[str, any]:
+        """
+        Rewrite all files with hits in memory; nothing is written yet.
+        progress/cancel: as for SourceCorpus.run; a cancelled rewrite raises
+        ScanCancelled. The new file contents are in results['contents'].
+        """
+        skipped = []
+        planned = self.assign_keys(hardcoded_results, skipped)
+        tasks = [
+            (str(self.source_dir / relative_path), relative_path, hits, self.namespace)
+            for relative_path, hits in planned.items()
+        ]
+        file_results = self._rewrite_all(tasks, progress, cancel)
+
+        entries = {}
+        for file_result in file_results:
+            namespace = file_result['namespace']
+            for key, text in file_result['applied']:
+                entries[f"{namespace}.{key}" if namespace else key] = text
+            for skip in file_result['skipped']:
+                skipped.append(dict(skip, file=file_result['file']))
+
+        changed = [r for r in file_results if r['content'] is not None]
+        return {
+            'files_changed': len(changed),
+            'strings_migrated': sum(len(r['applied']) for r in file_results),
+            'keys': entries,
+            'skipped': skipped,
+            'diffs': [r['diff'] for r in changed] if dry_run else [],
+            'contents': {r['file']: r['content'] for r in changed},
+            'success': True
+        }
+
+    def write(self, results: Dict[str, any]) -> Dict[str, any]:
+        """Insert the keys of a rewrite in one batched write, then write its source files"""
+        if not results['contents']:
+            return results
+
+        # Keys first, so a failed locale write leaves the sources untouched
+        from generators.translation_generator import TranslationFileGenerator
+        generator = TranslationFileGenerator(self.translation_dir, self.locale, self.layout)
+        update_results = generator.add_translations(results['keys'])
+        if not update_results['success']:
+            results['success'] = False
+            return results
+
+        for relative_path, content in results['contents'].items():
+            with open(self.source_dir / relative_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(content)
+        return results
@@ -5,76 +5,72 @@ import os
 
 # Add parent directory to path for utils import
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils import load_json_file, save_json_file, set_nested_value, get_nested_value, suggest_translation_key
+from utils import load_json_file, save_json_file
+from locale_store import LocaleStore
 
 
 class TranslationFileGenerator:
     """Generate and update translation JSON files"""
     
-    def __init__(self, translation_dir: Path, locale: str = 'en'):
+    def __init__(self, translation_dir: Path, locale: str = 'en', layout: str = 'auto'):
         self.translation_dir = translation_dir
         self.locale = locale
+        self.layout = layout
+        self.store = LocaleStore(translation_dir, locale, layout)
         self.translation_file = translation_dir / f"{locale}.json"
     
+    def _auto_fill_value(self, key: str, memory=None) -> str:
+        """Propose a value for a key from the translation memory or the key name"""
+        if memory is not None:
+            value = memory.propose(key)
+            if value:
+                return value
+        return key.replace('.', ' ').title()
+    
+    def _new_value(self, key: str, auto_fill: bool, default_value: str = None, memory=None) -> str:
+        if auto_fill:
+            # Use the translation memory or the key itself
+            return default_value or self._auto_fill_value(key, memory)
+        return default_value or f"[TODO: Translate {key}]"
+    
     def generate_file(self, keys: Set[str], auto_fill: bool = False, 
-                     default_value: str = None) -> bool:
-        """Generate a new translation file with the given keys"""
-        translations = load_json_file(self.translation_file)
-        
-        for key in keys:
-            # Check if key already exists
-            existing_value = get_nested_value(translations, key)
-            if existing_value is None:
-                # Add new key
-                if auto_fill:
-                    # Use the key itself or suggested translation
-                    value = default_value or key.replace('.', ' ').title()
-                else:
-                    value = default_value or f"[TODO: Translate {key}]"
-                set_nested_value(translations, key, value)
-        
-        return save_json_file(self.translation_file, translations)
+                     default_value: str = None, memory=None) -> bool:
+        """Generate the translation file(s) with the given keys, keeping existing values"""
+        entries = {key: self._new_value(key, auto_fill, default_value, memory) for key in keys}
+        return self.store.add_entries(entries)['success']
     
     def update_file(self, missing_keys: Set[str], auto_fill: bool = False,
-                   default_value: str = None) -> Dict[str, any]:
-        """Update existing translation file with missing keys"""
-        translations = load_json_file(self.translation_file)
-        added_keys = []
+                   default_value: str = None, memory=None) -> Dict[str, any]:
+        """Update existing translation file(s) with missing keys"""
+        # Skip keys that already exist without parsing the JSON files
         skipped_keys = []
-        
+        entries = {}
         for key in missing_keys:
-            # Check if key already exists
-            existing_value = get_nested_value(translations, key)
-            if existing_value is None:
-                # Add new key
-                if auto_fill:
-                    value = default_value or key.replace('.', ' ').title()
-                else:
-                    value = default_value or f"[TODO: Translate {key}]"
-                set_nested_value(translations, key, value)
-                added_keys.append(key)
-            else:
+            if self.store.has_node(key):
                 skipped_keys.append(key)
+            else:
+                entries[key] = self._new_value(key, auto_fill, default_value, memory)
+        self.store.close()
         
-        # Save updated file
-        success = save_json_file(self.translation_file, translations)
-        
-        return {
-            'success': success,
-            'added_keys': added_keys,
-            'skipped_keys': skipped_keys,
-            'added_count': len(added_keys),
-            'skipped_count': len(skipped_keys)
-        }
+        result = self.store.add_entries(entries)
+        result['skipped_keys'] = skipped_keys + result['skipped_keys']
+        result['skipped_count'] = len(result['skipped_keys'])
+        return result
+    
+    def add_translations(self, entries: Dict[str, str]) -> Dict[str, any]:
+        """Add key/value pairs, writing each affected translation file once"""
+        return self.store.add_entries(entries)
     
     def update_multiple_locales(self, missing_keys: Set[str], locales: List[str],
                                auto_fill: bool = False) -> Dict[str, Dict]:
         """Update multiple locale files with missing keys"""
+        from generators.translation_memory import TranslationMemory
         results = {}
         
         for locale in locales:
-            generator = TranslationFileGenerator(self.translation_dir, locale)
-            results[locale] = generator.update_file(missing_keys, auto_fill)
+            generator = TranslationFileGenerator(self.translation_dir, locale, self.layout)
+            memory = TranslationMemory.from_directory(self.translation_dir, locale) if auto_fill else None
+            results[locale] = generator.update_file(missing_keys, auto_fill, memory=memory)
         
         return results
     
@@ -116,7 +112,17 @@ class TranslationFileGenerator:
         merge_dict(source_translations, target_translations)
         return save_json_file(target_file, target_translations)
     
+    def merge_three_way(self, base_file: Path, theirs_file: Path,
+                        output_file: Path = None, prefer: str = 'ours') -> Dict[str, any]:
+        """Three-way merge an incoming translation file into this locale file"""
+        from generators.translation_merger import merge_files
+        return merge_files(base_file, self.translation_file, theirs_file,
+                           output_file or self.translation_file, prefer)
+    
     def format_file(self) -> bool:
-        """Format and save the translation file (pretty print)"""
-        translations = load_json_file(self.translation_file)
-        return save_json_file(self.translation_file, translations, indent=2)
+        """Format and save the translation file(s) (pretty print)"""
+        success = True
+        for file_path in self.store.files():
+            translations = load_json_file(file_path)
+            success = save_json_file(file_path, translations, indent=2) and success
+        return success
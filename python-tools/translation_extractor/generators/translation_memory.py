@@ -0,0 +1,120 @@
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+import sys
+import os
+
+# Add parent directory to path for utils import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from locale_store import LocaleStore, discover_locales
+
+_KEY_TOKEN_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+_TEXT_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def key_tokens(key_name: str) -> List[str]:
+    """Split a camelCase/snake_case key name into lowercase tokens"""
+    return [token.lower() for token in _KEY_TOKEN_PATTERN.findall(key_name)]
+
+
+def text_tokens(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return _TEXT_TOKEN_PATTERN.findall(text.lower())
+
+
+class TranslationMemory:
+    """Propose values for missing keys from existing translations and source literals"""
+
+    SOURCE_ORIGIN = 'source'
+
+    def __init__(self, min_score: float = 0.6):
+        self.min_score = min_score
+        self.entries = []  # (value, origin, token count)
+        self._by_key: Dict[str, List[int]] = {}
+        self._by_name: Dict[str, List[int]] = {}
+        self._token_index: Dict[str, Set[int]] = {}
+
+    @classmethod
+    def from_directory(cls, translation_dir: Path, exclude_locale: str = None,
+                       hardcoded_results: Dict[str, List[Dict]] = None) -> 'TranslationMemory':
+        """Build a memory from every other locale file and optional source literals"""
+        memory = cls()
+        if hardcoded_results:
+            memory.add_source_strings(hardcoded_results)
+        for locale in discover_locales(translation_dir):
+            if locale != exclude_locale:
+                memory.add_locale(translation_dir, locale)
+        return memory
+
+    def _add_entry(self, value: str, origin: str, key: str, name: str, tokens: List[str]):
+        index = len(self.entries)
+        unique_tokens = set(tokens)
+        self.entries.append((value, origin, len(unique_tokens)))
+        if key:
+            self._by_key.setdefault(key, []).append(index)
+        self._by_name.setdefault(name, []).append(index)
+        for token in unique_tokens:
+            self._token_index.setdefault(token, set()).add(index)
+
+    def add_locale(self, translation_dir: Path, locale: str):
+        """Index all string values from a locale (one file or its namespace files)"""
+        with LocaleStore(translation_dir, locale) as store:
+            for key, value in store.items():
+                if not value or value.startswith('[TODO:'):
+                    continue
+                name = key.split('.')[-1]
+                self._add_entry(value, locale, key, name, key_tokens(name))
+
+    def add_source_strings(self, hardcoded_results: Dict[str, List[Dict]]):
+        """Index hardcoded source literals by their suggested key and text"""
+        seen = set()
+        for strings in hardcoded_results.values():
+            for string_info in strings:
+                text = string_info.get('text', '')
+                name = string_info.get('suggested_key', '')
+                if not text or not name or (text, name) in seen:
+                    continue
+                seen.add((text, name))
+                self._add_entry(text, self.SOURCE_ORIGIN, None, name, text_tokens(text))
+
+    def _best(self, indexes: List[int]) -> str:
+        """Prefer source literals over values from other locales"""
+        for index in indexes:
+            if self.entries[index][1] == self.SOURCE_ORIGIN:
+                return self.entries[index][0]
+        return self.entries[indexes[0]][0]
+
+    def propose(self, key: str) -> Optional[str]:
+        """Propose a value for a key, return None if nothing matches"""
+        name = key.split('.')[-1]
+
+        # Exact matches: source literal or other locale with the same key name,
+        # then other locales with the same full key
+        if name in self._by_name:
+            candidates = self._by_name[name]
+            if any(self.entries[i][1] == self.SOURCE_ORIGIN for i in candidates):
+                return self._best(candidates)
+        if key in self._by_key:
+            return self._best(self._by_key[key])
+        if name in self._by_name:
+            return self._best(self._by_name[name])
+
+        # Fuzzy match: token overlap against the inverted index
+        query = set(key_tokens(name))
+        if not query:
+            return None
+        overlap: Dict[int, int] = {}
+        for token in query:
+            for index in self._token_index.get(token, ()):
+                overlap[index] = overlap.get(index, 0) + 1
+
+        best_index, best_score = None, 0.0
+        for index, shared in overlap.items():
+            score = shared / max(len(query), self.entries[index][2])
+            if score > best_score or (score == best_score and best_index is not None
+                                      and self.entries[index][1] == self.SOURCE_ORIGIN
+                                      and self.entries[best_index][1] != self.SOURCE_ORIGIN):
+                best_index, best_score = index, score
+        if best_index is not None and best_score >= self.min_score:
+            return self.entries[best_index][0]
+        return None
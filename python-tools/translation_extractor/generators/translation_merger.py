@@ -0,0 +1,222 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Marker for a key that does not exist on one side of the merge
+MISSING = object()
+
+
+def load_translations(file_path: Path) -> dict:
+    """
+    Load a translation file for merging. Unlike load_json_file this raises
+    ValueError for unparsable files (e.g. ones with conflict markers), since
+    merging an empty dict in their place would delete every key.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{file_path} is not valid JSON: {e}")
+    if not isinstance(data, dict):
+        raise ValueError(f"{file_path} does not contain a JSON object")
+    return data
+
+
+def _flat_items(data: dict, prefix: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], object]]:
+    for key, value in data.items():
+        parts = prefix + (key,)
+        if isinstance(value, dict) and value:
+            yield from _flat_items(value, parts)
+        else:
+            # Empty objects are kept as values, so they survive the merge
+            yield parts, value
+
+
+def sorted_flat_items(data: dict) -> List[Tuple[Tuple[str, ...], object]]:
+    """Flatten translations into (key parts, value) pairs sorted by key path"""
+    if not isinstance(data, dict):
+        return []
+    return sorted(_flat_items(data), key=lambda item: item[0])
+
+
+def _lookup(data: dict, key: Tuple[str, ...]):
+    """Value (leaf or object) at a key path, or None"""
+    for part in key:
+        if not isinstance(data, dict) or part not in data:
+            return None
+        data = data[part]
+    return data
+
+
+def resolve_structure(items: Iterable, conflicts: List[Dict], prefer_keys: set,
+                      sides: Dict[str, dict], prefer: str = 'ours') -> Iterator[Tuple[Tuple[str, ...], object]]:
+    """
+    Filter merged sorted (key parts, value) pairs so no key is both a leaf and
+    an object, which nested JSON cannot hold. An empty object followed by keys
+    inside it is dropped; a leaf value followed by keys inside it is a
+    'leaf_object' conflict, resolved with the preferred side: its leaf if it
+    has one (prefer_keys), otherwise the object.
+    """
+    pending = None
+    skip_under = None
+    for key, value in items:
+        if skip_under is not None and key[:len(skip_under)] == skip_under:
+            continue
+        skip_under = None
+        if pending is not None:
+            pending_key, pending_value = pending
+            if key[:len(pending_key)] != pending_key:
+                yield pending
+            elif pending_value != {}:
+                conflicts.append({
+                    'key': '.'.join(pending_key),
+                    'type': 'leaf_object',
+                    'base': _lookup(sides['base'], pending_key),
+                    'ours': _lookup(sides['ours'], pending_key),
+                    'theirs': _lookup(sides['theirs'], pending_key),
+                    'resolved_with': prefer
+                })
+                if pending_key in prefer_keys:
+                    pending = None
+                    skip_under = pending_key
+                    yield pending_key, pending_value
+                    continue
+        pending = (key, value)
+    if pending is not None:
+        yield pending
+
+
+def _next(iterator: Iterator):
+    return next(iterator, (None, MISSING))
+
+
+def three_way_merge(base: Iterable, ours: Iterable, theirs: Iterable,
+                    conflicts: List[Dict], prefer: str = 'ours') -> Iterator[Tuple[Tuple[str, ...], object]]:
+    """
+    Merge three sorted (key parts, value) streams in one linear pass.
+    Yields merged (key parts, value) pairs in sorted order and appends a
+    report entry to `conflicts` for every key changed differently on both sides.
+    """
+    base_it, ours_it, theirs_it = iter(base), iter(ours), iter(theirs)
+    base_key, base_value = _next(base_it)
+    ours_key, ours_value = _next(ours_it)
+    theirs_key, theirs_value = _next(theirs_it)
+
+    while base_key is not None or ours_key is not None or theirs_key is not None:
+        key = min(k for k in (base_key, ours_key, theirs_key) if k is not None)
+
+        b = base_value if base_key == key else MISSING
+        o = ours_value if ours_key == key else MISSING
+        t = theirs_value if theirs_key == key else MISSING
+
+        if o == t or t == b:
+            merged = o
+        elif o == b:
+            merged = t
+        else:
+            if b is MISSING:
+                conflict_type = 'both_added'
+            elif o is MISSING or t is MISSING:
+                conflict_type = 'modify_delete'
+            else:
+                conflict_type = 'both_modified'
+            conflicts.append({
+                'key': '.'.join(key),
+                'type': conflict_type,
+                'base': None if b is MISSING else b,
+                'ours': None if o is MISSING else o,
+                'theirs': None if t is MISSING else t,
+                'resolved_with': prefer
+            })
+            merged = t if prefer == 'theirs' else o
+
+        if merged is not MISSING:
+            yield key, merged
+
+        if base_key == key:
+            base_key, base_value = _next(base_it)
+        if ours_key == key:
+            ours_key, ours_value = _next(ours_it)
+        if theirs_key == key:
+            theirs_key, theirs_value = _next(theirs_it)
+
+
+def write_nested_json(file_path: Path, items: Iterable, indent: int = 2) -> int:
+    """
+    Stream sorted (key parts, value) pairs to a nested JSON file without
+    building the nested dict. Returns the number of keys written.
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+    count = 0
+
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('{')
+        open_path = ()
+        first_in_level = [True]
+
+        def pad(depth):
+            return '\n' + ' ' * (indent * depth)
+
+        for key, value in items:
+            parents = key[:-1]
+            # Close objects that are not ancestors of this key
+            common = 0
+            while common < len(open_path) and common < len(parents) and open_path[common] == parents[common]:
+                common += 1
+            while len(open_path) > common:
+                open_path = open_path[:-1]
+                first_in_level.pop()
+                f.write(pad(len(open_path) + 1) + '}')
+            # Open objects down to this key's parent
+            while len(open_path) < len(parents):
+                name = parents[len(open_path)]
+                f.write(('' if first_in_level[-1] else ',') + pad(len(open_path) + 1))
+                f.write(json.dumps(name, ensure_ascii=False) + ': {')
+                first_in_level[-1] = False
+                open_path = open_path + (name,)
+                first_in_level.append(True)
+            f.write(('' if first_in_level[-1] else ',') + pad(len(open_path) + 1))
+            f.write(json.dumps(key[-1], ensure_ascii=False) + ': ' +
+                    json.dumps(value, ensure_ascii=False))
+            first_in_level[-1] = False
+            count += 1
+
+        while open_path:
+            open_path = open_path[:-1]
+            f.write(pad(len(open_path) + 1) + '}')
+        f.write('\n}\n' if count else '}\n')
+
+    os.replace(tmp_path, file_path)
+    return count
+
+
+def merge_files(base_file: Path, ours_file: Path, theirs_file: Path,
+                output_file: Path, prefer: str = 'ours') -> Dict[str, any]:
+    """
+    Three-way merge translation files and write the result. Nothing is
+    written if an input cannot be parsed ('success' False, with 'error').
+    """
+    try:
+        sides = {'base': load_translations(base_file),
+                 'ours': load_translations(ours_file),
+                 'theirs': load_translations(theirs_file)}
+    except (OSError, ValueError) as e:
+        return {'success': False, 'error': str(e), 'output_file': str(output_file),
+                'key_count': 0, 'conflicts': [], 'conflict_count': 0}
+    base, ours, theirs = (sorted_flat_items(sides[side]) for side in ('base', 'ours', 'theirs'))
+    prefer_keys = {key for key, _ in (theirs if prefer == 'theirs' else ours)}
+
+    conflicts = []
+    merged = three_way_merge(base, ours, theirs, conflicts, prefer)
+    written = write_nested_json(
+        output_file, resolve_structure(merged, conflicts, prefer_keys, sides, prefer))
+
+    return {
+        'success': True,
+        'output_file': str(output_file),
+        'key_count': written,
+        'conflicts': conflicts,
+        'conflict_count': len(conflicts)
+    }
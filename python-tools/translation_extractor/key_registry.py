@@ -0,0 +1,114 @@
+"""
+Shared registry mapping hardcoded texts to translation keys for a whole run.
+"""
+import json
+from pathlib import Path
+from typing import Dict
+
+from utils import suggest_translation_key, save_json_file
+
+REGISTRY_VERSION = 1
+
+
+class KeyRegistry:
+    """Intern normalized text -> key so one text always maps to one key"""
+
+    def __init__(self):
+        self._text_keys: Dict[str, str] = {}
+        self._key_texts: Dict[str, str] = {}
+        self._reserved = set()
+        self._next_suffix: Dict[str, int] = {}
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Collapse whitespace so formatting differences share one key"""
+        return ' '.join(text.split())
+
+    def __len__(self) -> int:
+        return len(self._text_keys)
+
+    def __contains__(self, text: str) -> bool:
+        return self.normalize_text(text) in self._text_keys
+
+    def _is_taken(self, key: str) -> bool:
+        return key in self._key_texts or key in self._reserved
+
+    def reserve(self, key: str):
+        """Mark a key as used by something outside the registry"""
+        if key not in self._key_texts:
+            self._reserved.add(key)
+
+    def key_for(self, text: str) -> str:
+        """Get the key for a text, assigning a new unique key on first sight"""
+        normalized = self.normalize_text(text)
+        key = self._text_keys.get(normalized)
+        if key is not None:
+            return key
+
+        base = suggest_translation_key(normalized)
+        key = base
+        if self._is_taken(key):
+            # Collisions get the next free numeric suffix for this base
+            suffix = self._next_suffix.get(base, 2)
+            while self._is_taken(f"{base}{suffix}"):
+                suffix += 1
+            key = f"{base}{suffix}"
+            self._next_suffix[base] = suffix + 1
+
+        self._text_keys[normalized] = key
+        self._key_texts[key] = normalized
+        return key
+
+    def seed_from_snapshot(self, snapshot, namespace: str = None):
+        """
+        Reuse keys from an existing locale file: texts already translated in
+        the namespace map to their key, and every existing key name is reserved.
+        """
+        prefix = f"{namespace}." if namespace else ''
+        for key, value in snapshot.items():
+            if not key.startswith(prefix):
+                self.reserve(key.split('.')[-1])
+                continue
+            name = key[len(prefix):]
+            normalized = self.normalize_text(value)
+            if '.' in name or not normalized:
+                self.reserve(name.split('.')[-1])
+                continue
+            # The locale file wins over mappings loaded from a previous run
+            if self._key_texts.get(name, normalized) != normalized:
+                del self._text_keys[self._key_texts.pop(name)]
+            previous_key = self._text_keys.get(normalized)
+            if previous_key is not None and previous_key != name:
+                del self._key_texts[previous_key]
+            self._text_keys[normalized] = name
+            self._key_texts[name] = normalized
+            self._reserved.discard(name)
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            'version': REGISTRY_VERSION,
+            'keys': dict(self._text_keys),
+            'reserved': sorted(self._reserved)
+        }
+
+    @classmethod
+    def load(cls, file_path: Path) -> 'KeyRegistry':
+        """Load a registry saved by a previous run, or start an empty one"""
+        registry = cls()
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return registry
+        if data.get('version') != REGISTRY_VERSION:
+            return registry
+        for text, key in data.get('keys', {}).items():
+            registry._text_keys[text] = key
+            registry._key_texts[key] = text
+        for key in data.get('reserved', []):
+            registry.reserve(key)
+        return registry
+
+    def save(self, file_path: Path) -> bool:
+        """Save the registry so later runs keep the same keys"""
+        return save_json_file(file_path, self.to_dict())
@@ -0,0 +1,245 @@
+"""
+Compiled binary snapshots of locale JSON files.
+
+A snapshot is a single file holding a sorted table of every key path in a
+locale file (leaves and nested objects) plus a sorted table of leaf names,
+with all strings stored in one blob. It is opened with mmap, so existence
+checks are a binary search over the mapped table instead of a full JSON parse.
+Snapshots are rebuilt automatically when the JSON file's mtime or size changes.
+"""
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from utils import load_json_file
+
+SNAPSHOT_DIR_NAME = '.translation-cache'
+
+_MAGIC = b'TKSNAP01'
+# magic, source mtime_ns, source size, node count, leaf count, leaf name count
+_HEADER = struct.Struct('<8sqqIII4x')
+# key offset, key length, value offset, value length, kind
+_NODE = struct.Struct('<IIIIB3x')
+# name offset, name length
+_NAME = struct.Struct('<II')
+
+_KIND_LEAF = 0
+_KIND_BRANCH = 1
+
+
+def _collect_nodes(data: dict, prefix: str, nodes: list):
+    """Collect (key, kind, value) for every path in a nested dict"""
+    for key, value in data.items():
+        full_key = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            nodes.append((full_key, _KIND_BRANCH, ''))
+            _collect_nodes(value, full_key, nodes)
+        else:
+            nodes.append((full_key, _KIND_LEAF, str(value)))
+
+
+def build_snapshot(data: dict, mtime_ns: int = 0, size: int = 0) -> bytes:
+    """Compile a translations dict into snapshot bytes"""
+    nodes = []
+    if isinstance(data, dict):
+        _collect_nodes(data, '', nodes)
+
+    encoded = sorted(
+        ((key.encode('utf-8'), kind, value.encode('utf-8')) for key, kind, value in nodes),
+        key=lambda node: node[0]
+    )
+    leaf_names = sorted({
+        key.rsplit(b'.', 1)[-1] for key, kind, _ in encoded if kind == _KIND_LEAF
+    })
+    leaf_count = sum(1 for _, kind, _ in encoded if kind == _KIND_LEAF)
+
+    blob = bytearray()
+    node_table = bytearray()
+    for key, kind, value in encoded:
+        key_off = len(blob)
+        blob += key
+        value_off = len(blob)
+        blob += value
+        node_table += _NODE.pack(key_off, len(key), value_off, len(value), kind)
+
+    name_table = bytearray()
+    for name in leaf_names:
+        name_table += _NAME.pack(len(blob), len(name))
+        blob += name
+
+    header = _HEADER.pack(_MAGIC, mtime_ns, size, len(encoded), leaf_count, len(leaf_names))
+    return bytes(header + node_table + name_table + blob)
+
+
+class LocaleSnapshot:
+    """Read-only view over a compiled locale snapshot"""
+
+    def __init__(self, buffer, file_handle=None):
+        self._buffer = buffer
+        self._file = file_handle
+        magic, self.source_mtime_ns, self.source_size, self._node_count, \
+            self._leaf_count, self._name_count = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC:
+            raise ValueError("Not a locale snapshot")
+        self._nodes_start = _HEADER.size
+        self._names_start = self._nodes_start + self._node_count * _NODE.size
+        self._blob_start = self._names_start + self._name_count * _NAME.size
+
+    @classmethod
+    def snapshot_path_for(cls, json_path: Path, cache_dir: Path = None) -> Path:
+        """Get the snapshot file path used for a locale JSON file"""
+        cache_dir = cache_dir or json_path.parent / SNAPSHOT_DIR_NAME
+        return cache_dir / f"{json_path.stem}.snap"
+
+    @classmethod
+    def open(cls, json_path: Path, cache_dir: Path = None) -> 'LocaleSnapshot':
+        """Open the snapshot for a locale JSON file, rebuilding it if stale"""
+        json_path = Path(json_path)
+        try:
+            stat = json_path.stat()
+        except OSError:
+            return cls(build_snapshot({}))
+
+        snapshot_path = cls.snapshot_path_for(json_path, cache_dir)
+        snapshot = cls._open_mapped(snapshot_path)
+        if snapshot is not None:
+            if (snapshot.source_mtime_ns == stat.st_mtime_ns
+                    and snapshot.source_size == stat.st_size):
+                return snapshot
+            snapshot.close()
+
+        data = build_snapshot(load_json_file(json_path), stat.st_mtime_ns, stat.st_size)
+        if cls._write(snapshot_path, data):
+            snapshot = cls._open_mapped(snapshot_path)
+            if snapshot is not None:
+                return snapshot
+        # Cache directory not writable: serve the compiled table from memory
+        return cls(data)
+
+    @classmethod
+    def _open_mapped(cls, snapshot_path: Path) -> Optional['LocaleSnapshot']:
+        """Map an existing snapshot file, return None if missing or corrupt"""
+        try:
+            f = open(snapshot_path, 'rb')
+        except OSError:
+            return None
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return cls(buffer, f)
+        except (ValueError, OSError, struct.error):
+            f.close()
+            return None
+
+    @staticmethod
+    def _write(snapshot_path: Path, data: bytes) -> bool:
+        """Atomically write snapshot bytes, return True on success"""
+        tmp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+        try:
+            snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, snapshot_path)
+            return True
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
+
+    def close(self):
+        """Release the mapping and file handle"""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._leaf_count
+
+    def _node(self, index: int) -> Tuple[bytes, int, int, int]:
+        """Return (key bytes, value offset, value length, kind) for a node"""
+        key_off, key_len, value_off, value_len, kind = _NODE.unpack_from(
+            self._buffer, self._nodes_start + index * _NODE.size)
+        start = self._blob_start + key_off
+        return self._buffer[start:start + key_len], value_off, value_len, kind
+
+    def _name(self, index: int) -> bytes:
+        name_off, name_len = _NAME.unpack_from(
+            self._buffer, self._names_start + index * _NAME.size)
+        start = self._blob_start + name_off
+        return self._buffer[start:start + name_len]
+
+    def _find_node(self, key: str) -> int:
+        """Binary search the node table, return index or -1"""
+        target = key.encode('utf-8')
+        lo, hi = 0, self._node_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._node(mid)[0] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._node_count and self._node(lo)[0] == target:
+            return lo
+        return -1
+
+    def has_node(self, key: str) -> bool:
+        """Check if a key path exists as a value or a nested object"""
+        return self._find_node(key) != -1
+
+    def contains(self, key: str) -> bool:
+        """Check if a key path exists as a leaf value"""
+        index = self._find_node(key)
+        return index != -1 and self._node(index)[3] == _KIND_LEAF
+
+    def has_leaf_name(self, name: str) -> bool:
+        """Check if any leaf key ends with the given key name"""
+        target = name.encode('utf-8')
+        lo, hi = 0, self._name_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < self._name_count and self._name(lo) == target
+
+    def get(self, key: str, default: str = None) -> Optional[str]:
+        """Get the string value of a leaf key"""
+        index = self._find_node(key)
+        if index == -1:
+            return default
+        _, value_off, value_len, kind = self._node(index)
+        if kind != _KIND_LEAF:
+            return default
+        start = self._blob_start + value_off
+        return self._buffer[start:start + value_len].decode('utf-8')
+
+    def keys(self) -> Iterator[str]:
+        """Iterate over all leaf keys in sorted order"""
+        for index in range(self._node_count):
+            key, _, _, kind = self._node(index)
+            if kind == _KIND_LEAF:
+                yield key.decode('utf-8')
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """Iterate over (key, value) for all leaves in sorted order"""
+        for index in range(self._node_count):
+            key, value_off, value_len, kind = self._node(index)
+            if kind == _KIND_LEAF:
+                start = self._blob_start + value_off
+                yield key.decode('utf-8'), self._buffer[start:start + value_len].decode('utf-8')
+
+    def key_names(self) -> List[str]:
+        """Return all distinct leaf key names"""
+        return [self._name(i).decode('utf-8') for i in range(self._name_count)]
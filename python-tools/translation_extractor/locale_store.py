@@ -0,0 +1,235 @@
+"""
+Locale translations stored as one file or split per namespace.
+
+Two layouts are supported:
+- monolithic: <translation_dir>/<locale>.json holds every key
+- split: <translation_dir>/<locale>/<namespace>.json holds the keys of one
+  namespace; key "common.save" lives in common.json as "save"
+
+In the split layout each namespace file gets its own LocaleSnapshot, opened
+on first use, and writes rewrite only the namespace files they touch.
+"""
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from locale_snapshot import LocaleSnapshot
+from utils import load_json_file, save_json_file, get_nested_value, set_nested_value
+
+LAYOUTS = ('auto', 'monolithic', 'split')
+# Namespace file for keys without a namespace in the split layout
+DEFAULT_NAMESPACE = 'common'
+
+
+def detect_layout(translation_dir: Path, locale: str) -> str:
+    """'split' if only a <locale>/ directory exists, 'monolithic' otherwise"""
+    if not (translation_dir / f"{locale}.json").is_file() and (translation_dir / locale).is_dir():
+        return 'split'
+    return 'monolithic'
+
+
+def discover_locales(translation_dir: Path) -> List[str]:
+    """Locales found in translation_dir, in either layout"""
+    if not translation_dir.is_dir():
+        return []
+    locales = set()
+    for path in translation_dir.iterdir():
+        if path.suffix == '.json' and path.is_file():
+            locales.add(path.stem)
+        elif path.is_dir() and any(path.glob('*.json')):
+            locales.add(path.name)
+    return sorted(locales)
+
+
+class LocaleStore:
+    """Read and write one locale's translations, whichever layout it uses"""
+
+    def __init__(self, translation_dir: Path, locale: str = 'en', layout: str = 'auto',
+                 default_namespace: str = DEFAULT_NAMESPACE):
+        self.translation_dir = Path(translation_dir)
+        self.locale = locale
+        self.layout = detect_layout(self.translation_dir, locale) if layout == 'auto' else layout
+        self.default_namespace = default_namespace
+        self._snapshots: Dict[Optional[str], LocaleSnapshot] = {}
+        self._namespaces: Optional[List[str]] = None
+
+    @property
+    def is_split(self) -> bool:
+        return self.layout == 'split'
+
+    @property
+    def locale_path(self) -> Path:
+        """The locale's JSON file, or its namespace directory in the split layout"""
+        if self.is_split:
+            return self.translation_dir / self.locale
+        return self.translation_dir / f"{self.locale}.json"
+
+    def file_for(self, namespace: Optional[str]) -> Path:
+        if self.is_split:
+            return self.locale_path / f"{namespace}.json"
+        return self.locale_path
+
+    def namespaces(self) -> List[str]:
+        """Namespace files present in the split layout (empty for a monolithic file)"""
+        if not self.is_split:
+            return []
+        if self._namespaces is None:
+            self._namespaces = sorted(path.stem for path in self.locale_path.glob('*.json'))
+        return self._namespaces
+
+    def locate(self, key: str) -> Tuple[Optional[str], str]:
+        """Split a key into (namespace file, key inside that file)"""
+        if not self.is_split:
+            return None, key
+        if '.' in key:
+            namespace, inner_key = key.split('.', 1)
+            return namespace, inner_key
+        return self.default_namespace, key
+
+    def snapshot(self, namespace: Optional[str] = None) -> LocaleSnapshot:
+        """Snapshot of one namespace file (or of the monolithic file), opened on first use"""
+        if not self.is_split:
+            namespace = None
+        snapshot = self._snapshots.get(namespace)
+        if snapshot is None:
+            snapshot = LocaleSnapshot.open(self.file_for(namespace))
+            self._snapshots[namespace] = snapshot
+        return snapshot
+
+    def scope(self, namespace: str = None):
+        """
+        What a namespace-level query should look at: the namespace's own file
+        (with keys relative to it) in the split layout, otherwise the whole
+        store. A monolithic file holds every namespace, so its scope is the file.
+        """
+        if namespace and self.is_split:
+            return self.snapshot(namespace)
+        return self
+
+    def close(self):
+        for snapshot in self._snapshots.values():
+            snapshot.close()
+        self._snapshots.clear()
+
+    def __enter__(self) -> 'LocaleStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _forget(self, namespace: Optional[str]):
+        """Drop a namespace's snapshot and file list after it was rewritten"""
+        snapshot = self._snapshots.pop(namespace if self.is_split else None, None)
+        if snapshot is not None:
+            snapshot.close()
+        self._namespaces = None
+
+    def refresh(self) -> bool:
+        """Drop snapshots whose JSON file changed on disk, for long-lived stores; True if any did"""
+        changed = False
+        for namespace, snapshot in list(self._snapshots.items()):
+            try:
+                stat = self.file_for(namespace).stat()
+                current = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                # Missing files are served as an empty snapshot with a zeroed header
+                current = (0, 0)
+            if current != (snapshot.source_mtime_ns, snapshot.source_size):
+                self._forget(namespace)
+                changed = True
+        if self.is_split:
+            namespaces = self._namespaces
+            self._namespaces = None
+            changed = changed or namespaces != self.namespaces()
+        return changed
+
+    # Read access, with full keys in both layouts
+
+    def has_node(self, key: str) -> bool:
+        """True if the key is a value or a nested object (a namespace file in the split layout)"""
+        if not self.is_split:
+            return self.snapshot().has_node(key)
+        if '.' not in key and key in self.namespaces():
+            return True
+        namespace, inner_key = self.locate(key)
+        if namespace not in self.namespaces():
+            return False
+        return self.snapshot(namespace).has_node(inner_key)
+
+    def has_leaf_name(self, name: str) -> bool:
+        if not self.is_split:
+            return self.snapshot().has_leaf_name(name)
+        return any(self.snapshot(namespace).has_leaf_name(name) for namespace in self.namespaces())
+
+    def get(self, key: str, default: str = None) -> Optional[str]:
+        namespace, inner_key = self.locate(key)
+        if self.is_split and namespace not in self.namespaces():
+            return default
+        return self.snapshot(namespace).get(inner_key, default)
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """(full key, value) for every leaf"""
+        if not self.is_split:
+            yield from self.snapshot().items()
+            return
+        for namespace in self.namespaces():
+            for key, value in self.snapshot(namespace).items():
+                yield f"{namespace}.{key}", value
+
+    def keys(self) -> Iterator[str]:
+        for key, _ in self.items():
+            yield key
+
+    def __len__(self) -> int:
+        if not self.is_split:
+            return len(self.snapshot())
+        return sum(len(self.snapshot(namespace)) for namespace in self.namespaces())
+
+    # Writes
+
+    def group_keys(self, keys: Iterable[str]) -> Dict[Optional[str], List[Tuple[str, str]]]:
+        """Group keys by the file they belong to, as (full key, key inside the file)"""
+        groups: Dict[Optional[str], List[Tuple[str, str]]] = {}
+        for key in keys:
+            namespace, inner_key = self.locate(key)
+            groups.setdefault(namespace, []).append((key, inner_key))
+        return groups
+
+    def add_entries(self, entries: Dict[str, str]) -> Dict[str, any]:
+        """
+        Add key/value pairs that are not present yet. Each affected file is
+        loaded and saved once; files with nothing to add are not touched.
+        """
+        added_keys = []
+        skipped_keys = []
+        written_files = []
+        success = True
+
+        for namespace, group in sorted(self.group_keys(entries).items(), key=lambda item: item[0] or ''):
+            file_path = self.file_for(namespace)
+            translations = load_json_file(file_path)
+            added_before = len(added_keys)
+            for key, inner_key in group:
+                if get_nested_value(translations, inner_key) is None:
+                    set_nested_value(translations, inner_key, entries[key])
+                    added_keys.append(key)
+                else:
+                    skipped_keys.append(key)
+            if len(added_keys) > added_before:
+                success = save_json_file(file_path, translations) and success
+                written_files.append(file_path)
+                self._forget(namespace)
+
+        return {
+            'success': success,
+            'added_keys': added_keys,
+            'skipped_keys': skipped_keys,
+            'added_count': len(added_keys),
+            'skipped_count': len(skipped_keys),
+            'files': written_files
+        }
+
+    def files(self) -> List[Path]:
+        """Every JSON file of this locale"""
+        if self.is_split:
+            return [self.file_for(namespace) for namespace in self.namespaces()]
+        return [self.locale_path]
@@ -0,0 +1,91 @@
+"""
+Progress reporting and cancellation for long scans.
+
+Directory-level APIs accept:
+- progress: callable receiving a dict with files_done, files_total,
+  bytes_done and hits (plus the current file)
+- cancel: CancellationToken checked between files; a cancelled scan
+  raises ScanCancelled
+"""
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class ScanCancelled(Exception):
+    """Raised when a scan stops because its CancellationToken was cancelled"""
+
+
+class CancellationToken:
+    """Thread-safe flag shared between the code that cancels and the scan"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise ScanCancelled("Scan cancelled")
+
+
+def throttled(callback: Optional[Callable[[Dict], None]], interval: float = 0.1):
+    """Wrap a progress callback so it runs at most once per interval, and always for the last file"""
+    if callback is None:
+        return None
+    last_call = [0.0]
+
+    def report(progress: Dict):
+        now = time.monotonic()
+        if now - last_call[0] >= interval or progress['files_done'] >= progress['files_total']:
+            last_call[0] = now
+            callback(progress)
+    return report
+
+
+def format_progress(progress: Dict) -> str:
+    return (f"{progress['files_done']}/{progress['files_total']} files, "
+            f"{progress['bytes_done'] / (1024 * 1024):.1f} MB, {progress['hits']} hits")
+
+
+class TextProgressBar:
+    """Single-line progress bar on stderr; does nothing when stderr is not a terminal"""
+
+    def __init__(self, label: str = 'Scanning', stream=None, width: int = 30):
+        self.label = label
+        self.stream = stream or sys.stderr
+        self.width = width
+        self.enabled = hasattr(self.stream, 'isatty') and self.stream.isatty()
+        self._report = throttled(self._draw)
+        self._drawn = False
+
+    def __call__(self, progress: Dict):
+        if self.enabled:
+            self._report(progress)
+
+    def _draw(self, progress: Dict):
+        total = progress['files_total'] or 1
+        filled = int(self.width * progress['files_done'] / total)
+        bar = '#' * filled + '-' * (self.width - filled)
+        self.stream.write(f"\r{self.label} [{bar}] {format_progress(progress)}\x1b[K")
+        self.stream.flush()
+        self._drawn = True
+
+    def __enter__(self) -> 'TextProgressBar':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Move past the bar so later output starts on a new line"""
+        if self._drawn:
+            self.stream.write('\n')
+            self.stream.flush()
+            self._drawn = False
@@ -0,0 +1,109 @@
+"""
+Virtualized, read-only results view for the translation extractor GUI.
+
+All result lines live in a Python list; only the rows that fit in the widget
+are inserted into the Text widget, and scrolling re-renders that window.
+Showing 50k lines costs about the same as showing 50.
+"""
+import tkinter as tk
+from tkinter import font as tkfont
+from typing import Iterable
+
+
+class VirtualResultsView(tk.Frame):
+    """Scrollable line list that only renders its visible rows"""
+
+    def __init__(self, master, font=("Consolas", 9), bg="#1e1e1e", fg="#ffffff",
+                 border_color="#3c3c3c", width=80, height=15):
+        super().__init__(master, bg=bg, highlightthickness=1,
+                         highlightbackground=border_color, highlightcolor=border_color)
+        self.lines = []
+        self.first = 0
+        # Keep showing the newest lines until the user scrolls up
+        self.follow = True
+        self._render_pending = False
+
+        self.text = tk.Text(self, font=font, bg=bg, fg=fg, wrap='none', width=width, height=height,
+                            relief='flat', borderwidth=0, highlightthickness=0,
+                            insertbackground=fg, cursor='arrow')
+        self.y_scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.x_scrollbar = tk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.text.xview)
+        self.text.configure(xscrollcommand=self.x_scrollbar.set, state='disabled')
+
+        self.y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self._line_height = max(1, tkfont.Font(font=font).metrics('linespace'))
+
+        self.text.bind('<Configure>', lambda event: self._schedule_render())
+        self.text.bind('<MouseWheel>', self._on_mousewheel)
+        self.text.bind('<Button-4>', lambda event: self._scroll_by(-3))
+        self.text.bind('<Button-5>', lambda event: self._scroll_by(3))
+        self.text.bind('<Prior>', lambda event: self._scroll_by(-self.visible_rows()))
+        self.text.bind('<Next>', lambda event: self._scroll_by(self.visible_rows()))
+        self.text.bind('<Home>', lambda event: self._scroll_to(0))
+        self.text.bind('<End>', lambda event: self._scroll_to(len(self.lines)))
+
+    def visible_rows(self) -> int:
+        return max(1, self.text.winfo_height() // self._line_height)
+
+    def clear(self):
+        self.lines = []
+        self.first = 0
+        self.follow = True
+        self._schedule_render()
+
+    def append(self, lines: Iterable[str]):
+        """Add lines; the view is re-rendered once per event loop turn, not per line"""
+        self.lines.extend(lines)
+        self._schedule_render()
+
+    def append_text(self, text: str):
+        """Add text that may hold several lines"""
+        self.append(text.rstrip('\n').split('\n'))
+
+    def _max_first(self) -> int:
+        return max(0, len(self.lines) - self.visible_rows())
+
+    def _scroll_to(self, first: int):
+        self.first = min(max(0, first), self._max_first())
+        self.follow = self.first >= self._max_first()
+        self._schedule_render()
+        return 'break'
+
+    def _scroll_by(self, rows: int):
+        return self._scroll_to(self.first + rows)
+
+    def _on_mousewheel(self, event):
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self._scroll_to(int(float(amount) * len(self.lines)))
+        elif action == 'scroll':
+            step = self.visible_rows() if unit == 'pages' else 1
+            self._scroll_by(int(amount) * step)
+
+    def _schedule_render(self):
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def _render(self):
+        self._render_pending = False
+        rows = self.visible_rows()
+        if self.follow:
+            self.first = self._max_first()
+        self.first = min(self.first, self._max_first())
+
+        self.text.configure(state='normal')
+        self.text.delete('1.0', tk.END)
+        self.text.insert('1.0', '\n'.join(self.lines[self.first:self.first + rows]))
+        self.text.configure(state='disabled')
+
+        total = len(self.lines)
+        if total:
+            self.y_scrollbar.set(self.first / total, min(1.0, (self.first + rows) / total))
+        else:
+            self.y_scrollbar.set(0.0, 1.0)
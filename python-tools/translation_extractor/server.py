@@ -0,0 +1,325 @@
+"""
+Long-lived JSON-RPC 2.0 server over stdio for editor integrations.
+
+Each message is one line of JSON on stdin; each response is one line on
+stdout. The server keeps per-file analysis results, the extraction cache and
+the locale store in memory. Before answering it re-scans only the source
+files whose mtime or size changed: files reported with didChangeFiles at
+once, and the whole tree by a stat walk at most every poll_interval seconds
+(a minute by default: editors report saves, so the walk only catches changes
+made outside the editor, such as a checkout).
+
+Methods:
+- scan {files?}: hardcoded strings by file
+- findMissing {namespace?}, findUnused {namespace?}: as the CLI commands
+- whereUsed {key}: files and lines using a key, plus its current value
+- didChangeFiles {files} (notification): files changed, e.g. on save
+- stats: number of files tracked and the last refresh
+- shutdown: answer, then stop reading
+"""
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from extractors.hardcoded_extractor import HardcodedStringExtractor
+from extractors.detection_rules import RulePipeline
+from extractors.translation_extractor import TranslationKeyExtractor
+from extractors.missing_keys_finder import MissingKeysFinder
+from extractors.unused_keys_finder import UnusedKeysFinder
+from extraction_cache import ExtractionCache
+from locale_store import LocaleStore
+from source_corpus import SourceCorpus
+from utils import get_code_files
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+# Seconds between stat walks of the whole tree
+DEFAULT_POLL_INTERVAL = 60.0
+# No translation directory configured
+NO_TRANSLATIONS = -32001
+# The project's .translation-extractor.json cannot be read
+INVALID_CONFIG = -32002
+
+
+class RpcError(Exception):
+    """An error answered to the client with a JSON-RPC error code"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def _json_default(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, Path):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class TranslationServer:
+    """Warm analysis state for one source tree, answering JSON-RPC requests"""
+
+    def __init__(self, source_dir: Path, translation_dir: Path = None, locale: str = 'en',
+                 parser: str = 'regex', layout: str = 'auto', poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 use_cache: bool = True):
+        self.source_dir = Path(source_dir)
+        self.translation_dir = Path(translation_dir) if translation_dir else None
+        self.locale = locale
+        self.layout = layout
+        self.poll_interval = poll_interval
+
+        self.key_extractor = TranslationKeyExtractor(parser=parser)
+        self.hardcoded_extractor = HardcodedStringExtractor(parser=parser)
+        self.config_error: Optional[str] = None
+        self._load_rules()
+        self.corpus = (SourceCorpus(self.source_dir)
+                       .register('extraction', self.key_extractor)
+                       .register('hardcoded', self.hardcoded_extractor))
+        self.cache = ExtractionCache.for_source_dir(self.source_dir) if use_cache else None
+        self.store = (LocaleStore(self.translation_dir, locale, layout)
+                      if self.translation_dir is not None else None)
+
+        self.file_results: Dict[str, Dict[str, any]] = {name: {} for name in self.corpus.analyzers}
+        self.file_stats: Dict[str, Tuple[int, int]] = {}
+        self.pending: Set[str] = set()
+        self.last_walk: Optional[float] = None
+        self.last_refresh = {'changed': 0, 'removed': 0, 'seconds': 0.0}
+        self.running = True
+        self._combined: Optional[Dict[str, any]] = None
+
+        self.methods = {
+            'scan': self.rpc_scan,
+            'findMissing': self.rpc_find_missing,
+            'findUnused': self.rpc_find_unused,
+            'whereUsed': self.rpc_where_used,
+            'didChangeFiles': self.rpc_did_change_files,
+            'stats': self.rpc_stats,
+            'shutdown': self.rpc_shutdown,
+        }
+
+    # State
+
+    def _load_rules(self) -> bool:
+        """
+        (Re)load the project's detection rules. On failure the error is kept
+        and answered to every request until the config is fixed.
+        """
+        try:
+            self.hardcoded_extractor.rules = RulePipeline.from_project(self.source_dir)
+        except (OSError, ValueError) as e:
+            self.config_error = f"Invalid rules config: {e}"
+            return False
+        self.config_error = None
+        return True
+
+    def _relative(self, name: str) -> Optional[str]:
+        """source_dir-relative path of a code file name, or None if outside the tree"""
+        path = Path(name)
+        if not path.is_absolute():
+            path = self.source_dir / path
+        if not path.name.endswith(self.corpus.extensions):
+            return None
+        try:
+            return str(path.resolve().relative_to(self.source_dir.resolve()))
+        except ValueError:
+            return None
+
+    def refresh(self, force: bool = False) -> List[str]:
+        """
+        Re-scan changed files and forget deleted ones; returns their relative paths.
+        The whole tree is stat-walked when forced or poll_interval has passed,
+        otherwise only the files reported with didChangeFiles are checked.
+        """
+        started = time.monotonic()
+        full_walk = force or self.last_walk is None or started - self.last_walk >= self.poll_interval
+        if full_walk:
+            candidates = [str(path.relative_to(self.source_dir))
+                          for path in get_code_files(self.source_dir, self.corpus.extensions)]
+            self.last_walk = started
+        else:
+            candidates = sorted(self.pending)
+        self.pending.clear()
+
+        changed = []
+        present = set()
+        for relative_path in candidates:
+            try:
+                stat = (self.source_dir / relative_path).stat()
+            except OSError:
+                continue
+            present.add(relative_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self.file_stats.get(relative_path) != signature:
+                self.file_stats[relative_path] = signature
+                changed.append(relative_path)
+
+        checked = self.file_stats if full_walk else candidates
+        removed = [relative_path for relative_path in checked
+                   if relative_path not in present and relative_path in self.file_stats]
+        for relative_path in removed:
+            del self.file_stats[relative_path]
+            for results in self.file_results.values():
+                results.pop(relative_path, None)
+
+        if changed:
+            file_results, _ = self.corpus.collect([self.source_dir / path for path in changed], self.cache)
+            for name, results in self.file_results.items():
+                for relative_path in changed:
+                    # Files skipped or unreadable this time have no result
+                    if relative_path in file_results[name]:
+                        results[relative_path] = file_results[name][relative_path]
+                    else:
+                        results.pop(relative_path, None)
+
+        if self.cache is not None:
+            if full_walk:
+                self.cache.prune(present)
+            if changed or removed:
+                self.cache.save()
+        if changed or removed:
+            self._combined = None
+        self.last_refresh = {'changed': len(changed), 'removed': len(removed),
+                             'seconds': round(time.monotonic() - started, 4)}
+        return sorted(changed + removed)
+
+    def results(self) -> Dict[str, any]:
+        """Combined results of every analyzer, rebuilt only after files changed"""
+        if self._combined is None:
+            self._combined = self.corpus.build_results(self.file_results)
+        return self._combined
+
+    def _require_store(self) -> LocaleStore:
+        if self.store is None:
+            raise RpcError(NO_TRANSLATIONS, "Server started without --translations")
+        self.store.refresh()
+        return self.store
+
+    # Methods
+
+    def rpc_scan(self, params: Dict) -> Dict[str, any]:
+        hardcoded = self.results()['hardcoded']
+        if params.get('files') is not None:
+            wanted = {self._relative(name) for name in params['files']}
+            hardcoded = {path: strings for path, strings in hardcoded.items() if path in wanted}
+        return {
+            'files': hardcoded,
+            'fileCount': len(hardcoded),
+            'stringCount': sum(len(strings) for strings in hardcoded.values())
+        }
+
+    def rpc_find_missing(self, params: Dict) -> Dict[str, any]:
+        finder = MissingKeysFinder(self.translation_dir, self.locale, self.layout,
+                                   store=self._require_store())
+        return finder.find_missing_keys(self.results()['extraction']['all_keys'], params.get('namespace'))
+
+    def rpc_find_unused(self, params: Dict) -> Dict[str, any]:
+        finder = UnusedKeysFinder(self.translation_dir, self.locale, self.layout,
+                                  store=self._require_store())
+        return finder.find_unused_keys(self.results()['extraction']['all_keys'], params.get('namespace'))
+
+    def rpc_where_used(self, params: Dict) -> Dict[str, any]:
+        key = params.get('key')
+        if not isinstance(key, str) or not key:
+            raise RpcError(INVALID_PARAMS, "whereUsed needs a 'key' string")
+        locations = []
+        for relative_path, result in sorted(self.results()['extraction']['file_results'].items()):
+            if key not in result['keys']:
+                continue
+            # A nested key can be reported by more than one pattern on the same line
+            lines = sorted({detail['line'] for detail in result['key_details'] if detail.get('key') == key})
+            locations.extend({'file': relative_path, 'line': line} for line in lines)
+        value = self._require_store().get(key) if self.store is not None else None
+        return {'key': key, 'value': value, 'locations': locations}
+
+    def rpc_did_change_files(self, params: Dict):
+        files = params.get('files')
+        if not isinstance(files, list):
+            raise RpcError(INVALID_PARAMS, "didChangeFiles needs a 'files' list")
+        self.pending.update(path for path in map(self._relative, files) if path is not None)
+
+    def rpc_stats(self, params: Dict) -> Dict[str, any]:
+        return {'files': len(self.file_stats), 'lastRefresh': self.last_refresh}
+
+    def rpc_shutdown(self, params: Dict):
+        self.running = False
+
+    # Protocol
+
+    def handle(self, message: Dict) -> Optional[Dict]:
+        """Answer one decoded message; notifications (no id) get no response"""
+        if not isinstance(message, dict) or not isinstance(message.get('method'), str):
+            return self._error(None, INVALID_REQUEST, "Invalid request")
+        request_id = message.get('id')
+        is_notification = 'id' not in message
+        params = message.get('params') or {}
+        try:
+            method = self.methods.get(message['method'])
+            if method is None:
+                raise RpcError(METHOD_NOT_FOUND, f"Unknown method: {message['method']}")
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params must be an object")
+            # Nothing is scanned with a broken config, so results never mix rule sets
+            if (self.config_error is not None and method is not self.rpc_shutdown
+                    and not self._load_rules()):
+                raise RpcError(INVALID_CONFIG, self.config_error)
+            if method not in (self.rpc_did_change_files, self.rpc_shutdown):
+                self.refresh()
+            result = method(params)
+        except RpcError as e:
+            return None if is_notification else self._error(request_id, e.code, str(e))
+        except Exception as e:
+            return None if is_notification else self._error(request_id, INTERNAL_ERROR, str(e))
+        if is_notification:
+            return None
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+    def handle_line(self, line: str) -> Optional[str]:
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = self._error(None, PARSE_ERROR, f"Parse error: {e}")
+        else:
+            response = self.handle(message)
+        if response is None:
+            return None
+        return json.dumps(response, ensure_ascii=False, default=_json_default)
+
+    @staticmethod
+    def _error(request_id, code: int, message: str) -> Dict:
+        return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+    def serve(self, stdin, stdout):
+        """Answer messages line by line until shutdown or end of input"""
+        for line in stdin:
+            if not line.strip():
+                continue
+            response = self.handle_line(line)
+            if response is not None:
+                stdout.write(response + '\n')
+                stdout.flush()
+            if not self.running:
+                break
+        if self.store is not None:
+            self.store.close()
+
+
+def serve_stdio(server: TranslationServer):
+    """Run the server on stdin/stdout; anything else printed goes to stderr"""
+    stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+    stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', newline='\n')
+    sys.stdout = sys.stderr
+    if server.config_error is not None:
+        print(f"Translation server started without scanning: {server.config_error}", file=sys.stderr)
+    else:
+        # Warm up before the first request arrives
+        server.refresh(force=True)
+        print(f"Translation server ready: {len(server.file_stats)} files "
+              f"in {server.last_refresh['seconds']:.2f}s", file=sys.stderr)
+    server.serve(stdin, stdout)
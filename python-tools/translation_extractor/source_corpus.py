@@ -0,0 +1,308 @@
+"""
+Shared single-pass reading of source files for all analyses of a scan.
+
+Every file is read and decoded once, its line index is built once, and the
+same SourceFile is handed to each registered analyzer. An analyzer provides:
+
+- extract_from_source(source): result for one file
+- build_directory_results(file_results): combined result from {relative path: file result}
+"""
+import bisect
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils import get_code_files
+from extractors import tsx_tokenizer
+from progress import CancellationToken
+
+CODE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')
+# Files above this size are skipped unless the limit is raised
+DEFAULT_MAX_FILE_SIZE = 1024 * 1024
+# A NUL byte in this many leading bytes marks a binary file
+BINARY_SNIFF_SIZE = 8192
+# Leading bytes used to measure the average line length
+MINIFIED_SAMPLE_SIZE = 64 * 1024
+# Files with a shorter sample are never treated as minified
+MINIFIED_MIN_SAMPLE = 4096
+MINIFIED_LINE_LENGTH = 300
+MINIFIED_SUFFIXES = ('.min.js', '.min.ts', '.bundle.js', '.chunk.js')
+
+_NEWLINE_REGEX = re.compile('\n')
+
+
+class SourceFile:
+    """Decoded content of one source file with a lazily built line index"""
+
+    __slots__ = ('path', 'relative_path', 'content', 'size', 'jsx', '_line_starts', '_nodes')
+
+    def __init__(self, content: str, path: Path = None, relative_path: str = None,
+                 jsx: bool = True, size: int = 0):
+        self.path = path
+        self.relative_path = relative_path
+        self.content = content
+        # Size on disk in bytes
+        self.size = size
+        self.jsx = jsx
+        self._line_starts = None
+        self._nodes = None
+
+    @classmethod
+    def from_text(cls, content: str, jsx: bool = True, nodes: list = None) -> 'SourceFile':
+        """Wrap text that was not read from disk, optionally with its node stream"""
+        source = cls(content, jsx=jsx)
+        source._nodes = nodes
+        return source
+
+    def line_of(self, pos: int) -> int:
+        """1-based line number of an offset"""
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in _NEWLINE_REGEX.finditer(self.content)]
+        return bisect.bisect_right(self._line_starts, pos)
+
+    def column_of(self, pos: int) -> int:
+        """0-based column of an offset"""
+        line = self.line_of(pos)
+        return pos - self._line_starts[line - 1]
+
+    def nodes(self) -> List[tsx_tokenizer.Node]:
+        """tsx node stream, tokenized on first use and shared by all analyzers"""
+        if self._nodes is None:
+            self._nodes = tsx_tokenizer.tokenize_tsx(self.content, self.jsx)
+        return self._nodes
+
+
+class SourceReader:
+    """
+    Read source files for a scan, skipping files not worth scanning before
+    decoding them: binary files (NUL byte in the first block), minified
+    bundles (very long average line length) and files above max_size.
+    Invalid UTF-8 is decoded with replacement characters instead of
+    dropping the file.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_FILE_SIZE, skip_minified: bool = True,
+                 minified_line_length: int = MINIFIED_LINE_LENGTH):
+        # None disables the size limit
+        self.max_size = max_size
+        self.skip_minified = skip_minified
+        self.minified_line_length = minified_line_length
+
+    def _skip_reason(self, file_path: Path, head: bytes, size: int) -> Optional[str]:
+        """Check the first bytes of a file; None means scan it"""
+        if b'\0' in head[:BINARY_SNIFF_SIZE]:
+            return 'binary'
+        if self.skip_minified:
+            if file_path.name.endswith(MINIFIED_SUFFIXES):
+                return 'minified'
+            if len(head) >= MINIFIED_MIN_SAMPLE and \
+                    len(head) / (head.count(b'\n') + 1) > self.minified_line_length:
+                return 'minified'
+        return None
+
+    def read(self, file_path: Path) -> Dict[str, any]:
+        """
+        Read one file.
+        Returns content (None when skipped), size in bytes, skip reason and
+        whether invalid UTF-8 was replaced. Raises OSError if it cannot be read.
+        """
+        result = {'content': None, 'size': 0, 'skipped': None, 'replaced': False}
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            result['size'] = size
+            if self.max_size is not None and size > self.max_size:
+                result['skipped'] = 'too large'
+                return result
+
+            data = f.read()
+            result['skipped'] = self._skip_reason(file_path, data[:MINIFIED_SAMPLE_SIZE], size)
+            if result['skipped']:
+                return result
+            content, result['replaced'] = _decode(data)
+
+        # Universal newlines, like read_text()
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        result['content'] = content
+        return result
+
+
+def _decode(data) -> Tuple[str, bool]:
+    """Decode UTF-8, falling back to replacement characters; returns (text, replaced)"""
+    try:
+        return str(data, 'utf-8'), False
+    except UnicodeDecodeError:
+        return str(data, 'utf-8', 'replace'), True
+
+
+def read_source(file_path: Path, reader: SourceReader = None) -> Optional[str]:
+    """Read a single file like a scan would; None if it is skipped or unreadable"""
+    try:
+        return (reader or SourceReader()).read(file_path)['content']
+    except OSError:
+        return None
+
+
+class SourceCorpus:
+    """Walk a source tree once and run every registered analyzer on each file"""
+
+    def __init__(self, directory: Path, extensions: tuple = CODE_EXTENSIONS, reader: SourceReader = None):
+        self.directory = directory
+        self.extensions = extensions
+        self.reader = reader if reader is not None else SourceReader()
+        self.analyzers: Dict[str, object] = {}
+
+    def register(self, name: str, analyzer) -> 'SourceCorpus':
+        """Add an analyzer; its combined result is stored under name"""
+        self.analyzers[name] = analyzer
+        return self
+
+    def read_source_file(self, file_path: Path, relative_path: str) -> Tuple[Optional[SourceFile], Dict]:
+        """
+        Read one file through the reader. Returns (SourceFile, read result);
+        the SourceFile is None when the file was skipped or could not be read.
+        """
+        try:
+            read = self.reader.read(file_path)
+        except OSError as e:
+            return None, {'file': relative_path, 'error': str(e), 'size': 0}
+        read['file'] = relative_path
+        if read['content'] is None:
+            return None, read
+        return SourceFile(read.pop('content'), file_path, relative_path,
+                          tsx_tokenizer.jsx_enabled_for(file_path), read['size']), read
+
+    def run(self, files: Optional[List[Path]] = None, cache=None,
+            progress: Callable[[Dict], None] = None, cancel: CancellationToken = None) -> Dict[str, any]:
+        """
+        Scan all files (or only files) in one pass.
+        cache: optional ExtractionCache; analyzers with a cache_id reuse the
+        results of unchanged files, which are then not read at all.
+        progress: called after each file with files_done, files_total, bytes_done and hits.
+        cancel: checked before each file; raises ScanCancelled once cancelled.
+        Returns each analyzer's combined result under its name, plus a scan
+        summary with the files read, cached, skipped (and bytes saved) or unreadable.
+        """
+        file_results, summary = self.collect(files, cache, progress, cancel)
+        results = self.build_results(file_results)
+        results['summary'] = summary
+        return results
+
+    def build_results(self, file_results: Dict[str, Dict[str, any]]) -> Dict[str, any]:
+        """Combine per-file results into each analyzer's directory result"""
+        return {
+            name: analyzer.build_directory_results(file_results[name])
+            for name, analyzer in self.analyzers.items()
+        }
+
+    def collect(self, files: Optional[List[Path]] = None, cache=None,
+                progress: Callable[[Dict], None] = None,
+                cancel: CancellationToken = None) -> Tuple[Dict[str, Dict[str, any]], Dict[str, any]]:
+        """Like run, but return the uncombined (per-file results by analyzer, summary)"""
+        file_results = {name: {} for name in self.analyzers}
+        summary = {
+            'files_scanned': 0,
+            'files_cached': 0,
+            'bytes_read': 0,
+            'skipped': [],
+            'bytes_skipped': 0,
+            'replaced_encoding': [],
+            'errors': []
+        }
+        cache_ids = {}
+        if cache is not None:
+            cache_ids = {name: analyzer.cache_id for name, analyzer in self.analyzers.items()
+                         if getattr(analyzer, 'cache_id', None)}
+
+        full_walk = files is None
+        if full_walk:
+            files = get_code_files(self.directory, self.extensions)
+        relative_paths = []
+        report = {'files_done': 0, 'files_total': len(files), 'bytes_done': 0, 'hits': 0, 'file': None}
+
+        for file_path in files:
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            relative_path = str(file_path.relative_to(self.directory))
+            relative_paths.append(relative_path)
+
+            size, results = self._scan_file(file_path, relative_path, summary, cache, cache_ids)
+            for name, result in results.items():
+                file_results[name][relative_path] = result
+                count_hits = getattr(self.analyzers[name], 'count_hits', None)
+                if count_hits is not None:
+                    report['hits'] += count_hits(result)
+
+            report['files_done'] += 1
+            report['bytes_done'] += size
+            report['file'] = relative_path
+            if progress is not None:
+                progress(dict(report))
+
+        if cache is not None and full_walk:
+            cache.prune(relative_paths)
+        return file_results, summary
+
+    def _scan_file(self, file_path: Path, relative_path: str, summary: Dict, cache,
+                   cache_ids: Dict[str, str]) -> Tuple[int, Dict[str, any]]:
+        """Run the analyzers on one file, from the cache when possible; returns (size, results by name)"""
+        stat = None
+        if cache_ids:
+            try:
+                stat = file_path.stat()
+            except OSError as e:
+                summary['errors'].append({'file': relative_path, 'error': str(e)})
+                return 0, {}
+        # Each analyzer is served from the cache on its own; the file is read only for the rest
+        cached = {}
+        for name, cache_id in cache_ids.items():
+            data = cache.lookup(relative_path, stat, cache_id)
+            if data is not None:
+                cached[name] = self.analyzers[name].from_cache_data(data)
+        if cached and len(cached) == len(self.analyzers):
+            summary['files_cached'] += 1
+            return stat.st_size, cached
+
+        source, read = self.read_source_file(file_path, relative_path)
+        if 'error' in read:
+            summary['errors'].append({'file': relative_path, 'error': read['error']})
+            return 0, {}
+        if source is None:
+            summary['skipped'].append({'file': relative_path, 'reason': read['skipped'],
+                                       'size': read['size']})
+            summary['bytes_skipped'] += read['size']
+            return read['size'], {}
+        summary['files_scanned'] += 1
+        summary['bytes_read'] += source.size
+        if read['replaced']:
+            summary['replaced_encoding'].append(relative_path)
+
+        results = cached
+        for name, analyzer in self.analyzers.items():
+            if name in cached:
+                continue
+            result = analyzer.extract_from_source(source)
+            results[name] = result
+            if name in cache_ids:
+                cache.store(relative_path, stat, cache_ids[name], analyzer.to_cache_data(result))
+        return source.size, results
+
+
+def format_scan_summary(summary: Dict[str, any]) -> str:
+    """One-paragraph text summary of a corpus scan"""
+    lines = [f"Scanned {summary['files_scanned']} files ({summary['bytes_read'] / 1024:.0f} KB)"]
+    if summary.get('files_cached'):
+        lines[0] += f", {summary['files_cached']} unchanged files from cache"
+    if summary['skipped']:
+        reasons = {}
+        for skipped in summary['skipped']:
+            reasons[skipped['reason']] = reasons.get(skipped['reason'], 0) + 1
+        details = ', '.join(f"{count} {reason}" for reason, count in sorted(reasons.items()))
+        lines.append(f"Skipped {len(summary['skipped'])} files ({details}), "
+                     f"{summary['bytes_skipped'] / 1024:.0f} KB not scanned")
+    if summary['replaced_encoding']:
+        lines.append(f"Replaced invalid UTF-8 in {len(summary['replaced_encoding'])} files")
+    if summary['errors']:
+        lines.append(f"Could not read {len(summary['errors'])} files")
+    return '\n'.join(lines)
@@ -1,7 +1,8 @@
 
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
 import threading
+import queue
 import json
 import sys
 import os
@@ -12,10 +13,16 @@ sys.path.insert(0, script_dir)
 
 # Now import local modules after path is set up
 from generators.translation_generator import TranslationFileGenerator
+from generators.translation_memory import TranslationMemory
 from extractors.unused_keys_finder import UnusedKeysFinder
 from extractors.missing_keys_finder import MissingKeysFinder
 from extractors.translation_extractor import TranslationKeyExtractor
 from extractors.hardcoded_extractor import HardcodedStringExtractor
+from extractors.detection_rules import RulePipeline
+from source_corpus import SourceCorpus, format_scan_summary
+from extraction_cache import ExtractionCache
+from results_view import VirtualResultsView
+from progress import CancellationToken, ScanCancelled, format_progress, throttled
 import tkinter as tk
 
 
@@ -43,52 +50,81 @@ def scan_and_analyze():
         messagebox.showerror("Error", "Translation directory does not exist")
         return
 
+    # Read the project's rules config up front so a broken one is reported, not traced
+    rules = None
+    if find_hardcoded.get():
+        try:
+            rules = RulePipeline.from_project(source_path_obj)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Invalid rules config:\n{e}")
+            return
+
     # Disable buttons during processing
+    global scan_cancel
+    scan_cancel = CancellationToken()
+    cancel = scan_cancel
     scan_btn.config(state='disabled')
     update_btn.config(state='disabled')
-    results_text.delete(1.0, tk.END)
-    results_text.insert(tk.END, "Scanning... Please wait...\n")
-    root.update()
+    cancel_btn.config(state='normal')
+    status_var.set("Starting scan...")
+    results_view.clear()
+    results_view.append_text("Scanning... Please wait...")
+
+    check_extract = extract_keys.get()
+    check_hardcoded = find_hardcoded.get()
+    check_missing = find_missing.get()
+    check_unused = find_unused.get()
+    locale = locale_var.get()
 
     def process():
+        """Worker thread: never touches Tk, only posts output to results_queue"""
+        def emit(lines):
+            if lines:
+                results_queue.put(('lines', lines))
+
+        # At most ~10 progress messages per second reach the queue
+        report_progress = throttled(lambda progress: results_queue.put(('progress', progress)))
+
         try:
             results = {}
 
+            # Read each source file once and run every selected analysis on it
+            corpus = SourceCorpus(source_path_obj)
+            if check_extract:
+                corpus.register('extraction', TranslationKeyExtractor())
+            if check_hardcoded:
+                corpus.register('hardcoded', HardcodedStringExtractor(rules=rules))
+            corpus_results = {}
+            if corpus.analyzers:
+                emit(["Reading source files..."])
+                # Unchanged files are served from the same cache the CLI uses
+                cache = ExtractionCache.for_source_dir(source_path_obj)
+                corpus_results = corpus.run(cache=cache, progress=report_progress, cancel=cancel)
+                cache.save()
+                emit(format_scan_summary(corpus_results['summary']).split('\n'))
+
             # Extract translation keys
-            if extract_keys.get():
-                results_text.insert(tk.END, "Extracting translation keys...\n")
-                root.update()
-                extractor = TranslationKeyExtractor()
-                extraction_results = extractor.extract_from_directory(
-                    source_path_obj)
+            if check_extract:
+                extraction_results = corpus_results['extraction']
                 results['extraction'] = extraction_results
-                results_text.insert(
-                    tk.END, f"Found {len(extraction_results['all_keys'])} translation keys\n")
-                root.update()
+                emit([f"Found {len(extraction_results['all_keys'])} translation keys"])
 
             # Find hardcoded strings
-            if find_hardcoded.get():
-                results_text.insert(tk.END, "Finding hardcoded strings...\n")
-                root.update()
-                hardcoded_extractor = HardcodedStringExtractor()
-                hardcoded_results = hardcoded_extractor.extract_from_directory(
-                    source_path_obj)
+            if check_hardcoded:
+                hardcoded_results = corpus_results['hardcoded']
                 total_strings = sum(len(strings)
                                     for strings in hardcoded_results.values())
                 results['hardcoded'] = hardcoded_results
-                results_text.insert(
-                    tk.END, f"Found {total_strings} hardcoded strings in {len(hardcoded_results)} files\n")
+                lines = [f"Found {total_strings} hardcoded strings in {len(hardcoded_results)} files"]
                 if hardcoded_results:
-                    results_text.insert(
-                        tk.END, "\nFiles with hardcoded strings:\n")
+                    lines += ["", "Files with hardcoded strings:"]
                     for file_path, strings in hardcoded_results.items():
-                        results_text.insert(
-                            tk.END, f"  - {file_path} ({len(strings)} strings)\n")
-                    results_text.insert(tk.END, "\nHardcoded strings found:\n")
+                        lines.append(f"  - {file_path} ({len(strings)} strings)")
+                    lines += ["", "Hardcoded strings found:"]
                     for file_path, strings in hardcoded_results.items():
-                        results_text.insert(tk.END, f"\n  File: {file_path}\n")
-                        # Show first 10 per file
-                        for string_info in strings[:10]:
+                        lines += ["", f"  File: {file_path}"]
+                        # The view is virtualized, so every string is listed
+                        for string_info in strings:
                             text = string_info.get('text', '')
                             line = string_info.get('line', '?')
                             col = string_info.get('column', '?')
@@ -97,88 +133,61 @@ def scan_and_analyze():
                             # Truncate long strings
                             display_text = text[:50] + \
                                 "..." if len(text) > 50 else text
-                            results_text.insert(
-                                tk.END, f"    Line {line}:{col} [{str_type}] \"{display_text}\"")
+                            row = f"    Line {line}:{col} [{str_type}] \"{display_text}\""
                             if suggested:
-                                results_text.insert(
-                                    tk.END, f" → key: {suggested}")
-                            results_text.insert(tk.END, "\n")
-                        if len(strings) > 10:
-                            results_text.insert(
-                                tk.END, f"    ... and {len(strings) - 10} more strings in this file\n")
-                root.update()
+                                row += f" → key: {suggested}"
+                            lines.append(row)
+                        # Post per file so the view fills while output is built
+                        emit(lines)
+                        lines = []
+                emit(lines)
 
             # Find missing keys
-            if find_missing.get():
-                results_text.insert(
-                    tk.END, f"Finding missing keys for locale '{locale_var.get()}'...\n")
-                root.update()
+            cancel.raise_if_cancelled()
+            if check_missing:
+                lines = [f"Finding missing keys for locale '{locale}'..."]
                 if 'extraction' in results:
-                    finder = MissingKeysFinder(
-                        translation_path_obj, locale_var.get())
+                    finder = MissingKeysFinder(translation_path_obj, locale)
                     missing_results = finder.find_missing_keys(
                         results['extraction']['all_keys'])
                     results['missing'] = missing_results
-                    results_text.insert(
-                        tk.END, f"Found {missing_results['missing_count']} missing keys\n")
-                    results_text.insert(
-                        tk.END, f"Total extracted keys: {missing_results['total_extracted']}\n")
-                    results_text.insert(
-                        tk.END, f"Existing keys in file: {missing_results['existing_count']}\n")
+                    lines.append(f"Found {missing_results['missing_count']} missing keys")
+                    lines.append(f"Total extracted keys: {missing_results['total_extracted']}")
+                    lines.append(f"Existing keys in file: {missing_results['existing_count']}")
                     if missing_results['missing_keys']:
-                        results_text.insert(tk.END, "\nMissing keys:\n")
-                        for key in sorted(missing_results['missing_keys'])[:20]:
-                            results_text.insert(tk.END, f"  - {key}\n")
-                        if len(missing_results['missing_keys']) > 20:
-                            results_text.insert(
-                                tk.END, f"  ... and {len(missing_results['missing_keys']) - 20} more\n")
+                        lines += ["", "Missing keys:"]
+                        for key in sorted(missing_results['missing_keys']):
+                            lines.append(f"  - {key}")
                     else:
-                        results_text.insert(
-                            tk.END, "\n✓ All keys found in translation file!\n")
-                    root.update()
+                        lines += ["", "✓ All keys found in translation file!"]
                 else:
-                    results_text.insert(
-                        tk.END, "Error: Extract keys first to find missing keys\n")
+                    lines.append("Error: Extract keys first to find missing keys")
+                emit(lines)
 
             # Find unused keys
-            if find_unused.get():
-                results_text.insert(
-                    tk.END, f"Finding unused keys for locale '{locale_var.get()}'...\n")
-                root.update()
+            cancel.raise_if_cancelled()
+            if check_unused:
+                lines = [f"Finding unused keys for locale '{locale}'..."]
                 if 'extraction' in results:
-                    finder = UnusedKeysFinder(
-                        translation_path_obj, locale_var.get())
+                    finder = UnusedKeysFinder(translation_path_obj, locale)
                     unused_results = finder.find_unused_keys(
                         results['extraction']['all_keys'])
                     results['unused'] = unused_results
-                    results_text.insert(
-                        tk.END, f"Found {unused_results['unused_count']} unused keys\n")
+                    lines.append(f"Found {unused_results['unused_count']} unused keys")
                     if unused_results['unused_keys']:
-                        results_text.insert(tk.END, "\nUnused keys:\n")
-                        for detail in unused_results['unused_details'][:20]:
-                            results_text.insert(
-                                tk.END, f"  - {detail['key']}\n")
-                        if len(unused_results['unused_keys']) > 20:
-                            results_text.insert(
-                                tk.END, f"  ... and {len(unused_results['unused_keys']) - 20} more\n")
-                    root.update()
+                        lines += ["", "Unused keys:"]
+                        for detail in unused_results['unused_details']:
+                            lines.append(f"  - {detail['key']}")
                 else:
-                    results_text.insert(
-                        tk.END, "Error: Extract keys first to find unused keys\n")
-
-            # Store results for update button
-            global scan_results
-            scan_results = results
+                    lines.append("Error: Extract keys first to find unused keys")
+                emit(lines)
 
-            results_text.insert(tk.END, "\n✓ Scan completed!\n")
-            messagebox.showinfo("Success", "Scan completed successfully!")
+            results_queue.put(('done', results))
 
+        except ScanCancelled:
+            results_queue.put(('cancelled', None))
         except Exception as e:
-            results_text.insert(tk.END, f"\n✗ Error: {str(e)}\n")
-            messagebox.showerror("Error", f"Failed to scan: {str(e)}")
-        finally:
-            scan_btn.config(state='normal')
-            update_btn.config(state='normal')
+            results_queue.put(('error', str(e)))
 
     # Run in separate thread to avoid blocking UI
     thread = threading.Thread(target=process)
@@ -186,6 +195,61 @@ def scan_and_analyze():
     thread.start()
 
 
+def finish_scan(kind: str, payload):
+    """Handle the end of a scan on the Tk main thread"""
+    global scan_results
+    if kind == 'done':
+        # Store results for update button
+        scan_results = payload
+        results_view.append(["", "✓ Scan completed!"])
+        status_var.set("Scan completed")
+        messagebox.showinfo("Success", "Scan completed successfully!")
+    elif kind == 'cancelled':
+        results_view.append(["", "✗ Scan cancelled"])
+        status_var.set("Scan cancelled")
+    else:
+        status_var.set("Scan failed")
+        results_view.append(["", f"✗ Error: {payload}"])
+        messagebox.showerror("Error", f"Failed to scan: {payload}")
+    scan_btn.config(state='normal')
+    update_btn.config(state='normal')
+    cancel_btn.config(state='disabled')
+
+
+def cancel_scan():
+    """Ask the running scan to stop after the current file"""
+    scan_cancel.cancel()
+    cancel_btn.config(state='disabled')
+    status_var.set("Cancelling...")
+
+
+def drain_results_queue():
+    """Move queued worker output into the results view in batches (Tk main thread)"""
+    lines = []
+    progress = None
+    finished = None
+    try:
+        for _ in range(DRAIN_BATCH):
+            kind, payload = results_queue.get_nowait()
+            if kind == 'lines':
+                lines.extend(payload)
+            elif kind == 'progress':
+                # Only the latest progress matters
+                progress = payload
+            else:
+                finished = (kind, payload)
+                break
+    except queue.Empty:
+        pass
+    if lines:
+        results_view.append(lines)
+    if progress and not scan_cancel.cancelled:
+        status_var.set(f"Scanning: {format_progress(progress)}")
+    if finished:
+        finish_scan(*finished)
+    root.after(DRAIN_INTERVAL_MS, drain_results_queue)
+
+
 def update_translations():
     """Update translation files with missing keys"""
     translation_dir = translation_path.get().strip()
@@ -216,14 +280,19 @@ def update_translations():
 
     try:
         translation_path_obj = Path(translation_dir)
+        memory = None
+        if auto_fill.get():
+            memory = TranslationMemory.from_directory(
+                translation_path_obj, locale, scan_results.get('hardcoded'))
         generator = TranslationFileGenerator(translation_path_obj, locale)
         update_results = generator.update_file(
-            missing_keys, auto_fill=auto_fill.get())
+            missing_keys, auto_fill=auto_fill.get(), memory=memory)
 
         if update_results['success']:
             messagebox.showinfo(
                 "Success",
-                f"Successfully updated {update_results['added_count']} keys in {locale}.json\n\n"
+                f"Successfully updated {update_results['added_count']} keys in "
+                f"{', '.join(str(path.relative_to(translation_path_obj)) for path in update_results['files']) or locale}\n\n"
                 f"Skipped {update_results['skipped_count']} keys (already exist)"
             )
         else:
@@ -248,6 +317,15 @@ def browse_translation_directory():
 
 # Initialize results storage
 scan_results = {}
+# Token of the running (or last) scan
+scan_cancel = CancellationToken()
+
+# Worker -> main loop messages: ('lines', [str]), ('progress', dict), then
+# ('done', results), ('cancelled', None) or ('error', message)
+results_queue = queue.Queue()
+DRAIN_INTERVAL_MS = 50
+# Most queue messages handled per drain, so a burst cannot stall the event loop
+DRAIN_BATCH = 500
 
 
 # Create main window
@@ -311,6 +389,7 @@ find_hardcoded = tk.BooleanVar(value=False)
 find_missing = tk.BooleanVar(value=True)
 find_unused = tk.BooleanVar(value=True)
 auto_fill = tk.BooleanVar(value=False)
+status_var = tk.StringVar(value="")
 
 # Main frame
 main_frame = ttk.Frame(root, padding="20")
@@ -392,7 +471,7 @@ find_unused_check = ttk.Checkbutton(
 find_unused_check.pack(anchor=tk.W, pady=5)
 
 auto_fill_check = ttk.Checkbutton(
-    options_inner, text="Auto-fill missing keys with default values", variable=auto_fill)
+    options_inner, text="Auto-fill missing keys from other locales and source strings", variable=auto_fill)
 auto_fill_check.pack(anchor=tk.W, pady=5)
 
 # Results area
@@ -400,14 +479,12 @@ results_label = tk.Label(main_frame, text="Results:", font=("Arial", 10, "bold")
                          bg=bg_color, fg=fg_color)
 results_label.pack(anchor=tk.W, pady=(10, 5))
 
-results_text = scrolledtext.ScrolledText(
-    main_frame, width=80, height=15, font=("Consolas", 9),
-    bg=text_bg, fg=text_fg, insertbackground=fg_color,
-    relief='flat', borderwidth=1, highlightthickness=1,
-    highlightbackground=border_color, highlightcolor=border_color)
-results_text.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
-results_text.insert(
-    1.0, "Ready to scan. Select directories and click 'Scan' to begin.\n")
+results_view = VirtualResultsView(
+    main_frame, font=("Consolas", 9), bg=text_bg, fg=text_fg,
+    border_color=border_color, width=80, height=15)
+results_view.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+results_view.append_text(
+    "Ready to scan. Select directories and click 'Scan' to begin.")
 
 # Buttons frame
 buttons_frame = ttk.Frame(main_frame)
@@ -420,5 +497,13 @@ update_btn = ttk.Button(
     buttons_frame, text="Update Translations", command=update_translations)
 update_btn.pack(side=tk.LEFT)
 
+cancel_btn = ttk.Button(buttons_frame, text="Cancel", command=cancel_scan, state='disabled')
+cancel_btn.pack(side=tk.LEFT, padx=(10, 0))
+
+status_label = tk.Label(buttons_frame, textvariable=status_var, font=("Arial", 9),
+                        bg=bg_color, fg=fg_color, anchor=tk.W)
+status_label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(15, 0))
+
 # Run the application
+root.after(DRAIN_INTERVAL_MS, drain_results_queue)
 root.mainloop()
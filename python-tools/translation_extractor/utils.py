@@ -45,7 +45,8 @@ def get_code_files(directory: Path, extensions: tuple = ('.ts', '.tsx', '.js', '
     files = []
     for ext in extensions:
         files.extend(directory.rglob(f'*{ext}'))
-    return files
+    # Stable order so key suggestions are deterministic between runs
+    return sorted(files)
 
 
 def load_json_file(file_path: Path) -> dict:
@@ -103,3 +104,16 @@ def get_all_keys(data: dict, prefix: str = '') -> set:
         else:
             keys.add(full_key)
     return keys
+
+
+def flatten_dict(data: dict, prefix: str = '', flat: dict = None) -> dict:
+    """Flatten nested dict into {dot.notation.key: value} for all leaf values"""
+    if flat is None:
+        flat = {}
+    for key, value in data.items():
+        full_key = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flatten_dict(value, full_key, flat)
+        else:
+            flat[full_key] = value
+    return flat
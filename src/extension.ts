@@ -1,8 +1,23 @@
-import { spawn } from 'child_process';
+import { ChildProcess, spawn } from 'child_process';
 import * as fs from 'fs';
 import * as path from 'path';
 import * as vscode from 'vscode';
 
+/**
+ * Finds the Python executable: the embedded runtime if it exists, otherwise system Python
+ */
+function findPythonExe(extRoot: string): string {
+    // Check for embedded Python first (optional)
+    const embeddedPython = path.join(extRoot, 'python-runtime', 'python.exe');
+    if (fs.existsSync(embeddedPython)) {
+        console.log('Using embedded Python runtime');
+        return embeddedPython;
+    }
+    // Use system Python (python.exe for GUI apps - no console window)
+    console.log('Using system Python (python)');
+    return 'python';
+}
+
 /**
  * Spawns a Python tool with the embedded Python runtime
  */
@@ -13,21 +28,7 @@ function spawnPythonTool(
 ): void {
     const extRoot = context.extensionPath;
     const scriptPath = path.join(extRoot, 'python-tools', scriptRelPath);
-
-    // Try to find Python executable
-    // First try embedded Python (if it exists), then fall back to system Python
-    let pythonExe: string | null = null;
-
-    // Check for embedded Python first (optional)
-    const embeddedPython = path.join(extRoot, 'python-runtime', 'python.exe');
-    if (fs.existsSync(embeddedPython)) {
-        pythonExe = embeddedPython;
-        console.log('Using embedded Python runtime');
-    } else {
-        // Use system Python (python.exe for GUI apps - no console window)
-        pythonExe = 'python';
-        console.log('Using system Python (python)');
-    }
+    const pythonExe = findPythonExe(extRoot);
 
     // Check if script exists
     if (!fs.existsSync(scriptPath)) {
@@ -183,6 +184,214 @@ function openSnippetViewer(context: vscode.ExtensionContext): void {
     spawnPythonTool(context, 'snippet_viewer/snippet_viewer.py');
 }
 
+/**
+ * Source directory, translation directory and locale from the workspace settings
+ */
+function translationSettings(): { sourceDir: string; translationsDir: string; locale: string } {
+    const workspaceFolder = vscode.workspace.workspaceFolders?.[0];
+    if (!workspaceFolder) {
+        throw new Error('Open a workspace folder first');
+    }
+    const config = vscode.workspace.getConfiguration('nextjsTools.translations');
+    const root = workspaceFolder.uri.fsPath;
+    return {
+        sourceDir: path.resolve(root, config.get<string>('sourceDirectory', 'src')),
+        translationsDir: path.resolve(root, config.get<string>('directory', 'messages')),
+        locale: config.get<string>('locale', 'en')
+    };
+}
+
+/**
+ * Client for the translation extractor's JSON-RPC server (`cli.py serve`).
+ * The server process stays alive between commands, so only the first request
+ * pays for Python startup and the initial scan; later ones use its warm state.
+ * Messages are one JSON object per line on stdin/stdout.
+ */
+class TranslationServerClient implements vscode.Disposable {
+    private child: ChildProcess | null = null;
+    private nextId = 1;
+    private buffer = '';
+    private readonly pending = new Map<number, { resolve: (result: any) => void; reject: (error: Error) => void }>();
+
+    constructor(
+        private readonly context: vscode.ExtensionContext,
+        private readonly output: vscode.OutputChannel
+    ) {}
+
+    /**
+     * Starts the server for the current workspace settings if it is not running
+     */
+    private start(): ChildProcess {
+        if (this.child) {
+            return this.child;
+        }
+        const settings = translationSettings();
+        const cliPath = path.join(this.context.extensionPath, 'python-tools', 'translation_extractor', 'cli.py');
+        const pythonExe = findPythonExe(this.context.extensionPath);
+        const args = [
+            cliPath, 'serve', settings.sourceDir,
+            '--translations', settings.translationsDir,
+            '--locale', settings.locale
+        ];
+
+        // Use shell: true for system Python (python) to find it in PATH; quote paths for the shell
+        const useShell = pythonExe === 'python';
+        const child = spawn(pythonExe, useShell ? args.map(arg => `"${arg}"`) : args, {
+            cwd: path.dirname(cliPath),
+            shell: useShell,
+            stdio: ['pipe', 'pipe', 'pipe']
+        });
+        // Events of a process that was already replaced (e.g. after a settings change) are ignored
+        child.stdout!.setEncoding('utf8');
+        child.stdout!.on('data', (data: string) => {
+            if (this.child === child) {
+                this.receive(data);
+            }
+        });
+        child.stderr!.on('data', (data) => this.output.append(data.toString()));
+        child.on('error', (err) => {
+            if (this.child === child) {
+                this.stop(new Error(`Failed to start translation server: ${err.message}`));
+            }
+        });
+        child.on('exit', (code) => {
+            if (this.child === child) {
+                this.stop(new Error(`Translation server exited with code ${code}`));
+            }
+        });
+        this.child = child;
+        return child;
+    }
+
+    private receive(data: string): void {
+        this.buffer += data;
+        let newline: number;
+        while ((newline = this.buffer.indexOf('\n')) >= 0) {
+            const line = this.buffer.slice(0, newline);
+            this.buffer = this.buffer.slice(newline + 1);
+            if (!line.trim()) {
+                continue;
+            }
+            let message: any;
+            try {
+                message = JSON.parse(line);
+            } catch {
+                this.output.appendLine(`Unexpected server output: ${line}`);
+                continue;
+            }
+            const request = this.pending.get(message.id);
+            if (!request) {
+                continue;
+            }
+            this.pending.delete(message.id);
+            if (message.error) {
+                request.reject(new Error(message.error.message));
+            } else {
+                request.resolve(message.result);
+            }
+        }
+    }
+
+    private stop(reason: Error): void {
+        this.child = null;
+        this.buffer = '';
+        for (const request of this.pending.values()) {
+            request.reject(reason);
+        }
+        this.pending.clear();
+    }
+
+    request<T = any>(method: string, params: object = {}): Promise<T> {
+        return new Promise<T>((resolve, reject) => {
+            let child: ChildProcess;
+            try {
+                child = this.start();
+            } catch (err) {
+                reject(err);
+                return;
+            }
+            const id = this.nextId++;
+            this.pending.set(id, { resolve, reject });
+            child.stdin!.write(JSON.stringify({ jsonrpc: '2.0', id, method, params }) + '\n');
+        });
+    }
+
+    /**
+     * Sends a notification; does nothing while the server is not running
+     */
+    notify(method: string, params: object = {}): void {
+        this.child?.stdin!.write(JSON.stringify({ jsonrpc: '2.0', method, params }) + '\n');
+    }
+
+    dispose(): void {
+        if (this.child) {
+            this.notify('shutdown');
+            this.child.stdin!.end();
+            this.stop(new Error('Translation server stopped'));
+        }
+    }
+}
+
+/**
+ * Lists the translation keys used in code but missing from the locale files
+ */
+async function findMissingTranslationKeys(client: TranslationServerClient, output: vscode.OutputChannel): Promise<void> {
+    const result = await client.request('findMissing');
+    output.clear();
+    output.appendLine(`Missing keys: ${result.missing_count} (${result.existing_count} existing, ${result.total_extracted} used in code)`);
+    for (const key of result.missing_keys) {
+        output.appendLine(`  - ${key}`);
+    }
+    output.show(true);
+}
+
+/**
+ * Lists the translation keys in the locale files that no code uses
+ */
+async function findUnusedTranslationKeys(client: TranslationServerClient, output: vscode.OutputChannel): Promise<void> {
+    const result = await client.request('findUnused');
+    output.clear();
+    output.appendLine(`Unused keys: ${result.unused_count} (${result.total_in_file} in locale files)`);
+    for (const detail of result.unused_details) {
+        output.appendLine(`  - ${detail.key}: ${detail.value}`);
+    }
+    output.show(true);
+}
+
+/**
+ * Asks for a key (the selection by default) and jumps to one of the places that use it
+ */
+async function showTranslationKeyUsages(client: TranslationServerClient): Promise<void> {
+    const editor = vscode.window.activeTextEditor;
+    const selection = editor && !editor.selection.isEmpty ? editor.document.getText(editor.selection) : '';
+    const key = await vscode.window.showInputBox({
+        prompt: 'Translation key',
+        value: selection.replace(/^['"`]|['"`]$/g, '')
+    });
+    if (!key) {
+        return;
+    }
+    const result = await client.request('whereUsed', { key });
+    if (result.locations.length === 0) {
+        vscode.window.showInformationMessage(`"${key}" is not used in code`);
+        return;
+    }
+    const { sourceDir } = translationSettings();
+    const picked = await vscode.window.showQuickPick(
+        result.locations.map((location: { file: string; line: number }) => ({
+            label: `${location.file}:${location.line}`,
+            description: result.value ?? 'missing from locale files',
+            location
+        })),
+        { placeHolder: `Usages of ${key}` }
+    );
+    if (picked) {
+        const document = await vscode.workspace.openTextDocument(path.join(sourceDir, picked.location.file));
+        const position = new vscode.Position(picked.location.line - 1, 0);
+        await vscode.window.showTextDocument(document, { selection: new vscode.Range(position, position) });
+    }
+}
+
 /**
  * This method is called when your extension is activated
  */
@@ -210,6 +419,39 @@ export function activate(context: vscode.ExtensionContext): void {
 
     context.subscriptions.push(featureGeneratorCommand, translationExtractorCommand, postmanToEndpointsConverterCommand, snippetViewerCommand);
 
+    // Translation queries answered by a long-lived server instead of a new process per command
+    const translationOutput = vscode.window.createOutputChannel('Next.js Tools: Translations');
+    const translationServer = new TranslationServerClient(context, translationOutput);
+    const reportError = (err: Error) => vscode.window.showErrorMessage(`Translation server: ${err.message}`);
+    context.subscriptions.push(
+        translationOutput,
+        translationServer,
+        vscode.commands.registerCommand(
+            'nextjsTools.findMissingTranslationKeys',
+            () => findMissingTranslationKeys(translationServer, translationOutput).catch(reportError)
+        ),
+        vscode.commands.registerCommand(
+            'nextjsTools.findUnusedTranslationKeys',
+            () => findUnusedTranslationKeys(translationServer, translationOutput).catch(reportError)
+        ),
+        vscode.commands.registerCommand(
+            'nextjsTools.showTranslationKeyUsages',
+            () => showTranslationKeyUsages(translationServer).catch(reportError)
+        ),
+        // Saved files are re-scanned on the next request without waiting for the poll
+        vscode.workspace.onDidSaveTextDocument((document) => {
+            if (/\.(tsx?|jsx?)$/.test(document.fileName)) {
+                translationServer.notify('didChangeFiles', { files: [document.fileName] });
+            }
+        }),
+        // Settings are read when the server starts; restart it on the next request
+        vscode.workspace.onDidChangeConfiguration((event) => {
+            if (event.affectsConfiguration('nextjsTools.translations')) {
+                translationServer.dispose();
+            }
+        })
+    );
+
     // Show welcome message
     vscode.window.showInformationMessage(
         'Next.js Productivity Tools is ready! Use Command Palette to access tools.'